@@ -0,0 +1,232 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+
+from mock import patch
+import pandas as pd
+import requests
+
+from zipline.data.bundles.alpaca_fetcher import (AlpacaBarsFetcher,
+                                                 TokenBucket)
+from zipline.testing import tmp_dir
+from zipline.utils.cache import dataframe_cache
+
+
+class StubBarsServer(object):
+    """
+    Local stand-in for Alpaca's v1 bars endpoint. Serves one bar per symbol
+    at 09:30 New York time of every day in the requested range and records
+    the requests.
+    """
+    def __init__(self):
+        self.requests = []
+        # the number of requests to answer with a server error
+        self.errors = 0
+        # the symbols without any bars
+        self.no_bars = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                stub.requests.append((url.path, params,
+                                      self.headers['APCA-API-KEY-ID']))
+                if stub.errors:
+                    stub.errors -= 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub.bars(params)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = HTTPServer(('localhost', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def url(self):
+        return 'http://localhost:{}'.format(self._server.server_port)
+
+    def bars(self, params):
+        days = pd.date_range(pd.Timestamp(params['start']).date(),
+                             pd.Timestamp(params['end']).date())
+        out = {}
+        for i, symbol in enumerate(params['symbols'].split(',')):
+            if symbol in self.no_bars:
+                out[symbol] = []
+                continue
+            out[symbol] = [
+                {
+                    't': int(pd.Timestamp(
+                        '{} 09:30'.format(day.date()), tz='America/New_York'
+                    ).timestamp()),
+                    'o': 1.0 + i, 'h': 2.0 + i, 'l': 0.5 + i, 'c': 1.5 + i,
+                    'v': 100,
+                }
+                for day in days
+            ]
+        return out
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class AlpacaBarsFetcherTestCase(TestCase):
+    def setUp(self):
+        self.server = StubBarsServer()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_fetch_minute_bars(self):
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url,
+                                    max_workers=3)
+        bars = fetcher.fetch(['SPY', 'QQQ'],
+                             pd.Timestamp('2021-03-01', tz='UTC'),
+                             pd.Timestamp('2021-03-05', tz='UTC'),
+                             'minute')
+
+        # one request per session
+        self.assertEqual(len(self.server.requests), 5)
+        path, params, key = self.server.requests[0]
+        self.assertEqual(path, '/v1/bars/minute')
+        self.assertEqual(params['symbols'], 'SPY,QQQ')
+        self.assertEqual(key, 'key')
+
+        expected_index = pd.DatetimeIndex(
+            ['2021-03-0{} 09:30'.format(d) for d in range(1, 6)],
+        ).tz_localize('America/New_York')
+        self.assertTrue(bars.index.equals(expected_index))
+        self.assertEqual(sorted(bars.columns.get_level_values(0).unique()),
+                         ['QQQ', 'SPY'])
+        self.assertEqual(bars['SPY', 'close'].tolist(), [1.5] * 5)
+        self.assertEqual(bars['QQQ', 'close'].tolist(), [2.5] * 5)
+
+    def test_daily_bars_in_one_request(self):
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url)
+        fetcher.fetch(['SPY'],
+                      pd.Timestamp('2021-03-01', tz='UTC'),
+                      pd.Timestamp('2021-03-31', tz='UTC'),
+                      'day')
+        self.assertEqual(len(self.server.requests), 1)
+        _, params, _ = self.server.requests[0]
+        self.assertEqual(pd.Timestamp(params['start']),
+                         pd.Timestamp('2021-03-01', tz='America/New_York'))
+
+    def test_resume_from_cache(self):
+        start = pd.Timestamp('2021-03-01', tz='UTC')
+        with tmp_dir() as d:
+            cache = dataframe_cache(d.path, serialization='pickle')
+            fetcher = AlpacaBarsFetcher('key', 'secret',
+                                        data_url=self.server.url,
+                                        cache=cache)
+            fetcher.fetch(['SPY'], start, pd.Timestamp('2021-03-02',
+                                                       tz='UTC'), 'minute')
+            self.assertEqual(len(self.server.requests), 2)
+
+            # only the sessions which were not fetched yet are requested
+            bars = fetcher.fetch(['SPY'], start,
+                                 pd.Timestamp('2021-03-03', tz='UTC'),
+                                 'minute')
+            self.assertEqual(len(self.server.requests), 3)
+            self.assertEqual(len(bars), 3)
+
+    def test_no_bars(self):
+        self.server.no_bars = {'SPY'}
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url)
+        bars = fetcher.fetch(['SPY'],
+                             pd.Timestamp('2021-03-01', tz='UTC'),
+                             pd.Timestamp('2021-03-02', tz='UTC'),
+                             'minute')
+        self.assertTrue(bars.empty)
+        # the same column levels as a frame with bars
+        self.assertEqual(bars.columns.nlevels, 2)
+        self.assertEqual(list(bars.columns.levels[0]), [])
+
+    def test_fetch_many(self):
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url,
+                                    max_workers=4)
+        chunks = [['SPY', 'QQQ'], ['IWM']]
+        with patch.object(ThreadPoolExecutor, 'submit',
+                          autospec=True,
+                          side_effect=ThreadPoolExecutor.submit) as submit:
+            frames = fetcher.fetch_many(chunks,
+                                        pd.Timestamp('2021-03-01', tz='UTC'),
+                                        pd.Timestamp('2021-03-03', tz='UTC'),
+                                        'minute')
+            first = next(frames)
+            # the windows of every chunk are submitted before the first
+            # chunk is returned
+            self.assertEqual(submit.call_count, 6)
+            second, = frames
+
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertEqual(sorted(first.columns.get_level_values(0).unique()),
+                         ['QQQ', 'SPY'])
+        self.assertEqual(list(second.columns.get_level_values(0).unique()),
+                         ['IWM'])
+        self.assertEqual(second['IWM', 'close'].tolist(), [1.5] * 3)
+
+    @patch('zipline.data.bundles.alpaca_fetcher._retry_wait', 0)
+    def test_retry_server_errors(self):
+        self.server.errors = 2
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url)
+        bars = fetcher.fetch(['SPY'],
+                             pd.Timestamp('2021-03-01', tz='UTC'),
+                             pd.Timestamp('2021-03-01', tz='UTC'),
+                             'minute')
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(bars['SPY', 'close'].tolist(), [1.5])
+
+        self.server.errors = 5
+        with self.assertRaises(requests.HTTPError):
+            fetcher.fetch(['SPY'],
+                          pd.Timestamp('2021-03-02', tz='UTC'),
+                          pd.Timestamp('2021-03-02', tz='UTC'),
+                          'minute')
+
+    @patch('zipline.data.bundles.alpaca_fetcher._retry_wait', 0)
+    def test_retry_network_errors(self):
+        fetcher = AlpacaBarsFetcher('key', 'secret',
+                                    data_url=self.server.url)
+        get = requests.Session.get
+        calls = []
+
+        def flaky_get(session, *args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise requests.ConnectionError('connection reset')
+            return get(session, *args, **kwargs)
+
+        with patch.object(requests.Session, 'get', flaky_get):
+            bars = fetcher.fetch(['SPY'],
+                                 pd.Timestamp('2021-03-01', tz='UTC'),
+                                 pd.Timestamp('2021-03-01', tz='UTC'),
+                                 'minute')
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(bars['SPY', 'close'].tolist(), [1.5])
+
+
+class TokenBucketTestCase(TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=1000.0, capacity=2)
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(bucket._tokens, 1)
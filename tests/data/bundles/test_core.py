@@ -84,6 +84,7 @@ class BundleCoreTestCase(WithInstanceTmpDir,
             self.register(name, ingest)
             assert_in(name, self.bundles)
             assert_is(self.bundles[name].ingest, ingest)
+            assert_false(self.bundles[name].preload_adjustments)
 
         assert_equal(
             valmap(op.attrgetter('ingest'), self.bundles),
@@ -159,6 +160,7 @@ class BundleCoreTestCase(WithInstanceTmpDir,
             calendar_name='NYSE',
             start_session=self.START_DATE,
             end_session=self.END_DATE,
+            preload_adjustments=True,
         )
         def bundle_ingest(environ,
                           asset_db_writer,
@@ -187,6 +189,13 @@ class BundleCoreTestCase(WithInstanceTmpDir,
 
         assert_equal(set(bundle.asset_finder.sids), set(sids))
 
+        # the adjustments are served from memory
+        assert_true(bundle.adjustment_reader.adjustment_index is not None)
+        assert_equal(
+            bundle.adjustment_reader.get_adjustments_for_sid('splits', 1),
+            [[pd.Timestamp('2014-01-09', tz='UTC'), second_split_ratio]],
+        )
+
         columns = 'open', 'high', 'low', 'close', 'volume'
 
         actual = bundle.equity_minute_bar_reader.load_raw_arrays(
@@ -1,6 +1,10 @@
+import os
+from unittest import skipUnless
+
 import logbook
 import numpy as np
 import pandas as pd
+import sqlalchemy as sa
 
 from zipline.data.adjustments import (
     SQLiteAdjustmentReader,
@@ -19,8 +23,96 @@ from zipline.testing.fixtures import (
 
 nat = pd.Timestamp('nat')
 
+POSTGRES_URL = os.environ.get('ZIPLINE_TEST_POSTGRES_URL')
+
+
+class PreloadedAdjustmentsTests(object):
+    """
+    Tests of the preloaded lookups of SQLiteAdjustmentReader, run against
+    the adjustments db at ``self.db_path`` written by ``self.writer``.
+    """
+    def empty_in_memory_reader(self, dates, sids):
+        nan_frame = pd.DataFrame(
+            np.nan,
+            index=dates,
+            columns=sids,
+        )
+        frames = {
+            key: nan_frame
+            for key in ('open', 'high', 'low', 'close', 'volume')
+        }
+
+        return InMemoryDailyBarReader(
+            frames,
+            self.trading_calendar,
+            currency_codes=pd.Series(index=sids, data='USD'),
+        )
+
+    def writer_without_pricing(self, dates, sids):
+        return self.writer(self.empty_in_memory_reader(dates, sids))
+
+    def test_preloaded_lookups(self):
+        sids = np.arange(5)
+        dates = self.trading_calendar.all_sessions
+
+        def T(n):
+            return dates[n]
+
+        splits = pd.DataFrame(
+            [[T(4), 2.0, 2],
+             [T(0), 0.1, 1],
+             [T(8), 2.4, 2],
+             [T(1), 2.0, 1],
+             [T(0), 0.1, 2]],
+            columns=['effective_date', 'ratio', 'sid'],
+        )
+        stock_dividends = pd.DataFrame(
+            [[0, T(1), 0.5, 2],
+             [1, T(1), 1, 2],
+             [1, T(1), 1.2, 3],
+             [1, T(2), 1.5, 4]],
+            columns=['sid', 'ex_date', 'ratio', 'payment_sid'],
+        )
+        for col in 'declared_date', 'record_date', 'pay_date':
+            stock_dividends[col] = T(10)
+
+        self.writer_without_pricing(dates, sids).write(
+            splits=splits,
+            stock_dividends=stock_dividends,
+        )
 
-class TestSQLiteAdjustmentsWriter(WithTradingCalendars,
+        class asset_finder(object):
+            @staticmethod
+            def retrieve_asset(sid):
+                return sid
+
+        with SQLiteAdjustmentReader(self.db_path) as queried, \
+                SQLiteAdjustmentReader(self.db_path, preload=True) as indexed:
+            self.assertIsNone(queried.adjustment_index)
+            self.assertIsNotNone(indexed.adjustment_index)
+
+            for table_name in 'SPLITS', 'MERGERS', 'DIVIDENDS':
+                for sid in range(4):
+                    assert_equal(
+                        indexed.get_adjustments_for_sid(table_name, sid),
+                        queried.get_adjustments_for_sid(table_name, sid),
+                    )
+
+            for n in range(4):
+                for method in ('get_dividends_with_ex_date',
+                               'get_stock_dividends_with_ex_date'):
+                    assert_equal(
+                        sorted(getattr(indexed, method)(
+                            sids, T(n), asset_finder,
+                        )),
+                        sorted(getattr(queried, method)(
+                            sids, T(n), asset_finder,
+                        )),
+                    )
+
+
+class TestSQLiteAdjustmentsWriter(PreloadedAdjustmentsTests,
+                                  WithTradingCalendars,
                                   WithInstanceTmpDir,
                                   WithLogger,
                                   ZiplineTestCase):
@@ -43,26 +135,6 @@ class TestSQLiteAdjustmentsWriter(WithTradingCalendars,
         with SQLiteAdjustmentReader(self.db_path) as r:
             return r.unpack_db_to_component_dfs(convert_dates=convert_dates)
 
-    def empty_in_memory_reader(self, dates, sids):
-        nan_frame = pd.DataFrame(
-            np.nan,
-            index=dates,
-            columns=sids,
-        )
-        frames = {
-            key: nan_frame
-            for key in ('open', 'high', 'low', 'close', 'volume')
-        }
-
-        return InMemoryDailyBarReader(
-            frames,
-            self.trading_calendar,
-            currency_codes=pd.Series(index=sids, data='USD'),
-        )
-
-    def writer_without_pricing(self, dates, sids):
-        return self.writer(self.empty_in_memory_reader(dates, sids))
-
     def in_memory_reader_for_close(self, close):
         nan_frame = pd.DataFrame(
             np.nan,
@@ -325,3 +397,30 @@ class TestSQLiteAdjustmentsWriter(WithTradingCalendars,
         }).sort_index()
 
         assert_equal(result, expected)
+
+
+@skipUnless(POSTGRES_URL, 'ZIPLINE_TEST_POSTGRES_URL is not set')
+class TestPostgresAdjustments(PreloadedAdjustmentsTests,
+                              WithTradingCalendars,
+                              ZiplineTestCase):
+    """
+    The preloaded lookups on an adjustments db in Postgres. This needs a
+    throwaway database, the tables are dropped after every test.
+    """
+    def init_instance_fixtures(self):
+        super(TestPostgresAdjustments, self).init_instance_fixtures()
+        self.db_path = POSTGRES_URL
+        self.add_instance_callback(self._drop_tables)
+
+    def _drop_tables(self):
+        engine = sa.create_engine(POSTGRES_URL)
+        with engine.begin() as connection:
+            for table in ('splits', 'mergers', 'dividends',
+                          'dividend_payouts', 'stock_dividend_payouts'):
+                connection.execute('DROP TABLE IF EXISTS {}'.format(table))
+        engine.dispose()
+
+    def writer(self, session_bar_reader):
+        return self.enter_instance_context(
+            SQLiteAdjustmentWriter(self.db_path, session_bar_reader),
+        )
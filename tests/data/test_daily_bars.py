@@ -444,6 +444,29 @@ class _DailyBarsTestCase(WithEquityDailyBarData,
                 msg=make_failure_msg(asset, asset_start, VOLUME),
             )
 
+    def test_get_values(self):
+        reader = self.daily_bar_reader
+        assets = list(reversed(self.assets))
+
+        def get_value(asset, session, field):
+            try:
+                return reader.get_value(asset, session, field)
+            except NoDataOnDate:
+                return nan
+
+        for session in self.sessions:
+            for field in CLOSE, VOLUME:
+                assert_equal(
+                    reader.get_values(assets, session, field),
+                    array([
+                        get_value(asset, session, field) for asset in assets
+                    ], dtype=float),
+                    msg="Unexpected values on date={}; field={}.".format(
+                        session.date(),
+                        field,
+                    ),
+                )
+
     @unittest.skip("Failing on CI")
     def test_unadjusted_get_value_no_data(self):
         """Test behavior of get_value() around missing data."""
@@ -166,6 +166,23 @@ class AssetDispatchSessionBarTestCase(WithBcolzEquityDailyBarReader,
             for j, result in enumerate(results):
                 assert_almost_equal(result[:, i], expected[j], err_msg=msg)
 
+    def test_get_values(self):
+        sessions = self.trading_calendar.sessions_in_range(
+            self.START_DATE, self.END_DATE)
+        assets = self.asset_finder.retrieve_all([2, 10003, 1, 10001])
+
+        results = self.dispatch_reader.get_values(assets, sessions[1], 'high')
+        assert_almost_equal(
+            results,
+            array([nan, 30001.9, 101.9, 10001.9]),
+            err_msg="get_values should match get_value for every asset.",
+        )
+
+        results = self.dispatch_reader.get_values(
+            assets, sessions[2], 'volume',
+        )
+        assert_almost_equal(results, array([2002, 3002, 0, 0]))
+
 
 class AssetDispatchMinuteBarTestCase(WithBcolzEquityMinuteBarReader,
                                      WithBcolzFutureMinuteBarReader,
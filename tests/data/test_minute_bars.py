@@ -215,6 +215,56 @@ class BcolzMinuteBarTestCase(WithTradingCalendars,
         volume_price = reader.get_value(sid, minute, 'volume')
         self.assertEquals(50.0, volume_price)
 
+    def test_get_values(self):
+        minute_0 = self.market_opens[self.test_calendar_start]
+        minute_1 = minute_0 + timedelta(minutes=1)
+        data = {
+            1: DataFrame(
+                data={
+                    'open': [10.0, 11.0],
+                    'high': [20.0, 21.0],
+                    'low': [30.0, 31.0],
+                    'close': [40.0, 41.0],
+                    'volume': [50.0, 51.0],
+                },
+                index=[minute_0, minute_1],
+            ),
+            2: DataFrame(
+                data={
+                    'open': [130.23],
+                    'high': [nan],
+                    'low': [130.23],
+                    'close': [130.23],
+                    'volume': [0],
+                },
+                index=[minute_0],
+            ),
+        }
+        writer_with_ratios = BcolzMinuteBarWriter(
+            self.dest,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+            ohlc_ratios_per_sid={1: 25},
+        )
+        writer_with_ratios.write(data.items())
+        reader = BcolzMinuteBarReader(self.dest)
+
+        sids = [2, 1]
+        for minute in minute_0, minute_1:
+            for field in 'open', 'high', 'low', 'close', 'volume':
+                assert_array_equal(
+                    reader.get_values(sids, minute, field),
+                    [reader.get_value(sid, minute, field) for sid in sids],
+                )
+
+        # not a market minute
+        assert_array_equal(
+            reader.get_values(sids, minute_0 - timedelta(minutes=1), 'close'),
+            [nan, nan],
+        )
+
     def test_write_two_bars(self):
         minute_0 = self.market_opens[self.test_calendar_start]
         minute_1 = minute_0 + timedelta(minutes=1)
@@ -915,6 +965,89 @@ class BcolzMinuteBarTestCase(WithTradingCalendars,
                 assert_almost_equal(data[sid].loc[minutes, col],
                                     arrays[i][j][minute_locs])
 
+    def test_unadjusted_minutes_multiple_sids_threaded(self):
+        """
+        Test that windows read with several decompression threads, over
+        tables of different lengths and ohlc ratios, match the written data.
+        """
+        day_before_thanksgiving = Timestamp('2015-11-25', tz='UTC')
+        xmas_eve = Timestamp('2015-12-24', tz='UTC')
+        market_day_after_xmas = Timestamp('2015-12-28', tz='UTC')
+
+        minutes = [self.market_closes[day_before_thanksgiving] -
+                   Timedelta('2 min'),
+                   self.market_closes[xmas_eve] - Timedelta('1 min'),
+                   self.market_opens[market_day_after_xmas] +
+                   Timedelta('1 min')]
+        data_1 = DataFrame(
+            data={
+                'open': [15.0, 15.1, 15.2],
+                'high': [17.0, 17.1, 17.2],
+                'low': [11.0, 11.1, 11.3],
+                'close': [14.0, 14.1, 14.2],
+                'volume': [1000, 1001, 1002],
+            },
+            index=minutes)
+        # Only written up to the first minute, so its table ends before the
+        # end of the window.
+        data_2 = DataFrame(
+            data={
+                'open': [25.0],
+                'high': [27.0],
+                'low': [21.0],
+                'close': [24.0],
+                'volume': [2000],
+            },
+            index=minutes[:1])
+        writer = BcolzMinuteBarWriter(
+            self.dest,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+            ohlc_ratios_per_sid={1: 10},
+        )
+        writer.write_sid(1, data_1)
+        writer.write_sid(2, data_2)
+
+        start_minute_loc = \
+            self.trading_calendar.all_minutes.get_loc(minutes[0])
+        minute_locs = [
+            self.trading_calendar.all_minutes.get_loc(minute)
+            - start_minute_loc
+            for minute in minutes
+        ]
+
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        sids = [2, 1]
+        serial = BcolzMinuteBarReader(self.dest).load_raw_arrays(
+            columns, minutes[0], minutes[-1], sids,
+        )
+        threaded = BcolzMinuteBarReader(
+            self.dest,
+            decompression_threads=3,
+        ).load_raw_arrays(columns, minutes[0], minutes[-1], sids)
+
+        for col, serial_values, threaded_values in zip(columns,
+                                                       serial,
+                                                       threaded):
+            assert_array_equal(serial_values, threaded_values)
+            self.assertEqual(
+                threaded_values.dtype,
+                'uint32' if col == 'volume' else 'float64',
+            )
+            window = transpose(threaded_values)
+            assert_almost_equal(window[1][minute_locs], data_1[col])
+            assert_almost_equal(window[0][minute_locs[:1]], data_2[col])
+
+            missing = full(len(window[0]), True)
+            missing[minute_locs[:1]] = False
+            expected_missing = 0 if col == 'volume' else nan
+            assert_array_equal(
+                window[0][missing],
+                full(missing.sum(), expected_missing),
+            )
+
     def test_adjust_non_trading_minutes(self):
         start_day = Timestamp('2015-06-01', tz='UTC')
         end_day = Timestamp('2015-06-02', tz='UTC')
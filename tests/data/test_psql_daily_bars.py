@@ -0,0 +1,236 @@
+"""
+Tests for zipline.data.psql_daily_bars.
+
+These need a throwaway PostgreSQL database, e.g.:
+
+    $ createdb zipline_test
+    $ ZIPLINE_TEST_POSTGRES_URL=postgresql://localhost/zipline_test pytest ...
+
+The tables are dropped after every test.
+"""
+import os
+from unittest import skipUnless
+
+from mock import patch
+import numpy as np
+from numpy.testing import assert_almost_equal
+import pandas as pd
+
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+
+POSTGRES_URL = os.environ.get('ZIPLINE_TEST_POSTGRES_URL')
+
+if POSTGRES_URL:
+    from zipline.data.psql_daily_bars import (
+        INDEX,
+        PSQLDailyBarReader,
+        PSQLDailyBarWriter,
+        TABLE,
+    )
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+@skipUnless(POSTGRES_URL, 'ZIPLINE_TEST_POSTGRES_URL is not set')
+class PSQLDailyBarTestCase(WithTradingCalendars,
+                           WithInstanceTmpDir,
+                           ZiplineTestCase):
+    START_SESSION = pd.Timestamp('2015-11-23', tz='UTC')
+    END_SESSION = pd.Timestamp('2015-12-04', tz='UTC')
+
+    def init_instance_fixtures(self):
+        super(PSQLDailyBarTestCase, self).init_instance_fixtures()
+        self.sessions = self.trading_calendar.sessions_in_range(
+            self.START_SESSION,
+            self.END_SESSION,
+        )
+        self.add_instance_callback(self._drop_tables)
+
+    def _drop_tables(self):
+        engine = self.make_writer().conn
+        with engine.begin() as connection:
+            connection.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def make_writer(self, **kwargs):
+        return PSQLDailyBarWriter(
+            POSTGRES_URL,
+            self.trading_calendar,
+            self.START_SESSION,
+            self.END_SESSION,
+            **kwargs
+        )
+
+    def make_reader(self, **kwargs):
+        return PSQLDailyBarReader(POSTGRES_URL, **kwargs)
+
+    def make_bars(self, sids, sessions):
+        n = len(sessions)
+        return {
+            sid: pd.DataFrame({
+                'open': np.arange(n) + 10.0 * sid,
+                'high': np.arange(n) + 10.0 * sid + 1,
+                'low': np.arange(n) + 10.0 * sid - 1,
+                'close': np.arange(n) + 10.0 * sid + 0.5,
+                'volume': np.arange(n) * 100.0 + sid,
+            }, index=sessions)
+            for sid in sids
+        }
+
+    def write_bars(self, data, **kwargs):
+        # the writer adds an id column to the frames it is given
+        self.make_writer(**kwargs).write(
+            (sid, df.copy()) for sid, df in data.items()
+        )
+
+    def check_bars(self, reader, data, sessions):
+        sids = sorted(data)
+        arrays = reader.load_raw_arrays(
+            FIELDS, sessions[0], sessions[-1], sids,
+        )
+        for field, values in zip(FIELDS, arrays):
+            self.assertEqual(values.shape, (len(sessions), len(sids)))
+            for j, sid in enumerate(sids):
+                assert_almost_equal(
+                    values[:, j],
+                    data[sid][field].reindex(sessions).values,
+                )
+
+    def index_names(self):
+        return set(pd.read_sql(
+            f'SELECT indexname FROM pg_indexes '
+            f'WHERE tablename = \'{TABLE}\'',
+            self.make_writer().conn,
+        )['indexname'])
+
+    def test_bulk_write_round_trip(self):
+        data = self.make_bars([1, 2, 3], self.sessions)
+        # a batch size smaller than the data, so that several COPYs are made
+        self.write_bars(data, bulk_write=True, copy_batch_size=15)
+
+        self.check_bars(self.make_reader(), data, self.sessions)
+        # the index dropped for the load is rebuilt
+        self.assertIn(INDEX, self.index_names())
+
+    def test_bulk_write_appends(self):
+        data = self.make_bars([1, 2], self.sessions)
+        head = {sid: df.iloc[:-1] for sid, df in data.items()}
+        self.write_bars(head, bulk_write=True)
+
+        # the edges of the sids already in the db are respected: the known
+        # sessions are skipped and the next one appended
+        self.write_bars(data, bulk_write=True)
+        self.check_bars(self.make_reader(), data, self.sessions)
+        self.assertIn(INDEX, self.index_names())
+
+    def test_bulk_write_missing_volume(self):
+        data = self.make_bars([1], self.sessions)
+        data[1]['volume'].iloc[2] = np.nan
+        self.write_bars(data, bulk_write=True)
+
+        reader = self.make_reader()
+        # stored as NULL, as to_sql writes it
+        self.assertTrue(
+            np.isnan(reader.get_value(1, self.sessions[2], 'volume'))
+        )
+        self.assertEqual(
+            reader.get_value(1, self.sessions[3], 'volume'),
+            data[1]['volume'].iloc[3],
+        )
+
+    def test_snapshot(self):
+        data = self.make_bars([1, 2], self.sessions)
+        self.write_bars(data)
+
+        reader = self.make_reader(snapshot=True)
+        self.check_bars(reader, data, self.sessions)
+        self.assertTrue(reader._snapshot_loaded)
+        self.assertEqual(reader.sessions.tolist(), self.sessions.tolist())
+        self.assertEqual(
+            reader.get_value(2, self.sessions[1], 'close'),
+            data[2]['close'].iloc[1],
+        )
+
+    def test_snapshot_cache(self):
+        data = self.make_bars([1, 2], self.sessions)
+        head = {sid: df.iloc[:-1] for sid, df in data.items()}
+        self.write_bars(head)
+        cache_dir = self.instance_tmpdir.getpath('snapshots')
+
+        reader = self.make_reader(snapshot=True, snapshot_cache_dir=cache_dir)
+        self.check_bars(reader, head, self.sessions[:-1])
+        key = '{:%Y%m%d}-{}'.format(self.sessions[-2], 2 * len(head[1]))
+        self.assertEqual(os.listdir(cache_dir), [key])
+
+        # another reader maps the stored snapshot instead of querying it
+        with patch.object(PSQLDailyBarReader, '_query_snapshot') as query:
+            reader = self.make_reader(
+                snapshot=True,
+                snapshot_cache_dir=cache_dir,
+            )
+            self.check_bars(reader, head, self.sessions[:-1])
+        query.assert_not_called()
+        self.assertIsInstance(reader._spot_cols['close'], np.memmap)
+
+        # new rows change the key, so the stored snapshot is not used and is
+        # replaced
+        self.write_bars(data)
+        reader = self.make_reader(snapshot=True, snapshot_cache_dir=cache_dir)
+        self.check_bars(reader, data, self.sessions)
+        key = '{:%Y%m%d}-{}'.format(self.sessions[-1], 2 * len(data[1]))
+        self.assertEqual(os.listdir(cache_dir), [key])
+
+    def test_load_raw_arrays_full_columns(self):
+        data = self.make_bars([1, 2, 3], self.sessions)
+        self.write_bars(data)
+
+        # a window of most of the table reads the full columns, which are
+        # kept in memory
+        reader = self.make_reader()
+        self.check_bars(reader, data, self.sessions)
+        self.assertEqual(sorted(reader._spot_cols), sorted(FIELDS))
+        with patch.object(PSQLDailyBarReader,
+                          '_load_raw_arrays_pushdown') as pushdown:
+            self.check_bars(reader, data, self.sessions[2:5])
+        pushdown.assert_not_called()
+
+    def test_load_raw_arrays_pushdown_by_default(self):
+        data = self.make_bars([1, 2, 3], self.sessions)
+        self.write_bars(data)
+
+        # a window of a small fraction of the table is queried
+        reader = self.make_reader()
+        self.check_bars(reader, {2: data[2]}, self.sessions[2:4])
+        self.assertFalse(reader._spot_cols)
+
+        # the queried windows add up, past the fraction of the table the
+        # full columns are read
+        self.check_bars(reader, {2: data[2]}, self.sessions[4:6])
+        self.assertEqual(sorted(reader._spot_cols), sorted(FIELDS))
+
+        reader = self.make_reader(pushdown_threshold=0)
+        self.check_bars(reader, {2: data[2]}, self.sessions[2:4])
+        self.assertEqual(sorted(reader._spot_cols), sorted(FIELDS))
+
+    def test_load_raw_arrays_pushdown(self):
+        data = self.make_bars([1, 2, 3], self.sessions)
+        self.write_bars(data)
+
+        reader = self.make_reader(pushdown_threshold=100)
+        # only the requested window is queried
+        self.check_bars(reader, data, self.sessions)
+        self.check_bars(reader, {2: data[2]}, self.sessions[2:5])
+        self.assertFalse(reader._spot_cols)
+
+        # windows above the threshold read the full columns, which then
+        # serve every later read
+        big = self.make_reader(pushdown_threshold=len(self.sessions))
+        self.check_bars(big, data, self.sessions)
+        self.assertEqual(sorted(big._spot_cols), sorted(FIELDS))
+        with patch.object(PSQLDailyBarReader,
+                          '_load_raw_arrays_pushdown') as pushdown:
+            self.check_bars(big, {2: data[2]}, self.sessions[2:5])
+        pushdown.assert_not_called()
@@ -0,0 +1,252 @@
+"""
+Tests for zipline.data.psql_minute_bars.
+
+These need a throwaway PostgreSQL (11 or newer) database, e.g.:
+
+    $ createdb zipline_test
+    $ ZIPLINE_TEST_POSTGRES_URL=postgresql://localhost/zipline_test pytest ...
+
+The tables are dropped after every test.
+"""
+import os
+from unittest import skipUnless
+
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_array_equal
+import pandas as pd
+
+from zipline.data.bar_reader import NoDataOnDate
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+
+POSTGRES_URL = os.environ.get('ZIPLINE_TEST_POSTGRES_URL')
+
+if POSTGRES_URL:
+    from zipline.data.psql_minute_bars import (
+        BATCHES_TABLE,
+        CACHE_VERSION_PREFIX,
+        PSQLMinuteBarReader,
+        PSQLMinuteBarWriter,
+        PSQLMinuteOverlappingData,
+        TABLE,
+    )
+
+
+@skipUnless(POSTGRES_URL, 'ZIPLINE_TEST_POSTGRES_URL is not set')
+class PSQLMinuteBarTestCase(WithTradingCalendars,
+                            WithInstanceTmpDir,
+                            ZiplineTestCase):
+    START_SESSION = pd.Timestamp('2015-11-24', tz='UTC')
+    END_SESSION = pd.Timestamp('2015-12-31', tz='UTC')
+
+    def init_instance_fixtures(self):
+        super(PSQLMinuteBarTestCase, self).init_instance_fixtures()
+        self.writer = PSQLMinuteBarWriter(
+            POSTGRES_URL,
+            self.trading_calendar,
+            self.START_SESSION,
+            self.END_SESSION,
+        )
+        self.add_instance_callback(self._drop_tables)
+
+    def _drop_tables(self):
+        with self.writer.conn.begin() as connection:
+            connection.execute(f'DROP TABLE IF EXISTS {TABLE} CASCADE')
+            connection.execute(f'DROP TABLE IF EXISTS {BATCHES_TABLE}')
+
+    def make_reader(self, **kwargs):
+        return PSQLMinuteBarReader(
+            POSTGRES_URL,
+            calendar=self.trading_calendar,
+            **kwargs
+        )
+
+    def write_bars(self):
+        # spans the early close on the day after thanksgiving
+        day_before = pd.Timestamp('2015-11-25', tz='UTC')
+        half_day = pd.Timestamp('2015-11-27', tz='UTC')
+        cal = self.trading_calendar
+        self.minutes = pd.DatetimeIndex([
+            cal.session_close(day_before) - pd.Timedelta('1 min'),
+            cal.session_close(half_day),
+            cal.session_open(pd.Timestamp('2015-11-30', tz='UTC')),
+        ])
+        self.data = {
+            1: pd.DataFrame({
+                'open': [10.0, 10.1, 10.2],
+                'high': [11.0, 11.1, 11.2],
+                'low': [9.0, 9.1, 9.2],
+                'close': [10.5, 10.6, 10.7],
+                'volume': [100, 0, 102],
+            }, index=self.minutes),
+            2: pd.DataFrame({
+                'open': [20.0, np.nan, 20.2],
+                'high': [21.0, np.nan, 21.2],
+                'low': [19.0, np.nan, 19.2],
+                'close': [20.5, np.nan, 20.7],
+                'volume': [200, 0, 202],
+            }, index=self.minutes),
+        }
+        self.writer.write(self.data.items())
+
+    def check_window(self, reader):
+        fields = ['open', 'high', 'low', 'close', 'volume']
+        sids = [2, 1, 3]
+        arrays = reader.load_raw_arrays(
+            fields, self.minutes[0], self.minutes[-1], sids,
+        )
+        all_minutes = self.trading_calendar.minutes_in_range(
+            self.minutes[0], self.minutes[-1],
+        )
+        locs = all_minutes.get_indexer(self.minutes)
+        for field, values in zip(fields, arrays):
+            self.assertEqual(values.shape, (len(all_minutes), len(sids)))
+            for j, sid in enumerate(sids):
+                expected = np.full(len(all_minutes), np.nan)
+                if sid in self.data:
+                    expected[locs] = self.data[sid][field].values
+                if field == 'volume':
+                    expected = np.nan_to_num(expected)
+                else:
+                    expected[expected == 0] = np.nan
+                assert_almost_equal(values[:, j], expected)
+
+    def test_load_raw_arrays(self):
+        self.write_bars()
+        self.check_window(self.make_reader())
+
+    def test_get_value(self):
+        self.write_bars()
+        reader = self.make_reader()
+        self.assertEqual(reader.get_value(1, self.minutes[0], 'close'), 10.5)
+        self.assertEqual(reader.get_value(2, self.minutes[2], 'volume'), 202)
+        self.assertTrue(np.isnan(reader.get_value(2, self.minutes[1], 'low')))
+        self.assertEqual(reader.get_value(1, self.minutes[1], 'volume'), 0)
+        with self.assertRaises(NoDataOnDate):
+            reader.get_value(
+                1, self.minutes[1] + pd.Timedelta('1 min'), 'close',
+            )
+
+    def test_get_last_traded_dt(self):
+        self.write_bars()
+        reader = self.make_reader()
+        self.assertEqual(
+            reader.get_last_traded_dt(1, self.minutes[1]),
+            self.minutes[0],
+        )
+        # from the block read by get_value
+        reader.get_value(1, self.minutes[2], 'close')
+        self.assertEqual(
+            reader.get_last_traded_dt(1, self.minutes[2]),
+            self.minutes[2],
+        )
+        self.assertIs(
+            reader.get_last_traded_dt(3, self.minutes[2]),
+            pd.NaT,
+        )
+
+    def test_bounds(self):
+        self.write_bars()
+        reader = self.make_reader()
+        self.assertEqual(
+            reader.first_trading_day,
+            pd.Timestamp('2015-11-25', tz='UTC'),
+        )
+        self.assertEqual(
+            reader.last_available_dt,
+            self.trading_calendar.session_close(
+                pd.Timestamp('2015-11-30', tz='UTC'),
+            ),
+        )
+
+    def test_bounds_without_bars(self):
+        # bundles ingested before minute bars were written to postgres have
+        # no batches table
+        self._drop_tables()
+        reader = self.make_reader()
+        self.assertIs(reader.first_trading_day, pd.NaT)
+        self.assertIs(reader.last_available_dt, pd.NaT)
+
+    def test_missing_volume(self):
+        self.data = {1: pd.DataFrame({
+            'open': [10.0],
+            'high': [11.0],
+            'low': [9.0],
+            'close': [10.5],
+            'volume': [np.nan],
+        }, index=[self.trading_calendar.session_open(self.START_SESSION)])}
+        self.writer.write(self.data.items())
+        reader = self.make_reader()
+        self.assertEqual(
+            reader.get_value(1, self.data[1].index[0], 'volume'),
+            0,
+        )
+
+    def test_overlapping_data(self):
+        self.write_bars()
+        with self.assertRaises(PSQLMinuteOverlappingData):
+            self.writer.write_sid(
+                1, self.data[1], invalid_data_behavior='raise',
+            )
+        # the overlapping bars are skipped, the later ones written
+        later = self.data[1].copy()
+        later.index = later.index + pd.Timedelta('7 days')
+        self.writer.write_sid(
+            1,
+            pd.concat([self.data[1], later]),
+            invalid_data_behavior='ignore',
+        )
+        reader = self.make_reader()
+        self.assertEqual(reader.get_value(1, later.index[0], 'close'), 10.5)
+        self.assertEqual(reader.get_value(1, self.minutes[0], 'close'), 10.5)
+
+    def test_block_cache(self):
+        self.write_bars()
+        cache_dir = self.instance_tmpdir.getpath('minute_bar_blocks')
+        # entries of the directory which the reader did not create are kept
+        other = os.path.join(cache_dir, 'other')
+        os.makedirs(other)
+        self.check_window(self.make_reader(cache_dir=cache_dir))
+
+        # complete sessions are stored, the last one may still get bars
+        version_dirs = [
+            name for name in os.listdir(cache_dir)
+            if name.startswith(CACHE_VERSION_PREFIX)
+        ]
+        self.assertEqual(len(version_dirs), 1)
+        blocks = os.listdir(os.path.join(cache_dir, version_dirs[0]))
+        self.assertIn('1-20151125.npy', blocks)
+        self.assertNotIn('1-20151130.npy', blocks)
+
+        # a new reader maps the stored blocks instead of querying them
+        reader = self.make_reader(cache_dir=cache_dir)
+        block = reader._cached_block(1, pd.Timestamp('2015-11-25', tz='UTC'))
+        self.assertIsInstance(block, np.memmap)
+        self.check_window(reader)
+
+        # writing invalidates the stored blocks
+        self.writer.write_sid(2, pd.DataFrame({
+            'open': [30.0],
+            'high': [31.0],
+            'low': [29.0],
+            'close': [30.5],
+            'volume': [300],
+        }, index=[self.minutes[2] + pd.Timedelta('1 min')]))
+        reader = self.make_reader(cache_dir=cache_dir)
+        assert_array_equal(
+            reader.load_raw_arrays(
+                ['close'], self.minutes[0], self.minutes[0], [2],
+            )[0][:, 0],
+            [20.5],
+        )
+        self.assertNotIn(version_dirs[0], os.listdir(cache_dir))
+        self.assertTrue(os.path.isdir(other))
+        self.assertEqual(
+            reader.get_value(
+                2, self.minutes[2] + pd.Timedelta('1 min'), 'close',
+            ),
+            30.5,
+        )
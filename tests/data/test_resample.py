@@ -523,6 +523,28 @@ class MinuteToDailyAggregationTestCase(WithBcolzEquityMinuteBarReader,
                     err_msg='sid={0} field={1} dt={2}'.format(
                         asset, field, minute))
 
+    @parameterized.expand(OHLCV)
+    def test_staggered_and_rewound_minutes_multiple(self, field):
+        # Assets visited at different minutes are brought forward together,
+        # and going back in time starts the rollups over.
+        method_name = field + 's'
+        aggregator = self.equity_daily_aggregator
+        asset_1, asset_2 = self.asset_finder.retrieve_all([1, 2])
+        minutes = EQUITY_CASES[1].index
+
+        for i, assets in ((2, [asset_1]),
+                          (4, [asset_2, asset_1]),
+                          (1, [asset_2, asset_1]),
+                          (5, [asset_1, asset_2, asset_1])):
+            values = getattr(aggregator, method_name)(assets, minutes[i])
+            for j, asset in enumerate(assets):
+                self.assertIsInstance(values[j], Real)
+                assert_almost_equal(
+                    values[j],
+                    EXPECTED_AGGREGATION[asset][field][i],
+                    err_msg='sid={0} field={1} dt={2}'.format(
+                        asset, field, minutes[i]))
+
 
 class TestMinuteToSession(WithEquityMinuteBarData,
                           ZiplineTestCase):
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import datetime
+import empyrical
 import pandas as pd
 import numpy as np
 
@@ -22,7 +23,12 @@ from zipline.utils import factory
 from zipline.finance.trading import SimulationParameters
 import zipline.testing.fixtures as zf
 
-from zipline.finance.metrics import _ClassicRiskMetrics as ClassicRiskMetrics
+from zipline.finance.metrics import (
+    AlphaBeta,
+    ReturnsStatistic,
+    StreamingRiskMetrics,
+    _ClassicRiskMetrics as ClassicRiskMetrics,
+)
 
 RETURNS_BASE = 0.01
 RETURNS = [RETURNS_BASE] * 251
@@ -364,3 +370,74 @@ class TestRisk(zf.WithBenchmarkReturns, zf.ZiplineTestCase):
         }
 
         self.assertEqual(set(test_period), metrics)
+
+
+class _StubLedger(object):
+    def __init__(self, num_sessions):
+        self.daily_returns_array = np.full(num_sessions, np.nan)
+
+
+class _StubBenchmarkSource(object):
+    def __init__(self, returns):
+        self._returns = returns
+
+    def daily_returns(self, start, end):
+        return self._returns
+
+
+class TestStreamingRiskMetrics(zf.ZiplineTestCase):
+
+    def test_matches_empyrical(self):
+        sessions = pd.date_range('2006-01-03', periods=60, freq='B', tz='UTC')
+        rand = np.random.RandomState(0)
+        algo_returns = rand.normal(0.001, 0.02, len(sessions))
+        algo_returns[10] = 0.0
+        benchmark = pd.Series(
+            rand.normal(0.0005, 0.01, len(sessions)),
+            index=sessions,
+        )
+        benchmark_source = _StubBenchmarkSource(benchmark)
+        ledger = _StubLedger(len(sessions))
+
+        streaming = StreamingRiskMetrics()
+        recomputed = [
+            ReturnsStatistic(empyrical.annual_volatility, 'algo_volatility'),
+            ReturnsStatistic(empyrical.sharpe_ratio, 'sharpe'),
+            ReturnsStatistic(empyrical.sortino_ratio, 'sortino'),
+            ReturnsStatistic(empyrical.max_drawdown),
+            AlphaBeta(),
+        ]
+        for metric in [streaming, recomputed[-1]]:
+            metric.start_of_simulation(
+                ledger, 'minute', None, sessions, benchmark_source,
+            )
+
+        def check(method_name, session_ix):
+            expected = {'cumulative_risk_metrics': {}}
+            for metric in recomputed:
+                getattr(metric, method_name)(
+                    expected, ledger, None, session_ix, None,
+                )
+            actual = {'cumulative_risk_metrics': {}}
+            getattr(streaming, method_name)(
+                actual, ledger, None, session_ix, None,
+            )
+
+            expected = expected['cumulative_risk_metrics']
+            actual = actual['cumulative_risk_metrics']
+            self.assertEqual(set(actual), set(expected))
+            for field, value in expected.items():
+                if value is None:
+                    self.assertIsNone(actual[field], field)
+                else:
+                    np.testing.assert_allclose(
+                        actual[field], value, rtol=1e-9, atol=1e-12,
+                        err_msg=field,
+                    )
+
+        for session_ix, final in enumerate(algo_returns):
+            # The returns of the session change at every bar.
+            for partial in np.linspace(0, final, 4)[1:]:
+                ledger.daily_returns_array[session_ix] = partial
+                check('end_of_bar', session_ix)
+            check('end_of_session', session_ix)
@@ -1,3 +1,4 @@
+import os
 import unittest
 import pandas as pd
 
@@ -7,7 +8,7 @@ try:                                    # Python 3
 except ImportError:                     # Python 2
     from itertools import izip_longest as zip_longest
 
-from mock import patch
+from mock import patch, MagicMock
 import alpaca_trade_api.rest as apca
 
 from zipline.gens.brokers.alpaca_broker import ALPACABroker
@@ -55,7 +56,7 @@ class TestALPACABroker(WithSimParams,
                 'bars': bars,
             })
         ]
-        broker = ALPACABroker('')
+        broker = ALPACABroker('', stream_market_data=False)
         asset = self.asset_finder.retrieve_asset(1)
         ret = broker.get_realtime_bars(asset, '1m')
         assert ret[asset, 'open'].values[0] == 102.0
@@ -76,7 +77,7 @@ class TestALPACABroker(WithSimParams,
                'low': 102.5,
                'close': 103.1,
                'volume': 996}
-        broker = ALPACABroker('')
+        broker = ALPACABroker('', stream_market_data=False)
         api.list_bars.return_value = [
             apca.AssetBars({
                 'symbol': 'SPY',
@@ -339,11 +340,75 @@ class TestALPACABroker(WithSimParams,
 
         portfolio = broker.portfolio
 
+    @patch('zipline.gens.brokers.alpaca_broker.symbol_lookup')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_portfolio_snapshot(self, tradeapi, symbol_lookup):
+        api = tradeapi.REST()
+        asset = self.asset_finder.retrieve_asset(1)
+        symbol_lookup.return_value = asset
+        api.get_account.return_value = apca.Account({
+            'cash': '5000.00',
+            'portfolio_value': '7000.00'
+        })
+        api.list_positions.return_value = [
+            apca.Position({
+                'symbol': 'SPY',
+                'qty': '10',
+                'avg_entry_price': '210.00',
+                'current_price': '210.05',
+            })
+        ]
+        api.get_barset.return_value.df = pd.concat({
+            'SPY': pd.DataFrame({
+                'open': [210.0], 'high': [210.1], 'low': [209.9],
+                'close': [210.05], 'volume': [100],
+            }, index=pd.DatetimeIndex(['2017-06-01 10:03'],
+                                      tz='America/New_York')),
+        }, axis=1)
+        api.list_orders.return_value = []
+
+        broker = ALPACABroker('', stream_market_data=False)
+        broker.set_metrics_tracker(MagicMock())
+
+        with patch('zipline.gens.brokers.alpaca_broker.pd.Timestamp.utcnow',
+                   return_value=pd.Timestamp('2017-06-01 14:03:10',
+                                             tz='UTC')):
+            for _ in range(3):
+                assert broker.portfolio.cash == 5000.0
+                assert broker.account.buying_power == 5000.0
+            assert api.get_account.call_count == 1
+            assert api.list_positions.call_count == 1
+            # the last trades of all positions are fetched at once
+            assert api.get_barset.call_count == 1
+            api.get_last_trade.assert_not_called()
+
+            # a fill invalidates the snapshot
+            api.list_orders.return_value = [
+                apca.Order({
+                    'client_order_id': 'id1',
+                    'symbol': 'SPY',
+                    'filled_at': '2017-06-01T10:03:05-0400',
+                    'filled_qty': '10',
+                    'filled_avg_price': '210.05',
+                })
+            ]
+            broker.transactions
+            broker.portfolio
+            assert api.get_account.call_count == 2
+            assert api.list_positions.call_count == 2
+
+        # a new bar starts a new snapshot
+        with patch('zipline.gens.brokers.alpaca_broker.pd.Timestamp.utcnow',
+                   return_value=pd.Timestamp('2017-06-01 14:04:00',
+                                             tz='UTC')):
+            broker.account
+            assert api.get_account.call_count == 3
+
     @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
     def test_last_trade_dt(self, tradeapi):
         asset = self.asset_finder.retrieve_asset(1)
         api = tradeapi.REST()
-        broker = ALPACABroker('')
+        broker = ALPACABroker('', stream_market_data=False)
 
         def get_quote(symbol):
             assert symbol == 'SPY'
@@ -358,7 +423,141 @@ class TestALPACABroker(WithSimParams,
 
     @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
     def test_misc(self, tradeapi):
-        broker = ALPACABroker('')
-        assert broker.subscribe_to_market_data(None) is None
-        assert broker.subscribed_assets() == []
+        broker = ALPACABroker('', stream_market_data=False)
+        asset = self.asset_finder.retrieve_asset(1)
+        assert broker.subscribed_assets == []
+        assert broker.subscribe_to_market_data(asset) is None
+        assert broker.subscribed_assets == [asset]
         assert broker.time_skew == pd.Timedelta('0sec')
+
+
+class TestALPACABrokerOrderUpdates(WithSimParams,
+                                   WithDataPortal,
+                                   ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = (1,)
+    ASSET_FINDER_EQUITY_SYMBOLS = ("SPY",)
+
+    @staticmethod
+    def _order(n, submitted_at, filled_at=None):
+        return apca.Order({
+            'id': 'order{}'.format(n),
+            'client_order_id': 'client{}'.format(n),
+            'symbol': 'SPY',
+            'qty': '10',
+            'side': 'buy',
+            'submitted_at': submitted_at,
+            'filled_at': filled_at,
+            'filled_qty': '10' if filled_at else '0',
+            'filled_avg_price': '210.05' if filled_at else None,
+            'failed_at': None,
+            'canceled_at': None,
+            'limit_price': None,
+            'stop_price': None,
+        })
+
+    @patch('zipline.gens.brokers.alpaca_broker._max_orders_per_request', 2)
+    @patch('zipline.gens.brokers.alpaca_broker.symbol_lookup')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_get_order_updates(self, tradeapi, symbol_lookup):
+        symbol_lookup.return_value = self.asset_finder.retrieve_asset(1)
+        api = tradeapi.REST()
+        submitted = [
+            self._order(1, '2017-06-01T10:00:00-0400',
+                        filled_at='2017-06-01T10:00:01-0400'),
+            # submitted at the same time, across the page boundary
+            self._order(2, '2017-06-01T10:01:00-0400'),
+            self._order(3, '2017-06-01T10:01:00-0400'),
+        ]
+
+        def list_orders(status, limit, direction, after=None):
+            assert direction == 'asc'
+            orders = submitted
+            if status == 'open':
+                orders = [o for o in orders if not o.filled_at]
+            if after is not None:
+                after = pd.Timestamp(after)
+                orders = [o for o in orders if o.submitted_at > after]
+            return orders[:limit]
+        api.list_orders.side_effect = list_orders
+
+        broker = ALPACABroker('', stream_market_data=False)
+        cursor = pd.Timestamp('2017-06-01 13:00', tz='UTC')
+        with patch('zipline.gens.brokers.alpaca_broker.pd.Timestamp.utcnow',
+                   return_value=pd.Timestamp('2017-06-01 14:02', tz='UTC')):
+            orders, transactions, cursor = broker.get_order_updates(cursor)
+
+        assert sorted(o.id for o in orders) == \
+            ['client1', 'client2', 'client3']
+        assert list(transactions) == ['client1']
+        assert transactions['client1'].amount == 10
+        assert cursor == pd.Timestamp('2017-06-01 14:01', tz='UTC')
+        api.get_order.assert_not_called()
+
+        # an order which was open at the previous call and closed since is
+        # fetched on its own
+        submitted[1] = self._order(2, '2017-06-01T10:01:00-0400',
+                                   filled_at='2017-06-01T10:03:00-0400')
+        api.get_order.side_effect = {o.id: o for o in submitted}.get
+        with patch('zipline.gens.brokers.alpaca_broker.pd.Timestamp.utcnow',
+                   return_value=pd.Timestamp('2017-06-01 14:04', tz='UTC')):
+            orders, transactions, cursor = broker.get_order_updates(cursor)
+
+        api.get_order.assert_called_once_with('order2')
+        assert sorted(o.id for o in orders) == ['client2', 'client3']
+        assert list(transactions) == ['client2']
+
+
+class TestALPACABrokerSpotValues(WithSimParams,
+                                 WithDataPortal,
+                                 ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = (1, 2)
+    ASSET_FINDER_EQUITY_SYMBOLS = ("SPY", "XIV")
+
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_get_spot_values_without_stream(self, tradeapi):
+        assets = [self.asset_finder.retrieve_asset(1),
+                  self.asset_finder.retrieve_asset(2)]
+        api = tradeapi.REST()
+        last_trades = {'SPY': MagicMock(price=210.5)}
+        api.get_last_trade.side_effect = lambda symbol: last_trades[symbol]
+        api.get_barset.return_value.df = pd.DataFrame(
+            [[210.0, 210.6, 209.9, 210.2, 500.0]],
+            index=pd.DatetimeIndex(['2017-06-01 10:30'], tz='US/Eastern'),
+            columns=pd.MultiIndex.from_product(
+                [['SPY'], ['open', 'high', 'low', 'close', 'volume']]),
+        )
+
+        broker = ALPACABroker('', stream_market_data=False)
+
+        # 'price' is the last trade, not the close of the last bar
+        prices = broker.get_spot_values(assets, 'price', None, 'minute')
+        assert prices[0] == 210.5
+        assert pd.isnull(prices[1])
+        assert broker.get_spot_value(assets[0], 'price', None,
+                                     'minute') == 210.5
+        api.get_barset.assert_not_called()
+
+        volumes = broker.get_spot_values(assets, 'volume', None, 'minute')
+        assert volumes[0] == 500
+        assert pd.isnull(volumes[1])
+        api.get_barset.assert_called_once()
+
+
+class TestALPACABrokerStreamConfig(unittest.TestCase):
+
+    @patch('zipline.config.bundle.CONFIG_PATH', None)
+    @patch('zipline.gens.brokers.alpaca_broker.AlpacaMarketDataStream')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_stream_market_data_config(self, tradeapi, stream_class):
+        with patch.dict(os.environ, {'APCA_STREAM_MARKET_DATA': 'true'}):
+            broker = ALPACABroker('')
+            assert broker._stream is stream_class.return_value
+
+            # an explicit argument wins over the config
+            broker = ALPACABroker('', stream_market_data=False)
+            assert broker._stream is None
+
+        with patch.dict(os.environ, {'APCA_STREAM_MARKET_DATA': ''}):
+            broker = ALPACABroker('')
+            assert broker._stream is None
+        assert stream_class.call_count == 1
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import threading
+from unittest import TestCase
+
+from mock import patch
+import numpy as np
+import pandas as pd
+import polling
+import websockets
+
+from zipline.gens.brokers.alpaca_stream import (AlpacaMarketDataStream,
+                                                BarRingBuffer)
+
+
+class FakeMarketDataServer(object):
+    """
+    Local stand-in for Alpaca's market data websocket. Authenticates any
+    client, records every received message and sends what is pushed.
+    """
+    def __init__(self):
+        self.received = []
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        self._started.wait(5)
+
+    @property
+    def url(self):
+        return 'ws://localhost:{}'.format(self.port)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._outbox = asyncio.Queue()
+        self._server = self._loop.run_until_complete(
+            websockets.serve(self._handler, 'localhost', 0)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _handler(self, ws, path):
+        await ws.send(json.dumps([{'T': 'success', 'msg': 'connected'}]))
+        asyncio.ensure_future(self._receive(ws))
+        while True:
+            messages = await self._outbox.get()
+            await ws.send(json.dumps(messages))
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            msg = json.loads(raw)
+            self.received.append(msg)
+            if msg['action'] == 'auth':
+                await ws.send(
+                    json.dumps([{'T': 'success', 'msg': 'authenticated'}])
+                )
+
+    def push(self, messages):
+        self._loop.call_soon_threadsafe(self._outbox.put_nowait, messages)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+class TestBarRingBuffer(TestCase):
+    def test_append_and_wrap_around(self):
+        buf = BarRingBuffer(capacity=3)
+        self.assertIsNone(buf.last())
+
+        minutes = pd.date_range('2021-03-01 14:31', periods=5, freq='min',
+                                tz='UTC')
+        for i, minute in enumerate(minutes):
+            buf.append(minute, i, i + 1, i - 1, i + 0.5, 100 * i)
+
+        self.assertEqual(len(buf), 3)
+        frame = buf.to_frame()
+        np.testing.assert_array_equal(frame['open'].values, [2, 3, 4])
+        self.assertTrue(
+            frame.index.equals(minutes[2:].tz_convert('America/New_York'))
+        )
+        self.assertEqual(buf.last().name, minutes[-1])
+
+    def test_updated_and_late_bars(self):
+        buf = BarRingBuffer(capacity=3)
+        minutes = pd.date_range('2021-03-01 14:31', periods=2, freq='min',
+                                tz='UTC')
+        buf.append(minutes[1], 1, 2, 0.5, 1.5, 10)
+        # a corrected bar replaces the newest one
+        buf.append(minutes[1], 1, 3, 0.5, 2.5, 20)
+        # bars older than the newest one are dropped
+        buf.append(minutes[0], 9, 9, 9, 9, 9)
+
+        self.assertEqual(len(buf), 1)
+        self.assertEqual(buf.last()['close'], 2.5)
+        self.assertEqual(buf.last()['volume'], 20)
+
+
+class TestAlpacaMarketDataStream(TestCase):
+    def setUp(self):
+        self.server = FakeMarketDataServer()
+        self.stream = AlpacaMarketDataStream('key', 'secret',
+                                             url=self.server.url)
+
+    def tearDown(self):
+        self.stream.stop()
+        self.server.close()
+
+    def wait_for(self, predicate):
+        polling.poll(predicate, timeout=5, step=0.05)
+
+    def test_subscribe_and_buffer(self):
+        self.stream.subscribe(['SPY'])
+        self.stream.start()
+        self.wait_for(lambda: any(msg['action'] == 'subscribe'
+                                  for msg in self.server.received))
+
+        auth, subscribe = self.server.received
+        self.assertEqual(auth, {'action': 'auth',
+                                'key': 'key',
+                                'secret': 'secret'})
+        self.assertEqual(subscribe['bars'], ['SPY'])
+        self.assertEqual(subscribe['trades'], ['SPY'])
+
+        self.server.push([
+            {'T': 'b', 'S': 'SPY', 't': '2021-03-01T14:31:00Z',
+             'o': 380.1, 'h': 380.5, 'l': 379.9, 'c': 380.2, 'v': 1200},
+            {'T': 't', 'S': 'SPY', 't': '2021-03-01T14:32:01.5Z',
+             'p': 380.3, 's': 100},
+            {'T': 'b', 'S': 'QQQ', 't': '2021-03-01T14:31:00Z',
+             'o': 1, 'h': 1, 'l': 1, 'c': 1, 'v': 1},
+        ])
+        self.wait_for(lambda: self.stream.last_trade('SPY') is not None)
+
+        price, dt = self.stream.last_trade('SPY')
+        self.assertEqual(price, 380.3)
+        self.assertEqual(dt, pd.Timestamp('2021-03-01 14:32:01.5', tz='UTC'))
+
+        bar = self.stream.last_bar('SPY')
+        self.assertEqual(bar.name, pd.Timestamp('2021-03-01 14:31', tz='UTC'))
+        self.assertEqual(bar['close'], 380.2)
+
+        # not subscribed
+        self.assertIsNone(self.stream.last_bar('QQQ'))
+
+        bars = self.stream.bars(['SPY'])
+        self.assertEqual(bars['SPY', 'volume'].tolist(), [1200])
+
+    def test_subscribe_after_authentication(self):
+        self.stream.start()
+        self.wait_for(lambda: self.stream._authenticated)
+
+        self.stream.subscribe(['SPY', 'QQQ'])
+        self.wait_for(lambda: any(msg['action'] == 'subscribe'
+                                  for msg in self.server.received))
+        subscribe = self.server.received[-1]
+        self.assertEqual(sorted(subscribe['bars']), ['QQQ', 'SPY'])
+
+    def test_stale_until_subscribed(self):
+        self.assertTrue(self.stream.is_stale)
+        self.stream.subscribe(['SPY'])
+        self.stream.start()
+        self.wait_for(lambda: not self.stream.is_stale)
+
+    def test_invalid_messages_are_skipped(self):
+        self.stream.subscribe(['SPY'])
+        self.stream.start()
+        self.wait_for(lambda: not self.stream.is_stale)
+
+        self.server.push([
+            # no prices
+            {'T': 'b', 'S': 'SPY', 't': '2021-03-01T14:31:00Z'},
+            'not a message',
+            {'T': 't', 'S': 'SPY', 't': '2021-03-01T14:32:01Z', 'p': 380.3},
+        ])
+        self.wait_for(lambda: self.stream.last_trade('SPY') is not None)
+        self.assertIsNone(self.stream.last_bar('SPY'))
+        self.assertTrue(self.stream.is_running)
+        self.assertFalse(self.stream.is_stale)
+
+    def test_reconnect_after_failure(self):
+        connect = websockets.connect
+        attempts = []
+
+        def failing_connect(url):
+            attempts.append(url)
+            if len(attempts) == 1:
+                raise RuntimeError('rejected handshake')
+            return connect(url)
+
+        self.stream.subscribe(['SPY'])
+        with patch('zipline.gens.brokers.alpaca_stream.websockets.connect',
+                   failing_connect), \
+                patch('zipline.gens.brokers.alpaca_stream._reconnect_wait',
+                      0.01):
+            self.stream.start()
+            self.wait_for(lambda: not self.stream.is_stale)
+
+        self.assertEqual(len(attempts), 2)
+        self.assertTrue(self.stream.is_running)
+        self.wait_for(lambda: any(msg['action'] == 'subscribe'
+                                  for msg in self.server.received))
+
+    def test_subscribe_while_disconnected(self):
+        self.stream.start()
+        self.wait_for(lambda: not self.stream.is_stale)
+        ws, self.stream._ws = self.stream._ws, None
+        # nothing is sent, the symbols are subscribed on reconnection
+        asyncio.run_coroutine_threadsafe(
+            self.stream._send_subscribe(['SPY']), self.stream._loop,
+        ).result(5)
+        self.stream._ws = ws
+        self.assertFalse(any(msg['action'] == 'subscribe'
+                             for msg in self.server.received))
+
+    def test_seed_bars(self):
+        index = pd.date_range('2021-03-01 09:31', periods=2, freq='min',
+                              tz='America/New_York')
+        seed = pd.concat({
+            'SPY': pd.DataFrame({
+                'open': [1.0, 2.0],
+                'high': [1.0, 2.0],
+                'low': [1.0, 2.0],
+                'close': [1.0, 2.0],
+                'volume': [10, 20],
+            }, index=index),
+        }, axis=1)
+        self.stream.subscribe(['SPY'])
+        self.stream.seed_bars(seed)
+
+        bars = self.stream.bars(['SPY'])
+        self.assertTrue(bars.index.equals(index))
+        self.assertEqual(bars['SPY', 'close'].tolist(), [1.0, 2.0])
@@ -16,7 +16,9 @@ from ib.ext.Order import Order
 from ib.ext.Execution import Execution
 from ib.ext.OrderState import OrderState
 
-from zipline.gens.brokers.ib_broker import IBBroker, TWSConnection
+from zipline.gens.brokers.ib_broker import (IBBroker,
+                                            TWSConnection,
+                                            TickBuffer)
 from zipline.testing.fixtures import WithSimParams
 from zipline.finance.execution import (StopLimitOrder,
                                        MarketOrder,
@@ -118,10 +120,14 @@ class TestIBBroker(WithSimParams,
                             pd.to_datetime('2017-06-16 10:30:11', utc=True),
                             pd.to_datetime('2017-06-16 10:30:30', utc=True),
                             pd.to_datetime('2017-06-17 10:31:9', utc=True)]
-        index = pd.DatetimeIndex(last_trade_times)
+        ticks = TickBuffer()
+        for i, last_trade_time in enumerate(last_trade_times):
+            ticks.append(last_trade_time,
+                         *[bars[field][i] for field in
+                           ('last_trade_price', 'last_trade_size',
+                            'total_volume', 'vwap', 'single_trade_flag')])
         broker = IBBroker(sentinel.tws_uri)
-        tws.return_value.bars = {asset.symbol: pd.DataFrame(
-            index=index, data=bars)}
+        tws.return_value.bars = {asset.symbol: ticks}
 
         price = broker.get_spot_value(asset, 'price', dt, data_freq)
         last_trade = broker.get_spot_value(asset, 'last_traded', dt, data_freq)
@@ -131,15 +137,14 @@ class TestIBBroker(WithSimParams,
         close = broker.get_spot_value(asset, 'close', dt, data_freq)
         volume = broker.get_spot_value(asset, 'volume', dt, data_freq)
 
-        # Only the last minute is taken into account, therefore
-        # the first bar is ignored
+        # Only the minute of the last trade is taken into account
         assert price == bars['last_trade_price'][-1]
         assert last_trade == last_trade_times[-1]
-        assert open_ == bars['last_trade_price'][1]
-        assert high == max(bars['last_trade_price'][1:])
-        assert low == min(bars['last_trade_price'][1:])
+        assert open_ == bars['last_trade_price'][-1]
+        assert high == bars['last_trade_price'][-1]
+        assert low == bars['last_trade_price'][-1]
         assert close == bars['last_trade_price'][-1]
-        assert volume == sum(bars['last_trade_size'][1:])
+        assert volume == bars['last_trade_size'][-1]
 
     def test_get_realtime_bars_produces_correct_df(self):
         bars = self._tws_bars()
@@ -454,3 +459,54 @@ class TestIBBroker(WithSimParams,
                     pd.to_datetime('now', utc=True) < pd.Timedelta('10s'))
             assert broker.transactions[exec_id].price == price
             assert broker.orders[order.id].commission == 0
+
+
+class TestTickBuffer(unittest.TestCase):
+    def test_incremental_minute_bars(self):
+        ticks = TickBuffer(capacity=2)
+        assert ticks.empty
+        assert ticks.last_minute_bar() is None
+
+        for time, price, size in (('10:30:00', 12.4, 10),
+                                  ('10:30:40', 12.5, 10),
+                                  ('10:30:50', 12.3, 5),
+                                  ('10:31:10', 12.44, 20),
+                                  # a late tick of the first minute
+                                  ('10:30:59', 12.6, 1),
+                                  ('10:37:10', 12.74, 5)):
+            ticks.append(pd.Timestamp('2017-09-27 ' + time, tz='UTC'),
+                         price, size, 0, price, 'true')
+
+        assert len(ticks) == 6
+        assert ticks.last_trade_price == 12.74
+        assert ticks.last_trade_time == pd.Timestamp('2017-09-27 10:37:10',
+                                                     tz='UTC')
+        assert ticks.last_minute_bar() == {'open': 12.74, 'high': 12.74,
+                                           'low': 12.74, 'close': 12.74,
+                                           'volume': 5}
+
+        bars = ticks.minute_bars()
+        assert list(bars.index) == [
+            pd.Timestamp('2017-09-27 10:30', tz='UTC'),
+            pd.Timestamp('2017-09-27 10:31', tz='UTC'),
+            pd.Timestamp('2017-09-27 10:37', tz='UTC'),
+        ]
+        assert bars.iloc[0].tolist() == [12.4, 12.6, 12.3, 12.3, 26]
+        assert bars.iloc[1].tolist() == [12.44, 12.44, 12.44, 12.44, 20]
+
+        frame = ticks.to_frame()
+        assert frame.last_trade_size.tolist() == [10, 10, 5, 20, 1, 5]
+        assert frame.single_trade_flag.all()
+
+    def test_late_tick_of_new_minute(self):
+        ticks = TickBuffer()
+        ticks.append(pd.Timestamp('2017-09-27 10:35', tz='UTC'),
+                     2.0, 1, 0, 2.0, 'false')
+        ticks.append(pd.Timestamp('2017-09-27 10:32', tz='UTC'),
+                     1.0, 1, 0, 1.0, 'false')
+
+        bars = ticks.minute_bars()
+        assert bars.index.is_monotonic_increasing
+        assert bars.close.tolist() == [1.0, 2.0]
+        # the last trade is the last one received
+        assert ticks.last_trade_price == 1.0
@@ -13,6 +13,8 @@ except ImportError:                     # Python 2
 from mock import patch
 from zipline.gens.realtimeclock import (RealtimeClock,
                                         SESSION_START,
+                                        SESSION_END,
+                                        BAR,
                                         BEFORE_TRADING_START_BAR)
 from zipline.gens.sim_engine import MinuteSimulationClock
 from zipline.utils.calendars import get_calendar
@@ -183,3 +185,94 @@ class TestRealtimeClock(TestCase):
                               pd.Timestamp("2017-04-20 20:05", tz='UTC'))
             self.assertEquals(event_type, BEFORE_TRADING_START_BAR)
 
+    def sleep_exactly(self, seconds):
+        """Mock function for sleep. Advances the internal clock by the slept
+        time plus a small wake-up delay"""
+        self.internal_clock += pd.Timedelta(seconds=seconds) + \
+            pd.Timedelta('5ms')
+
+    def test_sleeps_until_minute_boundaries(self):
+        """Tests that RealtimeClock emits every minute once, checks the broker
+        on the heartbeat interval and records the emission lag"""
+        heartbeats = []
+
+        def is_broker_alive():
+            heartbeats.append(self.internal_clock)
+            return True
+
+        with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
+                patch('zipline.gens.realtimeclock.sleep') as sleep:
+            to_dt.side_effect = self.get_clock
+            sleep.side_effect = self.sleep_exactly
+            self.internal_clock = pd.Timestamp("2017-04-20 19:55:30",
+                                               tz='UTC')
+            rtc = RealtimeClock(
+                self.sessions,
+                self.opens,
+                self.closes,
+                days_at_time(self.sessions, time(8, 45), "US/Eastern"),
+                False,
+                is_broker_alive=is_broker_alive,
+                heartbeat_interval=pd.Timedelta('2 min'),
+            )
+
+            events = list(rtc)
+
+        bars = [dt for dt, event_type in events if event_type == BAR]
+        self.assertEqual(
+            bars,
+            list(pd.date_range("2017-04-20 19:56", "2017-04-20 20:00",
+                               freq='min', tz='UTC')),
+        )
+        self.assertEqual(events[-1][1], SESSION_END)
+        self.assertEqual(len(heartbeats), 3)
+
+        stats = rtc.emission_lag_stats
+        self.assertEqual(stats['count'], 5)
+        self.assertLess(stats['max'], pd.Timedelta('10ms'))
+
+    def test_broker_down_moves_to_next_session(self):
+        """Tests that RealtimeClock skips the rest of a session when the
+        broker is not alive and resumes with the next one"""
+        heartbeats = []
+
+        def is_broker_alive():
+            heartbeats.append(self.internal_clock)
+            # down at the first check only
+            return len(heartbeats) > 1
+
+        sessions = self.nyse_calendar.sessions_in_range(
+            pd.Timestamp("2017-04-20", tz='utc'),
+            pd.Timestamp("2017-04-21", tz='utc')
+        )
+        schedule = self.nyse_calendar.schedule.loc[sessions]
+
+        with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
+                patch('zipline.gens.realtimeclock.sleep') as sleep:
+            to_dt.side_effect = self.get_clock
+            sleep.side_effect = self.sleep_exactly
+            self.internal_clock = pd.Timestamp("2017-04-20 19:55:30",
+                                               tz='UTC')
+            rtc = RealtimeClock(
+                sessions,
+                schedule['market_open'],
+                schedule['market_close'],
+                days_at_time(sessions, time(8, 45), "US/Eastern"),
+                False,
+                is_broker_alive=is_broker_alive,
+                heartbeat_interval=pd.Timedelta('1 day'),
+            )
+
+            events = list(rtc)
+
+        self.assertEqual(events[0], (sessions[0], SESSION_START))
+        self.assertEqual(events[1], (sessions[1], SESSION_START))
+        self.assertEqual(events[2][1], BEFORE_TRADING_START_BAR)
+        bars = [dt for dt, event_type in events if event_type == BAR]
+        self.assertEqual(
+            bars,
+            list(pd.date_range("2017-04-21 13:31", "2017-04-21 20:00",
+                               freq='min', tz='UTC')),
+        )
+        self.assertEqual(events[-1][1], SESSION_END)
+        self.assertEqual(len(heartbeats), 2)
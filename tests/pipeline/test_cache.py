@@ -0,0 +1,146 @@
+"""
+Tests for zipline.pipeline.cache.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from zipline.pipeline import CustomFactor, Pipeline
+from zipline.pipeline.cache import TermCache
+from zipline.pipeline.data.testing import TestingDataSet
+from zipline.pipeline.domain import US_EQUITIES
+from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.pipeline.factors import SimpleMovingAverage
+from zipline.pipeline.hooks.testing import TestingHooks
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithSeededRandomPipelineEngine,
+    ZiplineTestCase,
+)
+
+
+class CountingFactor(CustomFactor):
+    inputs = [TestingDataSet.float_col]
+    window_length = 3
+    calls = 0
+
+    def compute(self, today, assets, out, values):
+        type(self).calls += 1
+        out[:] = values.sum(axis=0)
+
+
+class TermCacheTestCase(WithInstanceTmpDir,
+                        WithSeededRandomPipelineEngine,
+                        ZiplineTestCase):
+    START_DATE = pd.Timestamp('2006-01-05', tz='UTC')
+    END_DATE = pd.Timestamp('2006-02-28', tz='UTC')
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    def make_engine(self, cache):
+        return SimplePipelineEngine(
+            get_loader=lambda column: self.seeded_random_loader,
+            asset_finder=self.asset_finder,
+            term_cache=cache,
+        )
+
+    def test_hits_match_computed_results(self):
+        cache = TermCache(self.instance_tmpdir.path, fingerprint='bundle-1')
+        engine = self.make_engine(cache)
+        factor = CountingFactor()
+        pipe = Pipeline(
+            columns={
+                'counting': factor,
+                'sma': SimpleMovingAverage(
+                    inputs=[TestingDataSet.float_col],
+                    window_length=5,
+                ),
+            },
+            domain=US_EQUITIES,
+        )
+
+        CountingFactor.calls = 0
+        expected = self.run_pipeline(pipe, self.START_DATE, self.END_DATE)
+        serial_calls = CountingFactor.calls
+
+        first = engine.run_pipeline(pipe, self.START_DATE, self.END_DATE)
+        assert_frame_equal(first, expected)
+        self.assertEqual(CountingFactor.calls, 2 * serial_calls)
+        self.assertEqual(cache.hits, 0)
+
+        hooks = TestingHooks()
+        second = engine.run_pipeline(
+            pipe, self.START_DATE, self.END_DATE, hooks=[hooks],
+        )
+        assert_frame_equal(second, expected)
+        # Nothing was computed the second time.
+        self.assertEqual(CountingFactor.calls, 2 * serial_calls)
+        self.assertEqual(cache.hits, 2)
+
+        lookups = [
+            call for call in hooks.trace
+            if call.method_name == 'on_term_cache_lookup'
+        ]
+        self.assertEqual(len(lookups), 1)
+        hits, misses = lookups[0].args
+        self.assertIn(factor, hits)
+        self.assertEqual(misses, [])
+
+        # Another bundle doesn't see the entries.
+        other = TermCache(self.instance_tmpdir.path, fingerprint='bundle-2')
+        self.make_engine(other).run_pipeline(
+            pipe, self.START_DATE, self.END_DATE,
+        )
+        self.assertEqual(other.hits, 0)
+
+    def test_structural_token(self):
+        cache = TermCache(self.instance_tmpdir.path, fingerprint='bundle')
+        sma_5 = SimpleMovingAverage(
+            inputs=[TestingDataSet.float_col],
+            window_length=5,
+        )
+        sma_10 = SimpleMovingAverage(
+            inputs=[TestingDataSet.float_col],
+            window_length=10,
+        )
+        self.assertNotEqual(cache.token(sma_5), cache.token(sma_10))
+        self.assertEqual(cache.token(sma_5), cache.token(SimpleMovingAverage(
+            inputs=[TestingDataSet.float_col],
+            window_length=5,
+        )))
+        column = TestingDataSet.float_col
+        self.assertNotEqual(
+            cache.token(column),
+            cache.token(column.specialize(US_EQUITIES)),
+        )
+
+    def test_lru_eviction(self):
+        path = self.instance_tmpdir.path
+        value = np.zeros((10, 10))
+        size = value.nbytes + 128  # npy header
+        cache = TermCache(path, fingerprint='bundle', max_bytes=2 * size)
+
+        dates = pd.date_range('2014-01-02', periods=10, tz='UTC')
+        assets = pd.Int64Index(np.arange(10))
+        terms = [
+            SimpleMovingAverage(
+                inputs=[TestingDataSet.float_col],
+                window_length=n,
+            )
+            for n in (2, 3, 4)
+        ]
+        cache.set(terms[0], dates, assets, value)
+        cache.set(terms[1], dates, assets, value)
+        # Use the first entry, so that the second one is evicted.
+        os.utime(
+            os.path.join(path, cache.key(terms[1], dates, assets)),
+            (0, 0),
+        )
+        cache._entries[cache.key(terms[1], dates, assets)] = size, 0
+        self.assertIsNotNone(cache.get(terms[0], dates, assets))
+        cache.set(terms[2], dates, assets, value)
+
+        self.assertIsNotNone(cache.get(terms[0], dates, assets))
+        self.assertIsNone(cache.get(terms[1], dates, assets))
+        self.assertIsNotNone(cache.get(terms[2], dates, assets))
@@ -65,6 +65,7 @@ from zipline.pipeline.factors import (
     SimpleMovingAverage,
 )
 from zipline.pipeline.filters import CustomFilter
+from zipline.pipeline.hooks.testing import TestingHooks
 from zipline.pipeline.loaders.equity_pricing_loader import (
     EquityPricingLoader,
 )
@@ -1028,6 +1029,30 @@ class SyntheticBcolzTestCase(zf.WithAdjustmentReader,
         result = results['sma'].unstack()
         assert_frame_equal(result, expected)
 
+    def test_chunked_pipeline_with_prefetch(self):
+        # The adjustment reader's sqlite connection can only be used from the
+        # thread which opened it, so prefetching must not call the loader
+        # from another thread.
+        pipe = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=(EquityPricing.close,),
+                window_length=5,
+            ),
+            'close': EquityPricing.close.latest,
+        })
+        start_date = self.first_asset_start + 6 * self.trading_calendar.day
+        end_date = self.last_asset_end
+
+        expected = self.engine.run_pipeline(pipe, start_date, end_date)
+        result = self.engine.run_chunked_pipeline(
+            pipe,
+            start_date,
+            end_date,
+            chunksize=3,
+            prefetch_chunks=2,
+        )
+        assert_frame_equal(result, expected)
+
     def test_drawdown(self):
         # The monotonically-increasing data produced by SyntheticDailyBarWriter
         # exercises two pathological cases for MaxDrawdown.  The actual
@@ -1544,6 +1569,100 @@ class ChunkedPipelineTestCase(zf.WithSeededRandomPipelineEngine,
         )
         self.assertTrue(chunked_result.equals(pipeline_result))
 
+    def test_run_chunked_pipeline_in_processes(self):
+        """
+        Test that running chunks on worker processes produces the same result
+        as running them serially.
+        """
+        pipe = Pipeline(
+            columns={
+                'float': TestingDataSet.float_col.latest,
+                'custom_factor': SimpleMovingAverage(
+                    inputs=[TestingDataSet.float_col],
+                    window_length=10,
+                ),
+            },
+            domain=US_EQUITIES,
+        )
+
+        engine = self.seeded_random_engine
+        serial_result = engine.run_chunked_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.END_DATE,
+            chunksize=22,
+        )
+        parallel_result = engine.run_chunked_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.END_DATE,
+            chunksize=22,
+            engine_factory=lambda: engine,
+            processes=2,
+            max_inflight_chunks=3,
+        )
+        self.assertTrue(parallel_result.equals(serial_result))
+
+        with self.assertRaises(ValueError):
+            engine.run_chunked_pipeline(
+                pipe,
+                self.PIPELINE_START_DATE,
+                self.END_DATE,
+                chunksize=22,
+                processes=2,
+            )
+
+    def test_run_chunked_pipeline_with_prefetch(self):
+        """
+        Test that prefetching the loaded terms of the next chunks produces the
+        same result, and reports the loading of each chunk.
+        """
+        pipe = Pipeline(
+            columns={
+                'float': TestingDataSet.float_col.latest,
+                'custom_factor': SimpleMovingAverage(
+                    inputs=[TestingDataSet.float_col],
+                    window_length=10,
+                ),
+            },
+            domain=US_EQUITIES,
+        )
+
+        engine = self.seeded_random_engine
+        serial_result = engine.run_chunked_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.END_DATE,
+            chunksize=22,
+        )
+        hooks = TestingHooks()
+        prefetched_result = engine.run_chunked_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.END_DATE,
+            chunksize=22,
+            hooks=[hooks],
+            prefetch_chunks=2,
+        )
+        self.assertTrue(prefetched_result.equals(serial_result))
+
+        prefetched = [
+            call for call in hooks.trace
+            if call.method_name == 'on_chunk_prefetched'
+        ]
+        chunks = [
+            call for call in hooks.trace
+            if call.method_name == 'computing_chunk'
+            and call.state == 'enter'
+        ]
+        self.assertEqual(len(prefetched), len(chunks))
+        self.assertGreater(len(prefetched), 1)
+        for call, chunk in zip(prefetched, chunks):
+            start_date, end_date, load_time, wait_time = call.args
+            self.assertEqual((start_date, end_date), chunk.args[1:])
+            self.assertGreaterEqual(load_time, 0)
+            self.assertGreaterEqual(wait_time, 0)
+
     def test_concatenate_empty_chunks(self):
         # Test that we correctly handle concatenating chunked pipelines when
         # some of the chunks are empty. This is slightly tricky b/c pandas
@@ -1583,6 +1702,46 @@ class ChunkedPipelineTestCase(zf.WithSeededRandomPipelineEngine,
         )
 
 
+class ConcurrentComputeTestCase(zf.WithSeededRandomPipelineEngine,
+                                zf.ZiplineTestCase):
+
+    START_DATE = Timestamp('2006-01-05', tz='UTC')
+    END_DATE = Timestamp('2006-03-31', tz='UTC')
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    def test_compute_threads_match_serial(self):
+        float_col = TestingDataSet.float_col
+        sma = SimpleMovingAverage(inputs=[float_col], window_length=5)
+        pipe = Pipeline(
+            columns={
+                'latest': float_col.latest,
+                'sma_5': sma,
+                'sma_10': SimpleMovingAverage(
+                    inputs=[float_col],
+                    window_length=10,
+                ),
+                'ewma': EWMA.from_span(
+                    inputs=[float_col],
+                    window_length=20,
+                    span=10,
+                ),
+                'drawdown': MaxDrawdown(inputs=[float_col], window_length=5),
+                'demeaned': sma.demean(),
+                'top': sma.top(5, mask=float_col.latest > 0),
+            },
+            domain=US_EQUITIES,
+        )
+        serial = self.run_pipeline(pipe, self.START_DATE, self.END_DATE)
+
+        engine = SimplePipelineEngine(
+            get_loader=lambda column: self.seeded_random_loader,
+            asset_finder=self.asset_finder,
+            compute_threads=4,
+        )
+        concurrent = engine.run_pipeline(pipe, self.START_DATE, self.END_DATE)
+        assert_frame_equal(concurrent, serial)
+
+
 class MaximumRegressionTest(zf.WithSeededRandomPipelineEngine,
                             zf.ZiplineTestCase):
     ASSET_FINDER_EQUITY_SIDS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
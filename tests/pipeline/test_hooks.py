@@ -12,6 +12,7 @@ from zipline.pipeline.factors import CustomFactor
 from zipline.pipeline.data import Column, DataSet
 from zipline.pipeline.data.testing import TestingDataSet
 from zipline.pipeline.hooks.testing import TestingHooks
+from zipline.pipeline.hooks.profiling import ProfilingHooks
 from zipline.pipeline.hooks.progress import (
     ProgressHooks,
     repr_htmlsafe,
@@ -132,6 +133,15 @@ class HooksTestCase(WithSeededRandomPipelineEngine, ZiplineTestCase):
             (pipeline, pipeline_start_date, pipeline_end_date),
         )
 
+        # Every load and compute is followed by its outputs.
+        outputs = [c for c in trace if c.method_name == 'on_term_output']
+        trace = [c for c in trace if c.method_name != 'on_term_output']
+        output_terms = {
+            term.unspecialize() if isinstance(term, LoadableTerm) else term
+            for term, _ in (call.args for call in outputs)
+        }
+        self.assertEqual(output_terms, expected_loads | expected_computes)
+
         # Break up the trace into the traces of each chunk.
         chunk_traces = self.split_by_chunk(trace[1:-1])
 
@@ -464,6 +474,63 @@ class ProgressHooksTestCase(WithSeededRandomPipelineEngine, ZiplineTestCase):
         return round((100.0 * days_complete) / total_days, 3)
 
 
+class ProfilingHooksTestCase(WithSeededRandomPipelineEngine,
+                             ZiplineTestCase):
+    """Tests for verifying ProfilingHooks.
+    """
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    def test_profiling_hooks(self):
+        hooks = ProfilingHooks()
+        pipeline = Pipeline(
+            {
+                'bool_': TestingDataSet.bool_col.latest,
+                'factor_rank': TrivialFactor().rank().zscore(),
+            },
+            domain=US_EQUITIES,
+        )
+        start_date, end_date = self.trading_days[[-10, -1]]
+        self.run_chunked_pipeline(
+            pipeline=pipeline,
+            start_date=start_date,
+            end_date=end_date,
+            chunksize=5,
+            hooks=[hooks],
+        )
+
+        profile = hooks.to_frame()
+        self.assertEqual(
+            set(profile.kind),
+            {'load', 'compute'},
+        )
+        self.assertEqual(
+            set(zip(profile.start_date, profile.end_date)),
+            {
+                tuple(self.trading_days[[-10, -6]]),
+                tuple(self.trading_days[[-5, -1]]),
+            },
+        )
+        self.assertTrue((profile.wall_time >= 0).all())
+        self.assertTrue((profile.peak_bytes >= 0).all())
+
+        # One computation of TrivialFactor for each 5 day chunk.
+        factor = profile[
+            (profile.kind == 'compute') &
+            (profile.terms == TrivialFactor().recursive_repr())
+        ]
+        self.assertEqual(len(factor), 2)
+        self.assertEqual(list(factor['shape']), [(5, len(self._sids))] * 2)
+        self.assertEqual(list(factor['dtype']), ['float64'] * 2)
+
+        report = hooks.report(top=3)
+        self.assertEqual(len(report), 3)
+        self.assertTrue(report.wall_time.is_monotonic_decreasing)
+
+        split = hooks.split()
+        self.assertEqual(set(split.index), {'load', 'compute'})
+        self.assertAlmostEqual(split.share.sum(), 1.0)
+
+
 class TermReprTestCase(ZiplineTestCase):
 
     def test_htmlsafe_repr(self):
@@ -44,6 +44,7 @@ from zipline.pipeline.loaders.synthetic import (
     expected_bar_values_2d,
 )
 from zipline.pipeline.loaders.equity_pricing_loader import (
+    IncrementalEquityPricingLoader,
     USEquityPricingLoader,
 )
 
@@ -657,3 +658,59 @@ class USEquityPricingLoaderTestCase(WithAdjustmentReader,
             highs.traverse(windowlen + 1)
         with self.assertRaises(WindowLengthTooLong):
             volumes.traverse(windowlen + 1)
+
+    def test_incremental_loader_matches(self):
+        columns = [USEquityPricing.high, USEquityPricing.volume]
+        query_days = self.calendar_days_between(
+            TEST_QUERY_START,
+            TEST_QUERY_STOP
+        )
+        sids = Int64Index(arange(1, 7))
+
+        pricing_loader = USEquityPricingLoader.without_fx(
+            self.bcolz_equity_daily_bar_reader,
+            self.adjustment_reader,
+        )
+        incremental_loader = IncrementalEquityPricingLoader.from_loader(
+            pricing_loader,
+        )
+
+        reads = []
+
+        class RecordingReader(object):
+            def load_raw_arrays(self, colnames, start, end, assets):
+                reads.append((start, end, len(assets)))
+                return pricing_loader.raw_price_reader.load_raw_arrays(
+                    colnames, start, end, assets,
+                )
+
+        incremental_loader.raw_price_reader = RecordingReader()
+
+        window_length = 5
+        for end in range(window_length, len(query_days) + 1):
+            dates = query_days[end - window_length:end]
+            # Drop an asset on some days, which must be read again when it
+            # comes back.
+            day_sids = sids[:-1] if end % 3 == 0 else sids
+            kwargs = dict(
+                domain=US_EQUITIES,
+                columns=columns,
+                dates=dates,
+                sids=day_sids,
+                mask=ones((len(dates), len(day_sids)), dtype=bool),
+            )
+            expected = pricing_loader.load_adjusted_array(**kwargs)
+            results = incremental_loader.load_adjusted_array(**kwargs)
+
+            for column in columns:
+                assert_array_equal(results[column].data,
+                                   expected[column].data)
+                self.assertEqual(results[column].adjustments,
+                                 expected[column].adjustments)
+
+        # After the first window, only the new session (or the returning
+        # asset) is read.
+        first = reads[:len(columns)]
+        self.assertTrue(all(start != end for start, end, _ in first))
+        for start, end, n_assets in reads[len(columns):]:
+            self.assertTrue(start == end or n_assets == 1)
@@ -19,7 +19,7 @@ import pandas as pd
 from zipline.assets import Equity
 from zipline.finance.blotter import SimulationBlotter
 from zipline.finance.cancel_policy import EODCancel, NeverCancel
-from zipline.finance.commission import PerTrade
+from zipline.finance.commission import PerDollar, PerShare, PerTrade
 from zipline.finance.execution import (
     LimitOrder,
     MarketOrder,
@@ -29,6 +29,7 @@ from zipline.finance.execution import (
 from zipline.finance.order import ORDER_STATUS, Order
 from zipline.finance.slippage import (
     DEFAULT_EQUITY_VOLUME_SLIPPAGE_BAR_LIMIT,
+    FixedBasisPointsSlippage,
     FixedSlippage,
     VolumeShareSlippage,
 )
@@ -410,3 +411,47 @@ class BlotterTestCase(WithCreateBarData,
             bar_data.current(future_txn.asset, 'price') + 1.0,
         )
         self.assertEqual(commissions[1]['cost'], 2.0)
+
+    @parameterized.expand([
+        (FixedBasisPointsSlippage(), PerShare(min_trade_cost=1.0)),
+        (FixedSlippage(spread=0.5), PerTrade(cost=2.0)),
+        (VolumeShareSlippage(), PerDollar()),
+        (VolumeShareSlippage(volume_limit=0.1), PerShare()),
+    ])
+    def test_batch_fills_match_per_order_fills(self, slippage, commission):
+        batched = SimulationBlotter(
+            equity_slippage=slippage,
+            equity_commission=commission,
+        )
+        per_order = SimulationBlotter(
+            equity_slippage=slippage,
+            equity_commission=commission,
+        )
+        per_order._get_batch_fills = lambda bar_data: {}
+
+        for blotter in batched, per_order:
+            for asset, amount in ((self.asset_24, 5),
+                                  (self.asset_25, 4),
+                                  (self.asset_24, -3),
+                                  (self.asset_24, 7)):
+                blotter.order(asset, amount, MarketOrder(), order_id=(
+                    '%d-%d' % (asset.sid, len(blotter.orders))
+                ))
+
+        for dt in self.sim_params.sessions:
+            bar_data = self.create_bardata(simulation_dt_func=lambda: dt)
+            results = []
+            for blotter in batched, per_order:
+                blotter.current_dt = dt
+                txns, commissions, closed = blotter.get_transactions(bar_data)
+                blotter.prune_orders(closed)
+                results.append((
+                    [(t.order_id, t.amount, round(t.price, 10))
+                     for t in txns],
+                    [(c['order'].id, round(c['cost'], 10))
+                     for c in commissions],
+                    [order.id for order in closed],
+                ))
+            self.assertEqual(results[0], results[1])
+            if dt == self.sim_params.sessions[0]:
+                self.assertTrue(results[0][0])
@@ -219,3 +219,36 @@ class CmdLineTestCase(WithTmpDir, ZiplineTestCase):
         assert_equal(spec.benchmark_sid, None)
         assert_equal(spec.benchmark_symbol, None)
         assert_equal(spec.no_benchmark, False)
+
+    def test_incremental_pipeline_argument(self):
+        runner = CliRunner()
+
+        # CLI validates that the algo file exists, so create an empty file.
+        algo_path = self.tmpdir.getpath('dummy_algo.py')
+        with open(algo_path, 'w'):
+            pass
+
+        def run_and_get_incremental_pipeline(extra_args):
+            args = [
+                '--no-default-extension',
+                'run',
+                '-s', '2014-01-02',
+                '-e 2015-01-02',
+                '--algofile', algo_path,
+            ] + extra_args
+
+            mock_spec = mock.create_autospec(main._run)
+
+            with mock.patch.object(main, '_run', spec=mock_spec) as mock_run:
+                result = runner.invoke(main.main, args, catch_exceptions=False)
+
+            assert_equal(result.exit_code, 0, msg=result.output)
+            mock_run.assert_called_once()
+
+            return mock_run.call_args[1]['incremental_pipeline']
+
+        assert_equal(run_and_get_incremental_pipeline([]), False)
+        assert_equal(
+            run_and_get_incremental_pipeline(['--incremental-pipeline']),
+            True,
+        )
@@ -21,6 +21,7 @@ from pandas import Timedelta
 from six import iteritems
 
 from zipline.assets import Equity, Future
+from zipline.data.adjustments import SQLiteAdjustmentReader
 from zipline.data.data_portal import HISTORY_FREQUENCIES, OHLCV_FIELDS
 from zipline.data.minute_bars import (
     FUTURES_MINUTES_PER_DAY,
@@ -373,6 +374,32 @@ class DataPortalTestBase(WithDataPortal,
                   for field in expected.keys()]
         assert_almost_equal(array(list(expected.values())), result)
 
+    @parameter_space(data_frequency=['daily', 'minute'])
+    def test_get_spot_value_batch_matches_scalar(self, data_frequency):
+        assets = self.asset_finder.retrieve_all([3, 1, 2])
+        trading_calendar = self.trading_calendars[Equity]
+        dts = [
+            trading_calendar.minutes_for_session(self.trading_days[2])[1],
+            trading_calendar.minutes_for_session(self.trading_days[2])[100],
+            trading_calendar.minutes_for_session(self.trading_days[3])[0],
+        ]
+        for dt in dts:
+            if data_frequency == 'daily':
+                dt = trading_calendar.minute_to_session_label(dt)
+            for field in sorted(OHLCV_FIELDS) + ['price']:
+                assert_almost_equal(
+                    self.data_portal.get_spot_value(
+                        assets, field, dt, data_frequency,
+                    ),
+                    [
+                        self.data_portal.get_spot_value(
+                            asset, field, dt, data_frequency,
+                        )
+                        for asset in assets
+                    ],
+                    err_msg="at dt={} field={}".format(dt, field),
+                )
+
     def test_get_spot_value_multiple_assets(self):
         equity = self.asset_finder.retrieve_asset(1)
         future = self.asset_finder.retrieve_asset(10000)
@@ -399,8 +426,15 @@ class DataPortalTestBase(WithDataPortal,
         assert_almost_equal(expected.values.tolist(), result)
 
     @parameter_space(data_frequency=['daily', 'minute'],
-                     field=['close', 'price'])
-    def test_get_adjustments(self, data_frequency, field):
+                     field=['close', 'price'],
+                     preload=[False, True])
+    def test_get_adjustments(self, data_frequency, field, preload):
+        if preload:
+            self.data_portal._adjustment_reader = SQLiteAdjustmentReader(
+                self.adjustment_reader.conn,
+                preload=True,
+            )
+
         asset = self.asset_finder.retrieve_asset(self.DIVIDEND_ASSET_SID)
         calendar = self.trading_calendars[Equity]
         day = calendar.day
@@ -277,6 +277,20 @@ DEFAULT_BUNDLE = 'quantopian-quandl'
     is_flag=True,
     help='Get list of available brokers'
 )
+@click.option(
+    '--incremental-pipeline',
+    is_flag=True,
+    help='With live trading, keep the pricing data loaded by the pipelines'
+         ' in memory and only load the new sessions at the next run.',
+)
+@click.option(
+    '--profile-pipeline',
+    default=None,
+    metavar='FILENAME',
+    help="Profile the pipelines of the algorithm and write the time, memory"
+         " and output of each term to this file as csv. If this is '-' a"
+         " report of the most expensive terms is written to stdout.",
+)
 @click.pass_context
 def run(ctx,
         algofile,
@@ -302,7 +316,9 @@ def run(ctx,
         broker_uri,
         state_file,
         realtime_bar_target,
-        list_brokers):
+        list_brokers,
+        incremental_pipeline,
+        profile_pipeline):
     """Run a backtest for the given algorithm.
     """
 
@@ -395,9 +411,11 @@ def run(ctx,
         broker=brokerobj,
         state_filename=state_file,
         realtime_bar_target=realtime_bar_target,
+        incremental_pipeline=incremental_pipeline,
         performance_callback=None,
         stop_execution_callback=None,
-        execution_id=None
+        execution_id=None,
+        profile_pipeline=profile_pipeline,
     )
 
 
@@ -187,6 +187,9 @@ class TradingAlgorithm(object):
     stop_execution_callback : callback[() -> bool], optional
         A callback to check if execution should be stopped. it is used to be able to stop live trading (also simulation
         could be stopped using this) execution. if the callback returns True, then algo execution will be aborted.
+    pipeline_hooks : list[implements(PipelineHooks)], optional
+        Hooks instrumenting every pipeline run by the algorithm, e.g. a
+        :class:`zipline.pipeline.hooks.ProfilingHooks`.
     equities_metadata : dict or DataFrame or file-like object, optional
         If dict is provided, it must have the following structure:
         * keys are the identifiers
@@ -251,6 +254,7 @@ class TradingAlgorithm(object):
                  create_event_context=None,
                  performance_callback=None,
                  stop_execution_callback=None,
+                 pipeline_hooks=None,
                  **initialize_kwargs):
         # List of trading controls to be used to validate orders.
         self.trading_controls = []
@@ -318,6 +322,7 @@ class TradingAlgorithm(object):
             self._metrics_set = load_metrics_set('default')
 
         # Initialize Pipeline API data.
+        self._pipeline_hooks = list(pipeline_hooks or [])
         self.init_engine(get_pipeline_loader)
         self._pipelines = {}
 
@@ -443,6 +448,7 @@ class TradingAlgorithm(object):
                 get_loader,
                 self.asset_finder,
                 self.default_pipeline_domain(self.trading_calendar),
+                default_hooks=self._pipeline_hooks,
             )
         else:
             self.engine = ExplodingPipelineEngine()
@@ -20,8 +20,13 @@ from dateutil.relativedelta import relativedelta
 from zipline.finance.blotter.blotter_live import BlotterLive
 from zipline.algorithm import TradingAlgorithm
 from zipline.errors import ScheduleFunctionOutsideTradingStart
-from zipline.gens.realtimeclock import RealtimeClock
+from zipline.gens.realtimeclock import (RealtimeClock,
+                                        DEFAULT_HEARTBEAT_INTERVAL)
 from zipline.gens.tradesimulation import AlgorithmSimulator
+from zipline.pipeline.loaders import (
+    EquityPricingLoader,
+    IncrementalEquityPricingLoader,
+)
 from zipline.utils.api_support import ZiplineAPI, \
     allowed_only_in_before_trading_start, api_method
 from zipline.utils.pandas_utils import normalize_date
@@ -34,6 +39,23 @@ log = logbook.Logger("Live Trading")
 _minutes_before_trading_starts = 60*4
 
 
+def _incremental_loaders(get_loader):
+    incremental = {}
+
+    def get_incremental_loader(column):
+        loader = get_loader(column)
+        if type(loader) is not EquityPricingLoader:
+            return loader
+        try:
+            return incremental[loader]
+        except KeyError:
+            incremental[loader] = \
+                IncrementalEquityPricingLoader.from_loader(loader)
+            return incremental[loader]
+
+    return get_incremental_loader
+
+
 class LiveAlgorithmExecutor(AlgorithmSimulator):
     def __init__(self, *args, **kwargs):
         super(self.__class__, self).__init__(*args, **kwargs)
@@ -53,6 +75,12 @@ class LiveTradingAlgorithm(TradingAlgorithm):
         self.algo_filename = kwargs.get('algo_filename', "<algorithm>")
         self.state_filename = kwargs.pop('state_filename', None)
         self.realtime_bar_target = kwargs.pop('realtime_bar_target', None)
+        # how often the clock checks whether the broker is alive
+        self.broker_heartbeat_interval = kwargs.pop(
+            'broker_heartbeat_interval', DEFAULT_HEARTBEAT_INTERVAL)
+        # keep the loaded pricing windows between the daily pipeline runs,
+        # opt-in as the kept windows stay in memory
+        self.incremental_pipeline = kwargs.pop('incremental_pipeline', False)
         # Persistence blacklist/whitelist and excludes gives a way to include/
         # exclude (so do not persist on disk if initiated or excluded from the serialization
         # function that reinstate or save the context variable to its last state).
@@ -73,6 +101,18 @@ class LiveTradingAlgorithm(TradingAlgorithm):
         super(self.__class__, self).__init__(*args, **kwargs)
         log.info("initialization done")
 
+    def init_engine(self, get_loader):
+        """
+        Construct the PipelineEngine. With ``incremental_pipeline``, the
+        EquityPricingLoaders returned by ``get_loader`` are swapped for
+        IncrementalEquityPricingLoaders. The pipeline is run every morning
+        over a window shifted by one session, so only the newest session has
+        to be read each day.
+        """
+        if get_loader is not None and self.incremental_pipeline:
+            get_loader = _incremental_loaders(get_loader)
+        super(self.__class__, self).init_engine(get_loader)
+
     def initialize(self, *args, **kwargs):
 
         self._context_persistence_excludes = \
@@ -144,7 +184,8 @@ class LiveTradingAlgorithm(TradingAlgorithm):
             time_skew=self.broker.time_skew,
             is_broker_alive=self.broker.is_alive,
             execution_id=self.sim_params._execution_id if hasattr(self.sim_params, "_execution_id") else None,
-            stop_execution_callback=self._stop_execution_callback
+            stop_execution_callback=self._stop_execution_callback,
+            heartbeat_interval=self.broker_heartbeat_interval,
         )
 
     def _create_generator(self, sim_params):
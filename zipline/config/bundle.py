@@ -48,6 +48,38 @@ class AlpacaConfig:
         else:
             return os.environ.get('ZT_CUSTOM_ASSET_LIST')
 
+    @property
+    def data_stream_url(self):
+        if CONFIG_PATH and self.al and self.al.get("data_stream_url"):
+            return self.al["data_stream_url"]
+        else:
+            return os.environ.get('APCA_API_DATA_STREAM_URL')
+
+    @property
+    def data_url(self):
+        if CONFIG_PATH and self.al and self.al.get("data_url"):
+            return self.al["data_url"]
+        else:
+            return os.environ.get('APCA_API_DATA_URL')
+
+    @property
+    def stream_market_data(self):
+        """
+        stream the market data of the traded assets over a websocket instead
+        of polling the REST API on every bar.
+        you could define it in the config file or override it with this env
+        variable: APCA_STREAM_MARKET_DATA
+        :return:
+        """
+        val = False
+        if os.environ.get('APCA_STREAM_MARKET_DATA'):
+            val = os.environ.get('APCA_STREAM_MARKET_DATA')
+        elif CONFIG_PATH and self.al and self.al.get("stream_market_data"):
+            val = self.al["stream_market_data"]
+        if isinstance(val, str):
+            val = val.lower() in ('1', 'true', 'yes')
+        return bool(val)
+
 
 
 class AlphaVantage:
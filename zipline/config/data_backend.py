@@ -86,6 +86,70 @@ class PostgresDB:
             raise Exception("Postgres password not defined by user")
         return val
 
+    def _flag(self, key, env):
+        """
+        a boolean option of the postgres section in the zipline-trader config
+        file, overridden by the env variable ``env``. off by default.
+        """
+        val = False
+        if os.environ.get(env):
+            val = os.environ.get(env)
+        elif CONFIG_PATH and self.pg and self.pg.get(key):
+            val = self.pg.get(key)
+        if isinstance(val, str):
+            val = val.lower() in ('1', 'true', 'yes')
+        return bool(val)
+
+    @property
+    def bulk_write(self):
+        """
+        stream the daily bars into the db with COPY in large batches instead
+        of one insert per sid. recommended for large (full universe) ingests.
+        you could define it in the zipline-trader config file or
+        override it with this env variable: ZIPLINE_DATA_BACKEND_BULK_WRITE
+        :return:
+        """
+        return self._flag('bulk_write', 'ZIPLINE_DATA_BACKEND_BULK_WRITE')
+
+    @property
+    def daily_bar_snapshot(self):
+        """
+        load the daily bars in a single pass and keep a memory-mapped copy
+        in the zipline cache folder, so repeated runs don't re-scan the db.
+        you could define it in the zipline-trader config file or
+        override it with this env variable:
+        ZIPLINE_DATA_BACKEND_DAILY_BAR_SNAPSHOT
+        :return:
+        """
+        return self._flag('daily_bar_snapshot',
+                          'ZIPLINE_DATA_BACKEND_DAILY_BAR_SNAPSHOT')
+
+    @property
+    def minute_bar_cache(self):
+        """
+        keep the session blocks of minute bars read from the db in the zipline
+        cache folder, memory-mapped by later runs until new bars are written.
+        you could define it in the zipline-trader config file or
+        override it with this env variable:
+        ZIPLINE_DATA_BACKEND_MINUTE_BAR_CACHE
+        :return:
+        """
+        return self._flag('minute_bar_cache',
+                          'ZIPLINE_DATA_BACKEND_MINUTE_BAR_CACHE')
+
+    @property
+    def adjustments_preload(self):
+        """
+        load all the splits, mergers and dividends into memory on first use
+        instead of querying the db for every sid and date.
+        you could define it in the zipline-trader config file or
+        override it with this env variable:
+        ZIPLINE_DATA_BACKEND_ADJUSTMENTS_PRELOAD
+        :return:
+        """
+        return self._flag('adjustments_preload',
+                          'ZIPLINE_DATA_BACKEND_ADJUSTMENTS_PRELOAD')
+
 
 if __name__ == '__main__':
     print(ZIPLINE_CONFIG)
@@ -99,6 +99,132 @@ def specialize_any_integer(d):
     return out
 
 
+# The columns of the tables held by an AdjustmentIndex. The rows of every
+# table are indexed by sid and by the date in the second column.
+ADJUSTMENT_INDEX_COLUMNS = {
+    'splits': ('sid', 'effective_date', 'ratio'),
+    'mergers': ('sid', 'effective_date', 'ratio'),
+    'dividends': ('sid', 'effective_date', 'ratio'),
+    'dividend_payouts': (
+        'sid', 'ex_date', 'declared_date', 'record_date', 'pay_date', 'amount',
+    ),
+    'stock_dividend_payouts': (
+        'sid', 'ex_date', 'declared_date', 'record_date', 'pay_date',
+        'payment_sid', 'ratio',
+    ),
+}
+
+# Dates are seconds since epoch. They are packed with the sid into a single
+# int64 key, the date (offset to be positive) taking the lowest 34 bits.
+_DATE_BITS = 34
+_DATE_OFFSET = 1 << (_DATE_BITS - 1)
+MAX_INDEX_SID = (1 << (63 - _DATE_BITS)) - 1
+MAX_INDEX_SECONDS = _DATE_OFFSET - 1
+
+
+def _index_keys(sids, seconds):
+    return (
+        (np.asarray(sids, dtype=np.int64) << _DATE_BITS) +
+        (np.asarray(seconds, dtype=np.int64) + _DATE_OFFSET)
+    )
+
+
+class AdjustmentIndex(object):
+    """
+    The adjustments of an adjustments db, loaded once into numpy arrays sorted
+    by sid and date, so that they are looked up with ``searchsorted`` instead
+    of queries.
+
+    Parameters
+    ----------
+    tables : dict[str -> pd.DataFrame]
+        The rows of every table of ``ADJUSTMENT_INDEX_COLUMNS``, with dates as
+        seconds since epoch.
+    """
+    def __init__(self, tables):
+        self._columns = {}
+        self._keys = {}
+        for name, columns in six.iteritems(ADJUSTMENT_INDEX_COLUMNS):
+            frame = tables[name]
+            sids = frame['sid'].values.astype(np.int64)
+            dates = frame[columns[1]].values.astype(np.int64)
+            if len(sids) and (sids.min() < 0 or sids.max() > MAX_INDEX_SID):
+                raise ValueError(
+                    "Can't index the sids of %s outside of [0, %d]." % (
+                        name, MAX_INDEX_SID,
+                    )
+                )
+
+            order = np.lexsort((dates, sids))
+            self._columns[name] = {
+                column: frame[column].values[order] for column in columns
+            }
+            self._keys[name] = _index_keys(sids[order], dates[order])
+
+    @classmethod
+    def from_connection(cls, conn):
+        """
+        Load the tables from a sqlite3 or psycopg2 connection to an
+        adjustments db.
+        """
+        return cls({
+            name: pd.read_sql(
+                'SELECT {} FROM {}'.format(', '.join(columns), name),
+                conn,
+            )
+            for name, columns in six.iteritems(ADJUSTMENT_INDEX_COLUMNS)
+        })
+
+    def column(self, table_name, column):
+        """
+        The values of ``column`` of a table, in index order.
+        """
+        return self._columns[table_name][column]
+
+    def bounds(self, table_name, sids, start, end):
+        """
+        The rows of each of ``sids`` dated after ``start`` and on or before
+        ``end``.
+
+        Parameters
+        ----------
+        table_name : str
+            The table to look up.
+        sids : array-like[int]
+            The sids to look up.
+        start, end : int or array-like[int]
+            The range of dates, as seconds since epoch.
+
+        Returns
+        -------
+        lo, hi : np.ndarray[intp]
+            Aligned with ``sids``: the rows of ``sids[i]`` are the rows
+            ``lo[i]:hi[i]`` of the columns of the table.
+        """
+        keys = self._keys[table_name]
+        start = np.clip(start, -_DATE_OFFSET, MAX_INDEX_SECONDS)
+        end = np.clip(end, -_DATE_OFFSET, MAX_INDEX_SECONDS)
+        return (
+            keys.searchsorted(_index_keys(sids, start), side='right'),
+            keys.searchsorted(_index_keys(sids, end), side='right'),
+        )
+
+    def for_sid(self, table_name, sid):
+        """
+        All the (date, ratio) pairs of ``sid`` in the table, earliest first,
+        in the format of ``SQLiteAdjustmentReader.get_adjustments_for_sid``.
+        """
+        (lo,), (hi,) = self.bounds(
+            table_name, [sid], -_DATE_OFFSET, MAX_INDEX_SECONDS,
+        )
+        dates = self.column(table_name, 'effective_date')[lo:hi]
+        ratios = self.column(table_name, 'ratio')[lo:hi]
+        return [
+            [Timestamp(date, unit='s', tz='UTC'), ratio]
+            for date, ratio in zip(dates.tolist(), ratios.tolist())
+        ]
+
+
 class SQLiteAdjustmentReader(object):
     """
     Loads adjustments based on corporate actions from a SQLite database.
@@ -109,6 +235,10 @@ class SQLiteAdjustmentReader(object):
     ----------
     conn : str or sqlite3.Connection
         Connection from which to load data.
+    preload : bool, optional
+        Load all the splits, mergers, dividends and payouts into an
+        ``AdjustmentIndex`` on first use, and serve the lookups by sid and
+        date from it instead of querying the db every time.
 
     See Also
     --------
@@ -142,10 +272,29 @@ class SQLiteAdjustmentReader(object):
     }
 
     @preprocess(conn=coerce_string_to_conn(require_exists=True))
-    def __init__(self, conn):
+    def __init__(self, conn, preload=False):
         self.conn = conn
         self._dividend_cache = {}
         self._stock_dividend_cache = {}
+        self._preload = preload
+        self._adjustment_index = None
+
+    @property
+    def adjustment_index(self):
+        """
+        The ``AdjustmentIndex`` of the db in preload mode, otherwise None.
+        """
+        if self._preload and self._adjustment_index is None:
+            self.preload()
+        return self._adjustment_index
+
+    def preload(self):
+        """
+        Load the adjustments into an ``AdjustmentIndex`` now, and serve the
+        later lookups from it.
+        """
+        self._adjustment_index = AdjustmentIndex.from_connection(self.conn)
+        self._preload = True
 
     def __enter__(self):
         return self
@@ -224,6 +373,10 @@ class SQLiteAdjustmentReader(object):
         ]
 
     def get_adjustments_for_sid(self, table_name, sid):
+        index = self.adjustment_index
+        if index is not None:
+            return index.for_sid(table_name.lower(), sid)
+
         t = (sid,)
         c = self.conn.cursor()
         c.execute(f'SELECT effective_date, ratio FROM {table_name} WHERE sid = {sid}')
@@ -236,6 +389,23 @@ class SQLiteAdjustmentReader(object):
                 adjustments_for_sid]
 
     def get_dividends_with_ex_date(self, assets, date, asset_finder):
+        index = self.adjustment_index
+        if index is not None:
+            return [
+                Dividend(
+                    asset,
+                    index.column('dividend_payouts', 'amount')[row],
+                    Timestamp(
+                        index.column('dividend_payouts', 'pay_date')[row],
+                        unit='s',
+                        tz='UTC',
+                    ),
+                )
+                for asset, row in self._rows_with_ex_date(
+                    index, 'dividend_payouts', assets, date,
+                )
+            ]
+
         divs = []
         seconds = date.value / int(1e9)
 
@@ -262,6 +432,27 @@ class SQLiteAdjustmentReader(object):
         return divs
 
     def get_stock_dividends_with_ex_date(self, assets, date, asset_finder):
+        index = self.adjustment_index
+        if index is not None:
+            table = 'stock_dividend_payouts'
+            return [
+                StockDividend(
+                    asset,
+                    asset_finder.retrieve_asset(
+                        index.column(table, 'payment_sid')[row],
+                    ),
+                    index.column(table, 'ratio')[row],
+                    Timestamp(
+                        index.column(table, 'pay_date')[row],
+                        unit='s',
+                        tz='UTC',
+                    ),
+                )
+                for asset, row in self._rows_with_ex_date(
+                    index, table, assets, date,
+                )
+            ]
+
         stock_divs = []
         seconds = date.value / int(1e9)
 
@@ -288,6 +479,26 @@ class SQLiteAdjustmentReader(object):
 
         return stock_divs
 
+    @staticmethod
+    def _rows_with_ex_date(index, table_name, assets, date):
+        """
+        The (asset, row) pairs of the payouts of ``assets`` with an ex date
+        of ``date``.
+        """
+        assets = list(assets)
+        seconds = date.value // int(1e9)
+        lo, hi = index.bounds(
+            table_name,
+            [int(asset) for asset in assets],
+            seconds - 1,
+            seconds,
+        )
+        return [
+            (assets[i], row)
+            for i in np.flatnonzero(hi > lo)
+            for row in range(lo[i], hi[i])
+        ]
+
     def unpack_db_to_component_dfs(self, convert_dates=False):
         """Returns the set of known tables in the adjustments file in DataFrame
         form.
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import ABCMeta, abstractmethod, abstractproperty
+
+import numpy as np
 from six import with_metaclass
 
 
@@ -125,6 +127,36 @@ class BarReader(with_metaclass(ABCMeta, object)):
         """
         pass
 
+    def get_values(self, sids, dt, field):
+        """
+        Retrieve the values of a field for many sids at the same dt.
+
+        The default implementation looks up every sid with ``get_value``.
+        Readers that can answer the whole batch at once should override it.
+
+        Parameters
+        ----------
+        sids : list[int]
+            The asset identifiers.
+        dt : pd.Timestamp
+            The timestamp for the desired data points.
+        field : string
+            The OHLVC name for the desired data points.
+
+        Returns
+        -------
+        values : np.ndarray[float64]
+            The values aligned with ``sids``. NaN for every sid for which
+            ``get_value`` would raise ``NoDataOnDate``.
+        """
+        values = np.empty(len(sids), dtype=np.float64)
+        for i, sid in enumerate(sids):
+            try:
+                values[i] = self.get_value(sid, dt, field)
+            except NoDataOnDate:
+                values[i] = np.nan
+        return values
+
     @abstractmethod
     def get_last_traded_dt(self, asset, dt):
         """
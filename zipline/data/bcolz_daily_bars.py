@@ -709,6 +709,47 @@ class BcolzDailyBarReader(CurrencyAwareSessionBarReader):
         else:
             return price
 
+    def get_values(self, sids, dt, field):
+        """
+        Vectorized version of ``get_value`` for many sids, gathering all the
+        values from the column with one fancy index.
+
+        Returns
+        -------
+        values : np.ndarray[float64]
+            The values aligned with ``sids``. NaN for sids without data on
+            ``dt`` and, except for volume, where the price is 0.
+        """
+        values = np.full(len(sids), nan)
+        try:
+            day_loc = self.sessions.get_loc(dt)
+        except KeyError:
+            return values
+
+        first_rows = self._first_rows
+        last_rows = self._last_rows
+        calendar_offsets = self._calendar_offsets
+        sids = [int(sid) for sid in sids]
+        first = np.array([first_rows.get(sid, -1) for sid in sids],
+                         dtype=np.intp)
+        last = np.array([last_rows.get(sid, -1) for sid in sids],
+                        dtype=np.intp)
+        offsets = np.array([calendar_offsets.get(sid, -1) for sid in sids],
+                           dtype=np.intp)
+
+        ix = first + (day_loc - offsets)
+        valid = (first != -1) & (ix >= first) & (ix <= last)
+        if not valid.any():
+            return values
+
+        raw = self._spot_col(field)[ix[valid]].astype(np.float64)
+        if field == 'volume':
+            values[valid] = raw
+        else:
+            raw[raw == 0] = nan
+            values[valid] = raw * 0.001
+        return values
+
     def currency_codes(self, sids):
         # XXX: This is pretty inefficient. This reader doesn't really support
         # country codes, so we always either return USD or None if we don't
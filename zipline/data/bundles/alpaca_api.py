@@ -1,17 +1,21 @@
 import collections
+import os
 import alpaca_trade_api as tradeapi
 from datetime import timedelta, time as dtime
 import numpy as np
 from pathlib import Path
 import pandas as pd
-import pytz
 from alpaca_trade_api.common import URL
 from dateutil import tz
+import trading_calendars
 from trading_calendars import TradingCalendar
 
 import zipline.config
 from zipline.data.bundles import core as bundles
+from zipline.data.bundles.alpaca_fetcher import (AlpacaBarsFetcher,
+                                                 DEFAULT_DATA_URL)
 from zipline.data.bundles.common import asset_to_sid_map
+from zipline.utils.cache import dataframe_cache
 from zipline.data.bundles.universe import Universe, all_alpaca_assets, get_sp500, get_sp100, get_nasdaq100
 from dateutil.parser import parse as date_parse
 
@@ -31,6 +35,14 @@ def initialize_client():
                            secret_key=secret,
                            base_url=URL(base_url))
 
+
+def create_fetcher(cache=None):
+    conf = zipline.config.bundle.AlpacaConfig()
+    return AlpacaBarsFetcher(conf.key,
+                             conf.secret,
+                             data_url=conf.data_url or DEFAULT_DATA_URL,
+                             cache=cache)
+
 ASSETS = None
 def list_assets():
     global ASSETS
@@ -71,12 +83,16 @@ def get_aggs_from_alpaca(symbols,
                          start,
                          end,
                          granularity,
-                         compression=1):
+                         compression=1,
+                         fetcher=None,
+                         bars=None):
     """
     https://alpaca.markets/docs/api-documentation/api-v2/market-data/bars/
     Alpaca API as a limit of 1000 records per api call. meaning, we need to
     do multiple calls to get all the required data if the date range is
-    large.
+    large. these calls are made concurrently by an AlpacaBarsFetcher (see
+    zipline.data.bundles.alpaca_fetcher). bars already fetched for
+    symbols, e.g. by AlpacaBarsFetcher.fetch_many, are passed as bars.
     also, the alpaca api does not support compression (or, you can't get
     5 minute bars e.g) so we need to resample the received bars.
     also, we need to drop out of market records.
@@ -95,44 +111,6 @@ def get_aggs_from_alpaca(symbols,
       smoothly and return data the same way polygon does
     """
 
-    def _iterate_api_calls():
-        """
-        you could get max 1000 samples from the server. if we need more
-        than that we need to do several api calls.
-
-        currently the alpaca api supports also 5Min and 15Min so we could
-        optimize server communication time by addressing timeframes
-        """
-        got_all = False
-        curr = end
-        response: pd.DataFrame = pd.DataFrame([])
-        while not got_all:
-            if granularity == 'minute' and compression == 5:
-                timeframe = "5Min"
-            elif granularity == 'minute' and compression == 15:
-                timeframe = "15Min"
-            else:
-                timeframe = granularity
-            r = CLIENT.get_barset(symbols,
-                                  timeframe,
-                                  limit=1000,
-                                  end=curr.isoformat()
-                                  )
-            if r:
-                response = r.df if response.empty else pd.concat([r.df, response])
-                response.sort_index(inplace=True)
-                if response.index[0] <= (pytz.timezone(NY).localize(
-                        start) if not start.tzname() else start):
-                    got_all = True
-                else:
-                    delta = timedelta(days=1) if granularity == "day" \
-                        else timedelta(minutes=1)
-                    curr = response.index[0] - delta
-            else:
-                # no more data is available, let's return what we have
-                break
-        return response
-
     def _fillna(df, granularity, start, end):
         if granularity != 'day':
             return df
@@ -190,13 +168,21 @@ def get_aggs_from_alpaca(symbols,
         else:
             return df
 
-    if not start:
+    if bars is not None:
+        response = bars
+        if response.empty:
+            return response
+    elif not start:
         response = CLIENT.get_barset(symbols,
                                      granularity,
                                      limit=1000,
                                      end=end).df
     else:
-        response = _iterate_api_calls()
+        if fetcher is None:
+            fetcher = create_fetcher()
+        response = fetcher.fetch(symbols, start, end, granularity)
+        if response.empty:
+            return response
 
     cdl = response
     if granularity == 'minute':
@@ -222,16 +208,27 @@ def get_aggs_from_alpaca(symbols,
     return processed
 
 MAX_PER_REQUEST_AMOUNT = 200  # Alpaca max symbols per 1 http request
-def df_generator(interval, start, end, assets_to_sids):
+def df_generator(interval, start, end, assets_to_sids, fetcher=None):
     exchange = 'NYSE'
     asset_list = list_assets()
     base_sid = 0
     # some symbols from alpaca are duplicated, which causes an issue with zipline
     # ingest process. for now, we make sure we serve one of them (for now the first one)
     already_ingested = {}
-    for i in range(len(asset_list[::MAX_PER_REQUEST_AMOUNT])):
-        partial = asset_list[MAX_PER_REQUEST_AMOUNT*i:MAX_PER_REQUEST_AMOUNT*(i+1)]
-        df: pd.DataFrame = get_aggs_from_alpaca(partial, start, end, 'day' if interval == '1d' else 'minute', 1)
+    granularity = 'day' if interval == '1d' else 'minute'
+    chunks = [asset_list[i:i + MAX_PER_REQUEST_AMOUNT]
+              for i in range(0, len(asset_list), MAX_PER_REQUEST_AMOUNT)]
+    if fetcher is None:
+        fetcher = create_fetcher()
+    # the requests of all the chunks share the fetcher's thread pool
+    responses = fetcher.fetch_many(chunks, start, end, granularity)
+    for partial, response in zip(chunks, responses):
+        df: pd.DataFrame = get_aggs_from_alpaca(partial, start, end,
+                                                granularity, 1,
+                                                bars=response)
+        if df.empty:
+            # no bars for any of these symbols in the requested range
+            continue
         for _, symbol in enumerate(df.columns.levels[0]):
             try:
                 sid = assets_to_sids[symbol]
@@ -285,17 +282,28 @@ def api_to_bundle(interval=['1m']):
 
         assets_to_sids = asset_to_sid_map(asset_db_writer.asset_finder, list_assets())
 
+        # the responses are kept in the bundle's cache directory, which is
+        # only removed once the ingestion succeeded. a restarted ingestion
+        # doesn't request them again.
+        fetcher = create_fetcher(cache=dataframe_cache(
+            os.path.join(cache.path, 'alpaca_api'),
+            clean_on_failure=False,
+            serialization='pickle',
+        ))
+
         def minute_data_generator():
             return (sid_df for (sid_df, *metadata.iloc[sid_df[0]]) in df_generator(interval='1m',
                                                                                    start=start_session,
                                                                                    end=end_session,
-                                                                                   assets_to_sids=assets_to_sids))
+                                                                                   assets_to_sids=assets_to_sids,
+                                                                                   fetcher=fetcher))
 
         def daily_data_generator():
             return (sid_df for (sid_df, *metadata.iloc[sid_df[0]]) in df_generator(interval='1d',
                                                                                    start=start_session,
                                                                                    end=end_session,
-                                                                                   assets_to_sids=assets_to_sids))
+                                                                                   assets_to_sids=assets_to_sids,
+                                                                                   fetcher=fetcher))
         for _interval in interval:
             metadata = metadata_df()
             if _interval == '1d':
@@ -317,8 +325,6 @@ def api_to_bundle(interval=['1m']):
 if __name__ == '__main__':
     from zipline.data.bundles import register
     from zipline.data import bundles as bundles_module
-    import trading_calendars
-    import os
 
     cal: TradingCalendar = trading_calendars.get_calendar('NYSE')
     end_date = pd.Timestamp('now', tz='utc').date() - timedelta(days=1)
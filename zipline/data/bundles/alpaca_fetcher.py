@@ -0,0 +1,313 @@
+"""
+Concurrent fetching of Alpaca bars for the alpaca_api bundle.
+
+The requested date range is split into windows which each fit into a single
+bars request (one session of minute bars, 1000 sessions of daily bars), so
+every (symbols, window) request is independent of the others. The requests
+of all the symbol chunks run on one bounded thread pool, throttled by a token
+bucket that matches Alpaca's rate limit. The responses of each chunk are
+collected in a list and concatenated once at the end.
+
+Every response is stored in an optional on-disk cache (a
+``zipline.utils.cache.dataframe_cache``), so an interrupted ingestion only
+requests the windows it did not receive yet when it is restarted.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+import trading_calendars
+from logbook import Logger
+
+log = Logger('Alpaca Fetcher')
+
+NY = 'America/New_York'
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+DEFAULT_DATA_URL = 'https://data.alpaca.markets'
+MAX_BARS_PER_REQUEST = 1000
+DEFAULT_MAX_WORKERS = 8
+# Alpaca allows 200 requests per minute and account
+DEFAULT_CALLS_PER_MINUTE = 200
+_max_retries = 5
+_retry_wait = 3  # Seconds
+_request_timeout = 60  # Seconds
+
+
+def _session_label(dt):
+    dt = pd.Timestamp(dt)
+    if dt.tz is not None:
+        dt = dt.tz_convert('UTC').tz_localize(None)
+    return dt.normalize().tz_localize('UTC')
+
+
+class TokenBucket(object):
+    """
+    Thread safe token bucket rate limiter.
+
+    Parameters
+    ----------
+    rate : float
+        The number of tokens added per second.
+    capacity : int
+        The maximum number of tokens, i.e. the allowed burst.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last) * self.rate,
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AlpacaBarsFetcher(object):
+    """
+    Fetches the bars of many symbols over a date range with concurrent,
+    rate limited requests against Alpaca's bars endpoint.
+
+    Parameters
+    ----------
+    key_id : str
+        The Alpaca API key.
+    secret_key : str
+        The Alpaca API secret.
+    data_url : str, optional
+        The market data endpoint.
+    max_workers : int, optional
+        The number of concurrent requests.
+    calls_per_minute : int, optional
+        The maximum number of requests per minute.
+    cache : MutableMapping, optional
+        Where to store the responses, keyed by request.
+    calendar : TradingCalendar, optional
+        The calendar used to split the date range. Defaults to NYSE.
+    """
+    def __init__(self,
+                 key_id,
+                 secret_key,
+                 data_url=DEFAULT_DATA_URL,
+                 max_workers=DEFAULT_MAX_WORKERS,
+                 calls_per_minute=DEFAULT_CALLS_PER_MINUTE,
+                 cache=None,
+                 calendar=None):
+        self._headers = {
+            'APCA-API-KEY-ID': key_id or '',
+            'APCA-API-SECRET-KEY': secret_key or '',
+        }
+        self._data_url = data_url.rstrip('/')
+        self._max_workers = max_workers
+        self._bucket = TokenBucket(calls_per_minute / 60.0,
+                                   min(max_workers, calls_per_minute))
+        self._cache = cache
+        self._calendar = calendar or trading_calendars.get_calendar('NYSE')
+        self._local = threading.local()
+
+    def fetch(self, symbols, start, end, timeframe):
+        """
+        Fetch the bars of ``symbols`` between ``start`` and ``end``.
+
+        Parameters
+        ----------
+        symbols : list[str]
+            At most 200 symbols (Alpaca's limit per request).
+        start, end : pd.Timestamp
+            The first and last session to fetch.
+        timeframe : {'minute', 'day'}
+            The bar size.
+
+        Returns
+        -------
+        bars : pd.DataFrame
+            The bars in the layout of ``REST.get_barset().df``: indexed by
+            the bar times in New York time, with the symbols as level 0 of
+            the columns and the OHLCV fields as level 1.
+        """
+        bars, = self.fetch_many([symbols], start, end, timeframe)
+        return bars
+
+    def fetch_many(self, symbol_chunks, start, end, timeframe):
+        """
+        Fetch the bars of several chunks of symbols between ``start`` and
+        ``end``.
+
+        The requests of all the chunks go to the same thread pool, so the
+        rate limit rather than the number of windows per chunk bounds the
+        throughput.
+
+        Parameters
+        ----------
+        symbol_chunks : list[list[str]]
+            The chunks of at most 200 symbols each.
+        start, end : pd.Timestamp
+            The first and last session to fetch.
+        timeframe : {'minute', 'day'}
+            The bar size.
+
+        Yields
+        ------
+        bars : pd.DataFrame
+            The bars of each chunk, in the order of ``symbol_chunks`` and in
+            the layout of ``fetch``.
+        """
+        windows = self._windows(start, end, timeframe)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [
+                [pool.submit(self._fetch_window, symbols, timeframe, *window)
+                 for window in windows]
+                for symbols in symbol_chunks
+            ]
+            for chunk in futures:
+                yield self._assemble([future.result() for future in chunk])
+
+    @staticmethod
+    def _assemble(pages):
+        """
+        Turn the long format pages of one chunk into the layout of
+        ``REST.get_barset().df``.
+        """
+        pages = [page for page in pages if not page.empty]
+        if not pages:
+            # same column levels as the bars, without any symbol
+            return pd.DataFrame(
+                columns=pd.MultiIndex.from_arrays([[], []]),
+                index=pd.DatetimeIndex([], tz=NY),
+            )
+
+        bars = pd.concat(pages)
+        bars.index = pd.DatetimeIndex(bars.index).tz_convert(NY)
+        bars = bars.set_index('symbol', append=True)[FIELDS] \
+            .unstack('symbol') \
+            .swaplevel(0, 1, axis=1) \
+            .sort_index(axis=1)
+        return bars.sort_index()
+
+    def _windows(self, start, end, timeframe):
+        """
+        Split the sessions from ``start`` to ``end`` into date windows which
+        each fit into a single request.
+        """
+        sessions = self._calendar.sessions_in_range(
+            _session_label(start),
+            _session_label(end),
+        )
+        # minute bars include the extended hours, which still fit into one
+        # request per session
+        per_window = 1 if timeframe == 'minute' else MAX_BARS_PER_REQUEST
+
+        windows = []
+        for i in range(0, len(sessions), per_window):
+            first = sessions[i]
+            last = sessions[min(i + per_window, len(sessions)) - 1]
+            windows.append((
+                pd.Timestamp(first.date(), tz=NY),
+                pd.Timestamp(last.date(), tz=NY) +
+                pd.Timedelta(days=1) - pd.Timedelta(seconds=1),
+            ))
+        return windows
+
+    def _cache_key(self, symbols, timeframe, start, end):
+        digest = hashlib.sha1(','.join(symbols).encode()).hexdigest()
+        return 'alpaca-{}-{}-{}-{}'.format(
+            timeframe,
+            digest[:16],
+            start.strftime('%Y%m%d%H%M%S'),
+            end.strftime('%Y%m%d%H%M%S'),
+        )
+
+    def _fetch_window(self, symbols, timeframe, start, end):
+        key = self._cache_key(symbols, timeframe, start, end)
+        if self._cache is not None:
+            try:
+                return self._cache[key]
+            except KeyError:
+                pass
+            except Exception:
+                # a response partially written before an interruption
+                log.warning('Ignoring unreadable cache entry {}'.format(key))
+
+        page = self._parse(self._request(symbols, timeframe, start, end))
+        if self._cache is not None:
+            self._cache[key] = page
+        return page
+
+    def _session(self):
+        # requests.Session is not thread safe, one per worker
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self._headers)
+        return session
+
+    def _request(self, symbols, timeframe, start, end):
+        url = '{}/v1/bars/{}'.format(self._data_url, timeframe)
+        params = {
+            'symbols': ','.join(symbols),
+            'limit': MAX_BARS_PER_REQUEST,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+        }
+        for attempt in range(1, _max_retries + 1):
+            self._bucket.acquire()
+            try:
+                response = self._session().get(url, params=params,
+                                               timeout=_request_timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == _max_retries:
+                    raise
+                log.warning('Alpaca request failed ({}), retrying'.format(e))
+            else:
+                transient = response.status_code == 429 or \
+                    response.status_code >= 500
+                if not transient or attempt == _max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                log.warning('Alpaca responded {}, retrying'.format(
+                    response.status_code))
+            time.sleep(_retry_wait * attempt)
+
+    @staticmethod
+    def _parse(body):
+        """
+        Turn a bars response into a long format DataFrame: one row per bar,
+        indexed by the bar time in UTC with the symbol as a column.
+        """
+        frames = []
+        for symbol, bars in body.items():
+            if not bars:
+                continue
+            frame = pd.DataFrame(bars).rename(columns={
+                't': 'time',
+                'o': 'open',
+                'h': 'high',
+                'l': 'low',
+                'c': 'close',
+                'v': 'volume',
+            })
+            frame.index = pd.to_datetime(frame.pop('time'), unit='s',
+                                         utc=True)
+            frame['symbol'] = symbol
+            frames.append(frame[['symbol'] + FIELDS])
+        if not frames:
+            return pd.DataFrame([], columns=['symbol'] + FIELDS)
+        return pd.concat(frames)
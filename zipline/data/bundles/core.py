@@ -17,6 +17,7 @@ from ..minute_bars import (
     BcolzMinuteBarWriter,
 )
 from ..psql_daily_bars import PSQLDailyBarReader, PSQLDailyBarWriter
+from ..psql_minute_bars import PSQLMinuteBarReader, PSQLMinuteBarWriter
 from zipline.assets import (
     AssetDBWriter,
     AssetFinder,
@@ -32,6 +33,7 @@ from zipline.utils.cache import (
 from zipline.utils.compat import ExitStack, mappingproxy
 from zipline.utils.input_validation import ensure_timestamp, optionally
 import zipline.utils.paths as pth
+import zipline.config.data_backend
 from zipline.utils.preprocess import preprocess
 
 from sqlalchemy.exc import InvalidRequestError
@@ -169,7 +171,8 @@ RegisteredBundle = namedtuple(
      'end_session',
      'minutes_per_day',
      'ingest',
-     'create_writers']
+     'create_writers',
+     'preload_adjustments']
 )
 
 BundleData = namedtuple(
@@ -260,7 +263,8 @@ def _make_bundle_core():
                  start_session=None,
                  end_session=None,
                  minutes_per_day=390,
-                 create_writers=True):
+                 create_writers=True,
+                 preload_adjustments=False):
         """Register a data bundle ingest function.
 
         Parameters
@@ -310,6 +314,12 @@ def _make_bundle_core():
             Should the ingest machinery create the writers for the ingest
             function. This can be disabled as an optimization for cases where
             they are not needed, like the ``quantopian-quandl`` bundle.
+        preload_adjustments : bool, optional
+            Should the adjustment reader of the loaded bundle load all the
+            adjustments into memory on first use, instead of querying the
+            adjustments db for every sid and date. Postgres backed bundles
+            use the ``adjustments_preload`` option of the data backend
+            instead.
 
         Notes
         -----
@@ -342,6 +352,7 @@ def _make_bundle_core():
             minutes_per_day=minutes_per_day,
             ingest=f,
             create_writers=create_writers,
+            preload_adjustments=preload_adjustments,
         )
         return f
 
@@ -437,14 +448,22 @@ def _make_bundle_core():
 
                 if db_path_external:
                     assets_db_path = adjustments_db_path = daily_bar_writer = db_path_external
+                    bulk_write = \
+                        zipline.config.data_backend.PostgresDB().bulk_write
                     daily_bar_writer = PSQLDailyBarWriter(
                         db_path_external,
                         calendar,
                         start_session,
                         end_session,
+                        bulk_write=bulk_write,
                     )
                     daily_bar_reader = PSQLDailyBarReader(db_path_external)
-                    minute_bar_writer = None
+                    minute_bar_writer = PSQLMinuteBarWriter(
+                        db_path_external,
+                        calendar,
+                        start_session,
+                        end_session,
+                    )
                     try:
                         asset_finder = AssetFinder(db_path_external)
                     except InvalidRequestError:
@@ -587,14 +606,42 @@ def _make_bundle_core():
             adjustments_db_path = db_path_external
             # assets_db_path = asset_db_path(name, timestr, environ=environ)
             # adjustments_db_path = adjustment_db_path(name, timestr, environ=environ)
-            daily_bar_reader = PSQLDailyBarReader(db_path_external)
-            minute_bar_reader = None
+            if zipline.config.data_backend.PostgresDB().daily_bar_snapshot:
+                daily_bar_reader = PSQLDailyBarReader(
+                    db_path_external,
+                    snapshot=True,
+                    snapshot_cache_dir=pth.cache_path(
+                        [name, 'daily_bar_snapshot'], environ=environ,
+                    ),
+                )
+            else:
+                daily_bar_reader = PSQLDailyBarReader(db_path_external)
+            if zipline.config.data_backend.PostgresDB().minute_bar_cache:
+                minute_bar_cache_dir = pth.cache_path(
+                    [name, 'minute_bar_blocks'], environ=environ,
+                )
+            else:
+                minute_bar_cache_dir = None
+            try:
+                minute_bar_calendar = get_calendar(bundles[name].calendar_name)
+            except KeyError:
+                minute_bar_calendar = None
+            minute_bar_reader = PSQLMinuteBarReader(
+                db_path_external,
+                calendar=minute_bar_calendar,
+                cache_dir=minute_bar_cache_dir,
+            )
+            preload_adjustments = \
+                zipline.config.data_backend.PostgresDB().adjustments_preload
         else:
             timestr = most_recent_data(name, timestamp, environ=environ)
             assets_db_path = asset_db_path(name, timestr, environ=environ)
             adjustments_db_path = adjustment_db_path(name, timestr, environ=environ)
             daily_bar_reader = BcolzDailyBarReader(daily_equity_path(name, timestr, environ=environ))
             minute_bar_reader = BcolzMinuteBarReader(minute_equity_path(name, timestr, environ=environ))
+            preload_adjustments = (
+                name in bundles and bundles[name].preload_adjustments
+            )
 
         return BundleData(
             asset_finder=AssetFinder(
@@ -603,7 +650,8 @@ def _make_bundle_core():
             equity_minute_bar_reader=minute_bar_reader,
             equity_daily_bar_reader=daily_bar_reader,
             adjustment_reader=SQLiteAdjustmentReader(
-                adjustments_db_path
+                adjustments_db_path,
+                preload=preload_adjustments,
             ),
         )
 
@@ -52,6 +52,10 @@ from zipline.data.history_loader import (
     DailyHistoryLoader,
     MinuteHistoryLoader,
 )
+from zipline.data.adjustments import (
+    ADJUSTMENT_INDEX_COLUMNS,
+    MAX_INDEX_SECONDS,
+)
 from zipline.data.bar_reader import NoDataOnDate
 from zipline.utils.math_utils import (
     nansum,
@@ -524,6 +528,13 @@ class DataPortal(object):
                 data_frequency,
             )
         else:
+            if field in OHLCV_FIELDS or field == 'price':
+                values = self._get_spot_values(
+                    session_label, assets, field, dt, data_frequency,
+                )
+                if values is not None:
+                    return values
+
             get_single_asset_value = self._get_single_asset_value
             return [
                 get_single_asset_value(
@@ -536,6 +547,58 @@ class DataPortal(object):
                 for asset in assets
             ]
 
+    def _get_spot_values(self,
+                         session_label,
+                         assets,
+                         field,
+                         dt,
+                         data_frequency):
+        """
+        Batched ``_get_single_asset_value`` for OHLCV and price lookups,
+        reading all the assets from the pricing reader in one ``get_values``
+        call. Only the prices missing at ``dt`` are then forward filled one
+        asset at a time.
+
+        Returns None if ``assets`` contains anything but plain assets, in
+        which case the caller should look them up one at a time.
+        """
+        assets = list(assets)
+        if not all(isinstance(asset, Asset) for asset in assets):
+            return None
+
+        in_range = np.flatnonzero([
+            not (dt < asset.start_date or session_label > asset.end_date)
+            for asset in assets
+        ])
+        values = np.full(len(assets), 0.0 if field == 'volume' else np.nan)
+        if len(in_range):
+            values[in_range] = self._get_pricing_reader(
+                data_frequency,
+            ).get_values(
+                [assets[i] for i in in_range],
+                session_label if data_frequency == 'daily' else dt,
+                'close' if field == 'price' else field,
+            )
+
+        if field == 'price':
+            for i in in_range[np.isnan(values[in_range])]:
+                if data_frequency == 'daily':
+                    values[i] = self._get_daily_spot_value(
+                        assets[i], field, session_label,
+                    )
+                else:
+                    values[i] = self._get_minute_spot_value(
+                        assets[i], 'close', dt, ffill=True,
+                    )
+        elif field == 'volume' and data_frequency == 'minute':
+            # the minute volume is 0, not NaN, outside of the market minutes
+            values[np.isnan(values)] = 0
+
+        if field == 'volume' and not np.isnan(values).any():
+            # readers report volumes as ints
+            return values.astype(int64).tolist()
+        return values.tolist()
+
     def get_scalar_asset_spot_value(self, asset, field, dt, data_frequency):
         """
         Public API method that returns a scalar value representing the value
@@ -597,6 +660,12 @@ class DataPortal(object):
         if isinstance(assets, Asset):
             assets = [assets]
 
+        index = getattr(self._adjustment_reader, 'adjustment_index', None)
+        if index is not None:
+            return self._get_indexed_adjustments(
+                index, assets, field, dt, perspective_dt,
+            )
+
         adjustment_ratios_per_asset = []
 
         def split_adj_factor(x):
@@ -637,6 +706,32 @@ class DataPortal(object):
 
         return adjustment_ratios_per_asset
 
+    @staticmethod
+    def _get_indexed_adjustments(index, assets, field, dt, perspective_dt):
+        """
+        ``get_adjustments`` served from a preloaded ``AdjustmentIndex``:
+        the adjustments of all the assets are found with one search per
+        table, and only the assets with adjustments are visited.
+        """
+        sids = [int(asset) for asset in assets]
+        start = dt.value // int(1e9)
+        end = perspective_dt.value // int(1e9)
+
+        tables = ['splits']
+        if field != 'volume':
+            tables += ['mergers', 'dividends']
+
+        ratios = [1.0] * len(sids)
+        for table_name in tables:
+            invert = table_name == 'splits' and field == 'volume'
+            values = index.column(table_name, 'ratio')
+            lo, hi = index.bounds(table_name, sids, start, end)
+            for i in np.flatnonzero(hi > lo):
+                for adj in values[lo[i]:hi[i]].tolist():
+                    ratios[i] *= 1.0 / adj if invert else adj
+
+        return ratios
+
     def get_adjusted_value(self, asset, field, dt,
                            perspective_dt,
                            data_frequency,
@@ -1179,6 +1274,17 @@ class DataPortal(object):
         # in the adjustments db
         seconds = int(dt.value / 1e9)
 
+        index = getattr(self._adjustment_reader, 'adjustment_index', None)
+        if index is not None:
+            sids = [int(asset) for asset in assets]
+            lo, hi = index.bounds('splits', sids, seconds - 1, seconds)
+            ratios = index.column('splits', 'ratio')
+            return [
+                (self.asset_finder.retrieve_asset(sids[i]), ratios[row])
+                for i in np.flatnonzero(hi > lo)
+                for row in range(lo[i], hi[i])
+            ]
+
         c = self._adjustment_reader.conn.cursor()
         c.execute(f"SELECT sid, ratio FROM SPLITS WHERE effective_date = {seconds}")
         splits = c.fetchall()
@@ -1217,6 +1323,33 @@ class DataPortal(object):
         start_dt = trading_days[0].value / 1e9
         end_dt = trading_days[-1].value / 1e9
 
+        index = getattr(self._adjustment_reader, 'adjustment_index', None)
+        if index is not None:
+            table = 'stock_dividend_payouts'
+            (lo,), (hi,) = index.bounds(
+                table, [int(sid)], int(start_dt), MAX_INDEX_SECONDS,
+            )
+            columns = {
+                column: index.column(table, column)[lo:hi]
+                for column in ADJUSTMENT_INDEX_COLUMNS[table]
+            }
+            return [
+                {
+                    "sid": columns['sid'][i],
+                    "payment_sid": columns['payment_sid'][i],
+                    "ratio": columns['ratio'][i],
+                    "declared_date": columns['declared_date'][i],
+                    "ex_date": pd.Timestamp(columns['ex_date'][i], unit="s"),
+                    "record_date": pd.Timestamp(
+                        columns['record_date'][i], unit="s",
+                    ),
+                    "pay_date": pd.Timestamp(
+                        columns['pay_date'][i], unit="s",
+                    ),
+                }
+                for i in np.flatnonzero(columns['pay_date'] < end_dt)
+            ]
+
         dividends = self._adjustment_reader.conn.execute(
             "SELECT * "
             "FROM stock_dividend_payouts WHERE sid = ? AND "
@@ -10,26 +10,182 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from datetime import timedelta
-
+import numpy as np
 import pandas as pd
+from zipline.assets import Asset
 from zipline.data.data_portal import DataPortal
+from zipline.errors import HistoryWindowStartsBeforeData
 
 from logbook import Logger
 
 log = Logger('DataPortalLive')
 
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+# Broker bars are labelled with the minute they start
+LIVE_BAR_LABEL_OFFSET = pd.Timedelta(minutes=1)
+
+# Sessions allocated ahead of the current one, so that the caches are not
+# reallocated every session
+CACHE_HEADROOM_SESSIONS = 5
+
+
+class HistoryCache(object):
+    """
+    History of one bar frequency held as a (bars x assets) array per OHLCV
+    field.
+
+    The time axis is fixed up front (the calendar's minutes or sessions from
+    the first cached bar through a few sessions ahead of the current one), so
+    live bars are written in place and windows are served as slices of the
+    arrays.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        The bar labels of the time axis, in UTC.
+    """
+    def __init__(self, index):
+        self.index = index
+        self._index_values = index.asi8
+        self._columns = {}
+        self._capacity = 0
+        self._data = {}
+        self._seeded = {}
+
+    def extended(self, index):
+        """
+        Return a cache over ``index`` holding the data of this one. ``index``
+        must start with a label of this cache's index or after its end, the
+        bars before it are dropped.
+        """
+        offset = self._index_values.searchsorted(index[0].value)
+        cache = HistoryCache(index)
+        cache._columns = self._columns
+        cache._capacity = self._capacity
+        cache._seeded = self._seeded
+        n = min(len(self.index) - offset, len(index))
+        for field, arr in self._data.items():
+            new = np.full((len(index), self._capacity), np.nan)
+            new[:n] = arr[offset:offset + n]
+            cache._data[field] = new
+        return cache
+
+    def columns(self, assets):
+        """
+        The column of each of ``assets``, adding columns for new assets.
+        """
+        new_assets = [asset for asset in assets if asset not in self._columns]
+        for asset in new_assets:
+            self._columns[asset] = len(self._columns)
+        if len(self._columns) > self._capacity:
+            capacity = max(2 * self._capacity, len(self._columns))
+            for field, arr in self._data.items():
+                new = np.full((len(self.index), capacity), np.nan)
+                new[:, :self._capacity] = arr
+                self._data[field] = new
+            self._capacity = capacity
+        return np.array([self._columns[asset] for asset in assets],
+                        dtype=np.intp)
+
+    def array(self, field):
+        try:
+            return self._data[field]
+        except KeyError:
+            arr = self._data[field] = np.full(
+                (len(self.index), self._capacity), np.nan,
+            )
+            return arr
+
+    def unseeded(self, field, assets):
+        seeded = self._seeded.setdefault(field, set())
+        return [asset for asset in assets if asset not in seeded]
+
+    def mark_seeded(self, field, assets):
+        self._seeded.setdefault(field, set()).update(assets)
+
+    def end_loc(self, dt):
+        """
+        The position after the last bar labelled at or before ``dt``.
+        """
+        return self._index_values.searchsorted(pd.Timestamp(dt).value,
+                                               side='right')
+
+    def write(self, field, asset, labels, values):
+        """
+        Write ``values`` of ``asset`` at the bars ``labels``. Labels which
+        are not on the time axis are ignored.
+        """
+        rows = self.index.get_indexer(labels)
+        found = rows >= 0
+        col = self.columns([asset])[0]
+        self.array(field)[rows[found], col] = np.asarray(values)[found]
+
+    def write_block(self, field, assets, values):
+        """
+        Write a (bars x assets) block starting at the first bar.
+        """
+        cols = self.columns(assets)
+        self.array(field)[:len(values), cols] = values
+
+    def window(self, field, assets, end_dt, bar_count):
+        """
+        Returns
+        -------
+        labels : pd.DatetimeIndex
+            The labels of the bars in the window.
+        values : np.ndarray
+            The (bars x assets) values. A read-only view on the cache if the
+            assets occupy consecutive columns.
+        """
+        end = self.end_loc(end_dt)
+        start = max(end - bar_count, 0)
+        cols = self.columns(assets)
+        arr = self.array(field)
+        if len(cols) and (np.diff(cols) == 1).all():
+            values = arr[start:end, cols[0]:cols[-1] + 1]
+            values.flags.writeable = False
+        else:
+            values = arr[start:end, cols]
+        return self.index[start:end], values
+
+    def last_valid(self, field, assets, end):
+        """
+        The last non-NaN value of each of ``assets`` before the bar ``end``.
+        """
+        arr = self.array(field)
+        out = np.full(len(assets), np.nan)
+        for i, col in enumerate(self.columns(assets)):
+            valid = np.flatnonzero(~np.isnan(arr[:end, col]))
+            if len(valid):
+                out[i] = arr[valid[-1], col]
+        return out
+
 
 class DataPortalLive(DataPortal):
     def __init__(self, broker, *args, **kwargs):
         self.broker = broker
         super(DataPortalLive, self).__init__(*args, **kwargs)
 
+        # frequency -> HistoryCache
+        self._history_caches = {}
+        # frequency -> the longest bar_count requested
+        self._history_lookbacks = {}
+        # (frequency, asset) -> the last dt the asset's live bars were merged
+        self._live_merged_dts = {}
+        # asset -> the label of the last live minute bar written to the cache
+        self._live_merged_minutes = {}
+
     def get_last_traded_dt(self, asset, dt, data_frequency):
         return self.broker.get_last_traded_dt(asset)
 
     def get_spot_value(self, assets, field, dt, data_frequency):
-        return self.broker.get_spot_value(assets, field, dt, data_frequency)
+        if isinstance(assets, Asset):
+            return self.broker.get_spot_value(assets, field, dt,
+                                              data_frequency)
+        # one broker request for the whole list, aligned with ``assets``
+        return self.broker.get_spot_values(list(assets), field, dt,
+                                           data_frequency)
 
     def get_history_window(self,
                            assets,
@@ -41,49 +197,218 @@ class DataPortalLive(DataPortal):
                            ffill=True):
         # This method is responsible for merging the ingested historical data
         # with the real-time collected data through the Broker.
-        # DataPortal.get_history_window() is called with ffill=False to mark
-        # the missing fields with NaNs. After merge on the historical and
-        # real-time data the missing values (NaNs) are filled based on their
-        # next available values in the requested time window.
+        # The ingested history is loaded once per field and asset into a
+        # HistoryCache of the requested frequency, live bars reported by the
+        # Broker are written into the same arrays. A call only merges the
+        # bars which arrived since the previous one and slices the window.
         #
-        # Warning: setting ffill=True in DataPortal.get_history_window() call
-        # results a wrong behavior: The last available value reported by
-        # get_spot_value() will be used to fill the missing data - which is
-        # always representing the current spot price presented by Broker.
-
-        if frequency == '1d':
-            # if you want today's open price - get minute data and filter the open time
-            historical_bars = super(DataPortalLive,
-                                    self).get_history_window(
-                assets,
-                end_dt - timedelta(days=1),
-                bar_count,
-                frequency,
-                field,
-                data_frequency,
-                ffill=True)
-            return historical_bars
-        realtime_bars = self.broker.get_realtime_bars(assets, frequency)
-
-        # Broker.get_realtime_history() returns the asset as level 0 column,
-        # open, high, low, close, volume returned as level 1 columns.
-        # To filter for field the levels needs to be swapped
-        realtime_bars = realtime_bars.swaplevel(0, 1, axis=1)
+        # The bundle is read with ffill=False to mark the missing fields with
+        # NaNs: forward filling inside DataPortal.get_history_window() would
+        # use the last value reported by get_spot_value(), which is always
+        # the current spot price presented by the Broker. Prices are filled
+        # when the window is served.
+        if field not in OHLCV and field != 'price':
+            raise ValueError("Invalid field: {0}".format(field))
 
+        if bar_count < 1:
+            raise ValueError(
+                "bar_count must be >= 1, but got {}".format(bar_count)
+            )
+
+        if frequency not in ('1m', '1d'):
+            raise ValueError("Invalid frequency: {0}".format(frequency))
+
+        assets = list(assets)
         ohlcv_field = 'close' if field == 'price' else field
-        realtime_bars = realtime_bars[ohlcv_field]
-        if ffill and field == 'price':
-            # Simple forward fill is not enough here as the last ingested
-            # value might be outside of the requested time window. That case
-            # the time series starts with NaN and forward filling won't help.
-            # To provide values for such cases we backward fill.
-            # Backward fill as a second operation will have no effect if the
-            # forward-fill was successful.
-            realtime_bars.fillna(method='ffill', inplace=True)
-            realtime_bars.fillna(method='bfill', inplace=True)
-
-        realtime_bars.columns = assets
-        return realtime_bars[-bar_count:]
+        cache, window_end = self._history_cache(frequency, end_dt, bar_count)
+        self._seed_history(cache, frequency, ohlcv_field, assets)
+        self._merge_live_bars(cache, frequency, assets, end_dt, window_end)
+
+        labels, values = cache.window(ohlcv_field, assets, window_end,
+                                      bar_count)
+        if ffill and field == 'price' and len(values):
+            # The last ingested value might be outside of the requested time
+            # window, in which case the series starts with NaN and forward
+            # filling won't help: start from the last value in the cache.
+            # Backward fill covers assets without any earlier value.
+            values = values.copy()
+            leading = np.isnan(values[0])
+            if leading.any():
+                values[0, leading] = cache.last_valid(
+                    'close',
+                    [asset for asset, nan in zip(assets, leading) if nan],
+                    cache.end_loc(labels[0]) - 1,
+                )
+            frame = pd.DataFrame(values, index=labels, columns=assets)
+            frame.fillna(method='ffill', inplace=True)
+            frame.fillna(method='bfill', inplace=True)
+            return frame
+
+        # the values may be a read-only view on the cache, the returned frame
+        # has to be writable and must not change with the cache
+        return pd.DataFrame(values, index=labels, columns=assets, copy=True)
+
+    def _history_cache(self, frequency, end_dt, bar_count):
+        """
+        The HistoryCache of ``frequency`` covering ``bar_count`` bars up to
+        ``end_dt``, and the label of the window's last bar.
+
+        The cache is rebuilt if a longer lookback than before is requested.
+        It is extended when it runs out of sessions, dropping the bars which
+        are older than the longest lookback.
+        """
+        cal = self.trading_calendar
+        last_session = cal.minute_to_session_label(end_dt,
+                                                   direction='previous')
+        sessions = cal.all_sessions
+        last_cached_session = sessions[min(
+            sessions.searchsorted(last_session) + CACHE_HEADROOM_SESSIONS,
+            len(sessions) - 1,
+        )]
+        if frequency == '1m':
+            all_labels = cal.all_minutes
+            labels_for = cal.minutes_for_sessions_in_range
+            to_session = cal.minute_to_session_label
+            window_end = end_dt
+        else:
+            all_labels = cal.all_sessions
+            labels_for = cal.sessions_in_range
+            to_session = pd.Timestamp
+            window_end = last_session
+
+        lookback = max(bar_count, self._history_lookbacks.get(frequency, 0))
+        self._history_lookbacks[frequency] = lookback
+        end = all_labels.searchsorted(window_end, side='right')
+        first_session = to_session(all_labels[max(end - lookback, 0)])
+
+        cache = self._history_caches.get(frequency)
+        if cache is None or first_session < to_session(cache.index[0]):
+            cache = HistoryCache(
+                labels_for(first_session, last_cached_session)
+            )
+            for key in list(self._live_merged_dts):
+                if key[0] == frequency:
+                    del self._live_merged_dts[key]
+            if frequency == '1m':
+                self._live_merged_minutes.clear()
+        elif to_session(cache.index[-1]) < last_session:
+            cache = cache.extended(
+                labels_for(first_session, last_cached_session)
+            )
+        self._history_caches[frequency] = cache
+        return cache, window_end
+
+    def _seed_history(self, cache, frequency, field, assets):
+        """
+        Load the ingested history of ``field`` into ``cache`` for the assets
+        which were not loaded yet.
+        """
+        assets = cache.unseeded(field, assets)
+        if not assets:
+            return
+
+        if frequency == '1m':
+            last_available = self._last_available_minute
+            data_frequency = 'minute'
+        else:
+            last_available = self._last_available_session
+            data_frequency = 'daily'
+
+        if last_available is not None and last_available >= cache.index[0]:
+            bar_count = cache.end_loc(last_available)
+            try:
+                history = super(DataPortalLive, self).get_history_window(
+                    assets,
+                    cache.index[bar_count - 1],
+                    bar_count,
+                    frequency,
+                    field,
+                    data_frequency,
+                    ffill=False)
+            except HistoryWindowStartsBeforeData as e:
+                log.warning('Ingested history is not used: {}'.format(e))
+            else:
+                cache.write_block(field, assets, history.values)
+
+        cache.mark_seeded(field, assets)
+
+    def _merge_live_bars(self, cache, frequency, assets, end_dt, window_end):
+        """
+        Write the Broker's minute bars into ``cache``, at most once per
+        asset and ``end_dt``.
+        """
+        assets = [
+            asset for asset in assets
+            if self._live_merged_dts.get((frequency, asset)) != end_dt
+        ]
+        if not assets:
+            return
+
+        bars = self.broker.get_realtime_bars(assets, '1m')
+        if not bars.empty:
+            symbols = set(bars.columns.get_level_values(0))
+            for asset in assets:
+                if asset.symbol not in symbols:
+                    continue
+                frame = bars[asset.symbol].dropna(how='all')
+                index = frame.index
+                if index.tz is None:
+                    index = index.tz_localize('UTC')
+                # bars are labelled with their start, zipline labels minute
+                # bars with their end
+                labels = index.tz_convert('UTC') + LIVE_BAR_LABEL_OFFSET
+                if frequency == '1m':
+                    self._merge_live_minutes(cache, asset, labels, frame)
+                else:
+                    self._merge_live_session(cache, asset, labels, frame,
+                                             window_end)
+
+        for asset in assets:
+            self._live_merged_dts[(frequency, asset)] = end_dt
+
+    def _merge_live_minutes(self, cache, asset, labels, frame):
+        # ingested minutes take precedence
+        if self._last_available_minute is not None:
+            new = labels > self._last_available_minute
+            labels, frame = labels[new], frame[new]
+        # the broker returns all of its buffered bars, only the ones since
+        # the last merge are written. the last merged bar is written again,
+        # it may have been updated since.
+        last_merged = self._live_merged_minutes.get(asset)
+        if last_merged is not None:
+            new = labels >= last_merged
+            labels, frame = labels[new], frame[new]
+        if not len(labels):
+            return
+        for field in OHLCV:
+            cache.write(field, asset, labels, frame[field].values)
+        self._live_merged_minutes[asset] = labels[-1]
+
+    def _merge_live_session(self, cache, asset, labels, frame, session):
+        # ingested sessions take precedence, a partial live session would
+        # replace a complete one
+        if (self._last_available_session is not None and
+                session <= self._last_available_session):
+            return
+
+        market_open, market_close = \
+            self.trading_calendar.open_and_close_for_session(session)
+        today = frame[(labels >= market_open) & (labels <= market_close)]
+        if today.empty:
+            return
+
+        opens = today['open'].dropna()
+        closes = today['close'].dropna()
+        values = {
+            'open': opens.iloc[0] if len(opens) else np.nan,
+            'high': today['high'].max(),
+            'low': today['low'].min(),
+            'close': closes.iloc[-1] if len(closes) else np.nan,
+            'volume': today['volume'].sum(),
+        }
+        for field in OHLCV:
+            cache.write(field, asset, pd.DatetimeIndex([session]),
+                        [values[field]])
 
     def get_scalar_asset_spot_value(self, asset, field, dt, data_frequency):
         """
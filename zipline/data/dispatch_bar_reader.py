@@ -99,6 +99,18 @@ class AssetDispatchBarReader(with_metaclass(ABCMeta)):
         r = self._readers[type(asset)]
         return r.get_value(asset, dt, field)
 
+    def get_values(self, assets, dt, field):
+        out_pos = {}
+        for i, asset in enumerate(assets):
+            out_pos.setdefault(type(asset), []).append(i)
+
+        out = full(len(assets), nan)
+        for t, pos in iteritems(out_pos):
+            out[pos] = self._readers[t].get_values(
+                [assets[i] for i in pos], dt, field,
+            )
+        return out
+
     def get_last_traded_dt(self, asset, dt):
         r = self._readers[type(asset)]
         return r.get_last_traded_dt(asset, dt)
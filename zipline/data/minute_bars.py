@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 from glob import glob
@@ -895,6 +896,11 @@ class BcolzMinuteBarReader(MinuteBarReader):
     rootdir : string
         The root directory containing the metadata and asset bcolz
         directories.
+    sid_cache_sizes : dict[str -> int], optional
+        The number of open carrays to keep per field.
+    decompression_threads : int, optional
+        The number of threads reading the carrays of the requested sids in
+        ``load_raw_arrays``. By default they are read on the calling thread.
 
     See Also
     --------
@@ -916,9 +922,13 @@ class BcolzMinuteBarReader(MinuteBarReader):
     # can do so by mutating DEFAULT_MINUTELY_SID_CACHE_SIZES.
     _default_proxy = mappingproxy(DEFAULT_MINUTELY_SID_CACHE_SIZES)
 
-    def __init__(self, rootdir, sid_cache_sizes=_default_proxy):
+    def __init__(self,
+                 rootdir,
+                 sid_cache_sizes=_default_proxy,
+                 decompression_threads=None):
 
         self._rootdir = rootdir
+        self._decompression_threads = decompression_threads
 
         metadata = self._get_metadata()
 
@@ -991,6 +1001,12 @@ class BcolzMinuteBarReader(MinuteBarReader):
         # fallback to the default.
         return self._default_ohlc_inverse
 
+    def _ohlc_ratio_inverses_for_sids(self, sids):
+        return np.array(
+            [self._ohlc_ratio_inverse_for_sid(sid) for sid in sids],
+            dtype=np.float64,
+        )
+
     def _minutes_to_exclude(self):
         """
         Calculate the minutes which should be excluded when a window
@@ -1064,6 +1080,28 @@ class BcolzMinuteBarReader(MinuteBarReader):
         else:
             return None
 
+    def _kept_positions_for_range(self, start_idx, end_idx):
+        """
+        Returns
+        -------
+        np.ndarray[int64] or None
+            The positions, relative to ``start_idx``, of the minutes of a
+            window which are not excluded, or None if no minute is excluded.
+        """
+        indices_to_exclude = self._exclusion_indices_for_range(
+            start_idx, end_idx)
+        if indices_to_exclude is None:
+            return None
+        kept = np.ones(end_idx - start_idx + 1, dtype=bool)
+        for excl_start, excl_stop in indices_to_exclude:
+            kept[max(excl_start - start_idx, 0):
+                 excl_stop - start_idx + 1] = False
+        return np.flatnonzero(kept)
+
+    @lazyval
+    def _decompression_pool(self):
+        return ThreadPoolExecutor(max_workers=self._decompression_threads)
+
     def _get_carray_path(self, sid, field):
         sid_subdir = _sid_subdir_path(sid)
         # carrays are subdirectories of the sid's rootdir
@@ -1126,17 +1164,7 @@ class BcolzMinuteBarReader(MinuteBarReader):
             Returns the integer value of the volume.
             (A volume of 0 signifies no trades for the given dt.)
         """
-        if self._last_get_value_dt_value == dt.value:
-            minute_pos = self._last_get_value_dt_position
-        else:
-            try:
-                minute_pos = self._find_position_of_minute(dt)
-            except ValueError:
-                raise NoDataOnDate()
-
-            self._last_get_value_dt_value = dt.value
-            self._last_get_value_dt_position = minute_pos
-
+        minute_pos = self._get_value_position(dt)
         try:
             value = self._open_minute_file(field, sid)[minute_pos]
         except IndexError:
@@ -1151,6 +1179,52 @@ class BcolzMinuteBarReader(MinuteBarReader):
             value *= self._ohlc_ratio_inverse_for_sid(sid)
         return value
 
+    def get_values(self, sids, dt, field):
+        """
+        Vectorized version of ``get_value`` for many sids, which finds the
+        position of ``dt`` once and scales all the prices at once.
+
+        Returns
+        -------
+        values : np.ndarray[float64]
+            The values aligned with ``sids``. NaN for every sid if ``dt`` is
+            not a market minute and, except for volume, where the price is 0.
+        """
+        try:
+            minute_pos = self._get_value_position(dt)
+        except NoDataOnDate:
+            return np.full(len(sids), np.nan)
+
+        sids = [int(sid) for sid in sids]
+        raw = np.zeros(len(sids), dtype=np.uint32)
+        for i, sid in enumerate(sids):
+            carray = self._open_minute_file(field, sid)
+            if minute_pos < len(carray):
+                raw[i] = carray[minute_pos]
+
+        if field == 'volume':
+            return raw.astype(np.float64)
+        values = raw * self._ohlc_ratio_inverses_for_sids(sids)
+        values[raw == 0] = np.nan
+        return values
+
+    def _get_value_position(self, dt):
+        """
+        The position of ``dt`` in the carrays, remembering the last one
+        looked up as consecutive lookups are usually for the same minute.
+        """
+        if self._last_get_value_dt_value == dt.value:
+            return self._last_get_value_dt_position
+
+        try:
+            minute_pos = self._find_position_of_minute(dt)
+        except ValueError:
+            raise NoDataOnDate()
+
+        self._last_get_value_dt_value = dt.value
+        self._last_get_value_dt_position = minute_pos
+        return minute_pos
+
     def get_last_traded_dt(self, asset, dt):
         minute_pos = self._find_last_traded_position(asset, dt)
         if minute_pos == -1:
@@ -1253,43 +1327,55 @@ class BcolzMinuteBarReader(MinuteBarReader):
         start_idx = self._find_position_of_minute(start_dt)
         end_idx = self._find_position_of_minute(end_dt)
 
-        num_minutes = (end_idx - start_idx + 1)
+        kept = self._kept_positions_for_range(start_idx, end_idx)
+        if kept is None:
+            num_minutes = end_idx - start_idx + 1
+        else:
+            num_minutes = len(kept)
+
+        # Open the carrays up front, on this thread, so that the LRU caches
+        # are never used concurrently.
+        carrays = [
+            [self._open_minute_file(field, sid) for sid in sids]
+            for field in fields
+        ]
+        # The raw values of every field, 0 where there is no data.
+        raw = [
+            np.zeros((num_minutes, len(sids)), dtype=np.uint32)
+            for _ in fields
+        ]
+
+        def read(task):
+            i, j = task
+            values = carrays[i][j][start_idx:end_idx + 1]
+            if kept is not None:
+                # We might not have written data for all the minutes
+                # requested, so only keep the positions which were written.
+                values = values[
+                    kept[:np.searchsorted(kept, len(values))]
+                ]
+            raw[i][:len(values), j] = values
+
+        tasks = [(i, j) for i in range(len(fields)) for j in range(len(sids))]
+        if self._decompression_threads and len(tasks) > 1:
+            # Consume the iterator to re-raise errors from the workers.
+            for _ in self._decompression_pool.map(read, tasks):
+                pass
+        else:
+            for task in tasks:
+                read(task)
 
         results = []
+        inverses = None
+        for field, values in zip(fields, raw):
+            if field == 'volume':
+                results.append(values)
+                continue
 
-        indices_to_exclude = self._exclusion_indices_for_range(
-            start_idx, end_idx)
-        if indices_to_exclude is not None:
-            for excl_start, excl_stop in indices_to_exclude:
-                length = excl_stop - excl_start + 1
-                num_minutes -= length
-
-        shape = num_minutes, len(sids)
-
-        for field in fields:
-            if field != 'volume':
-                out = np.full(shape, np.nan)
-            else:
-                out = np.zeros(shape, dtype=np.uint32)
-
-            for i, sid in enumerate(sids):
-                carray = self._open_minute_file(field, sid)
-                values = carray[start_idx:end_idx + 1]
-                if indices_to_exclude is not None:
-                    for excl_start, excl_stop in indices_to_exclude[::-1]:
-                        excl_slice = np.s_[
-                            excl_start - start_idx:excl_stop - start_idx + 1]
-                        values = np.delete(values, excl_slice)
-
-                where = values != 0
-                # first slice down to len(where) because we might not have
-                # written data for all the minutes requested
-                if field != 'volume':
-                    out[:len(where), i][where] = (
-                        values[where] * self._ohlc_ratio_inverse_for_sid(sid))
-                else:
-                    out[:len(where), i][where] = values[where]
-
+            if inverses is None:
+                inverses = self._ohlc_ratio_inverses_for_sids(sids)
+            out = values * inverses
+            out[values == 0] = np.nan
             results.append(out)
         return results
 
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from functools import partial
+from io import StringIO
+import os
+from shutil import rmtree
 
 import psycopg2
 import sqlalchemy as sa
@@ -27,7 +30,6 @@ from numpy import (
     nan,
 )
 from pandas import (
-    NaT,
     read_csv,
     to_datetime,
     Timestamp,
@@ -45,6 +47,7 @@ from zipline.utils.functional import apply
 from zipline.utils.input_validation import expect_element
 from zipline.utils.numpy_utils import float64_dtype
 from zipline.utils.memoize import lazyval
+from zipline.utils.cache import working_dir
 from zipline.utils.cli import maybe_show_progress
 from ._equities import _compute_row_slices, _read_tape_data
 
@@ -58,6 +61,49 @@ US_EQUITY_PRICING_COLUMNS = (
 UINT32_MAX = iinfo(np.uint32).max
 
 TABLE = 'ohlcv_daily'
+INDEX = 'id_day'
+
+# columns (and their order) used when streaming rows with COPY FROM STDIN
+COPY_COLUMNS = ('id', 'day', 'open', 'high', 'low', 'close', 'volume')
+
+# number of pending rows that triggers a COPY when writing in bulk mode
+DEFAULT_COPY_BATCH_SIZE = 500000
+
+# fraction of the table's rows up to which load_raw_arrays queries the
+# requested windows instead of reading the full tape. pushed down windows are
+# not cached, so the rows queried by a reader add up: once they would exceed
+# this fraction, the full columns are read once and serve every later read
+DEFAULT_PUSHDOWN_FRACTION = 0.1
+
+# columns held by a reader snapshot. 'day' is stored as days since epoch
+SNAPSHOT_COLUMNS = ('id', 'day', 'open', 'high', 'low', 'close', 'volume')
+
+
+def create_bundle_database(db_path):
+    """
+    create the bundle database. it will have the name of the bundle
+    :param db_path: expected db path (table). used to get the bundle name.
+    """
+    db_config = zipline.config.data_backend.PostgresDB()
+    host = db_config.host
+    port = db_config.port
+    user = db_config.user
+    password = db_config.password
+    conn = psycopg2.connect(
+        database="",
+        user=user,
+        password=password,
+        host=host,
+        port=port
+    )
+    conn.autocommit = True
+    # Creating a cursor object using the cursor() method
+    cursor = conn.cursor()
+    bundle_name = db_path.split("/")[-1]
+    sql = f'CREATE database {bundle_name}'
+    # Creating a database
+    cursor.execute(sql)
+    print(f"Database {bundle_name} created successfully........")
 
 
 class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
@@ -75,6 +121,24 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         all of the data for all assets into memory and then indexing into that
         array for each day and asset pair.  Used to tune performance of reads
         when using a small or large number of equities.
+    snapshot : bool, optional
+        If True, the first read pulls every OHLCV column together with the
+        per-sid row bookkeeping (first_row, last_row, calendar_offset) from
+        the db in a single pass, instead of one full scan per column and
+        per bookkeeping table.
+    snapshot_cache_dir : str, optional
+        Directory in which the snapshot is persisted as ``.npy`` files. The
+        files are memory-mapped on the next start as long as the table's
+        max(day) and row count did not change. Only used with ``snapshot``.
+    pushdown_threshold : int, optional
+        The estimated number of rows (sessions x assets) up to which
+        ``load_raw_arrays`` queries only the requested assets and date range
+        from the db instead of reading the full columns into memory. The
+        queried windows are not cached, so the estimates of all the queried
+        windows count against it; once it is exceeded, the full columns are
+        read. Requests for columns that are already in memory always use the
+        full columns. Defaults to ``DEFAULT_PUSHDOWN_FRACTION`` of the
+        table's rows, 0 disables the pushdown.
 
     Attributes
     ----------
@@ -132,7 +196,12 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
     zipline.data.bcolz_daily_bars.BcolzDailyBarWriter
     """
 
-    def __init__(self, path, read_all_threshold=3000):
+    def __init__(self,
+                 path,
+                 read_all_threshold=3000,
+                 snapshot=False,
+                 snapshot_cache_dir=None,
+                 pushdown_threshold=None):
         self.conn = check_and_create_engine(path, False)
 
         # Cache of fully read np.array for the carrays in the daily bar table.
@@ -141,6 +210,9 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         # process first.
         self._spot_cols = {}
         self._read_all_threshold = read_all_threshold
+        self._pushdown_threshold = pushdown_threshold
+        # estimated rows of the windows queried so far
+        self._pushed_down_rows = 0
 
         # caching the calendar-sessions like this prevent problems during ingestion
         # where the reader is first initialized when there are still no bars
@@ -150,10 +222,128 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         self._first_rows_c = {}
         self._last_rows_c = {}
         self._first_trading_day_c = {}
+        self._traded_rows_c = None
+
+        self._snapshot = snapshot
+        self._snapshot_cache_dir = snapshot_cache_dir
+        self._snapshot_loaded = False
+
+    def _maybe_load_snapshot(self):
+        """
+        In snapshot mode, load the snapshot the first time any of the lazily
+        read tables is requested.
+
+        Returns
+        -------
+        loaded : bool
+            Whether a snapshot is loaded. False if snapshot mode is disabled
+            or there are still no bars in the db.
+        """
+        if self._snapshot and not self._snapshot_loaded:
+            self.load_snapshot()
+        return self._snapshot_loaded
+
+    def load_snapshot(self):
+        """
+        Load all OHLCV columns and the per-sid row bookkeeping at once.
+
+        The data is read from the local snapshot cache if it is up to date
+        with the table, otherwise it is queried in a single ordered scan of
+        the table (and persisted to the cache if one is configured).
+        """
+        key = self._snapshot_key()
+        if key is None:
+            # no bars yet (e.g. during ingestion)
+            return
+
+        arrays = None
+        if self._snapshot_cache_dir is not None:
+            arrays = self._read_snapshot_cache(key)
+        if arrays is None:
+            arrays = self._query_snapshot()
+            if self._snapshot_cache_dir is not None:
+                self._write_snapshot_cache(key, arrays)
+
+        self._set_snapshot(arrays)
+
+    def _snapshot_key(self):
+        info = pd.read_sql(
+            f'SELECT MAX(day) AS max_day, COUNT(*) AS ct FROM {TABLE}',
+            self.conn,
+            parse_dates=['max_day'],
+        )
+        if info['ct'][0] == 0:
+            return None
+        return '{:%Y%m%d}-{}'.format(info['max_day'][0], info['ct'][0])
+
+    def _query_snapshot(self):
+        data = pd.read_sql(
+            f'SELECT id, (day - DATE \'1970-01-01\') AS day, '
+            f'open, high, low, close, volume '
+            f'FROM {TABLE} ORDER BY id, day',
+            self.conn,
+        )
+        return {col: data[col].values for col in SNAPSHOT_COLUMNS}
+
+    def _read_snapshot_cache(self, key):
+        path = os.path.join(self._snapshot_cache_dir, key)
+        try:
+            return {
+                col: np.load(os.path.join(path, col + '.npy'), mmap_mode='r')
+                for col in SNAPSHOT_COLUMNS
+            }
+        except IOError:
+            return None
+
+    def _write_snapshot_cache(self, key, arrays):
+        with working_dir(os.path.join(self._snapshot_cache_dir, key)) as wd:
+            for col in SNAPSHOT_COLUMNS:
+                np.save(wd.getpath(col + '.npy'), arrays[col])
+
+        # snapshots of older versions of the table are never read again
+        for stale in os.listdir(self._snapshot_cache_dir):
+            if stale != key:
+                rmtree(
+                    os.path.join(self._snapshot_cache_dir, stale),
+                    ignore_errors=True,
+                )
+
+    def _set_snapshot(self, arrays):
+        ids = arrays['id']
+        days = arrays['day']
+
+        # the data is ordered by id, so the first occurrence of every id is
+        # the first row of its block
+        sids, first_rows, counts = np.unique(
+            ids, return_index=True, return_counts=True,
+        )
+        last_rows = first_rows + counts - 1
+
+        sessions = self.trading_calendar.sessions_in_range(
+            Timestamp(days.min(), unit='D', tz='UTC'),
+            Timestamp(days.max(), unit='D', tz='UTC'),
+        )
+        offsets = sessions.searchsorted(
+            to_datetime(days[first_rows], unit='D', utc=True),
+        )
+
+        sids = sids.tolist()
+        self._sessions = sessions
+        self._first_rows_c = dict(zip(sids, first_rows.tolist()))
+        self._last_rows_c = dict(zip(sids, last_rows.tolist()))
+        self._calendar_offsets_c = dict(zip(sids, offsets.tolist()))
+        self._first_trading_day_c = Timestamp(days.min(), unit='D').date()
+        for col in ('open', 'high', 'low', 'close', 'volume'):
+            self._spot_cols[col] = arrays[col]
+
+        self._snapshot_loaded = True
 
     @property
     def sessions(self):
         if self._sessions.empty:
+            if self._maybe_load_snapshot():
+                return self._sessions
+
             outer_dates = pd.read_sql('SELECT MIN(day) as min_day, MAX(day) as max_day FROM ohlcv_daily', self.conn)
 
             start_session = Timestamp(outer_dates['min_day'][0], tz='UTC')
@@ -184,7 +374,7 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
 
     @property
     def _calendar_offsets(self):
-        if not self._calendar_offsets_c:
+        if not self._calendar_offsets_c and not self._maybe_load_snapshot():
             self._calendar_offsets_c = self._get_calendar_offsets()
         return self._calendar_offsets_c
 
@@ -205,19 +395,19 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
 
     @property
     def _first_trading_day(self):
-        if not self._first_trading_day_c:
+        if not self._first_trading_day_c and not self._maybe_load_snapshot():
             self._first_trading_day_c = self._get_first_trading_day()
         return self._first_trading_day_c
 
     @property
     def _last_rows(self):
-        if not self._last_rows_c:
+        if not self._last_rows_c and not self._maybe_load_snapshot():
             self._first_rows_c, self._last_rows_c = self._get_first_and_last_rows()
         return self._last_rows_c
 
     @property
     def _first_rows(self):
-        if not self._first_rows_c:
+        if not self._first_rows_c and not self._maybe_load_snapshot():
             self._first_rows_c, self._last_rows_c = self._get_first_and_last_rows()
         return self._first_rows_c
 
@@ -295,12 +485,18 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
             raise NoDataOnDate(date)
 
     def load_raw_arrays(self, columns, start_date, end_date, assets):
-        for col in columns:
-            self._spot_col(col)
-
         start_idx = self._load_raw_arrays_date_to_index(start_date)
         end_idx = self._load_raw_arrays_date_to_index(end_date)
 
+        if self._use_pushdown(columns, start_idx, end_idx, assets):
+            self._pushed_down_rows += (end_idx - start_idx + 1) * len(assets)
+            return self._load_raw_arrays_pushdown(
+                columns, start_idx, end_idx, assets,
+            )
+
+        for col in columns:
+            self._spot_col(col)
+
         first_rows, last_rows, offsets = self._compute_slices(
             start_idx,
             end_idx,
@@ -320,25 +516,90 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
 
         return tape
 
-    def load_raw_arrays_slow(self, columns, start_date, end_date, assets):
-        result = []
+    def _use_pushdown(self, columns, start_idx, end_idx, assets):
+        """
+        Whether to query only the requested window from the db rather than
+        slicing it out of the full columns.
+        """
+        if all(col in self._spot_cols for col in columns):
+            # nothing to read, the full columns are already in memory
+            return False
+        if self._snapshot:
+            # a single snapshot load serves every later read
+            return False
+        threshold = self._pushdown_threshold
+        if threshold is None:
+            last_rows = self._last_rows
+            table_rows = max(last_rows.values()) + 1 if last_rows else 0
+            threshold = DEFAULT_PUSHDOWN_FRACTION * table_rows
+        estimated_rows = (end_idx - start_idx + 1) * len(assets)
+        return (
+            self._pushed_down_rows + estimated_rows <= threshold and
+            pd.Index(assets).is_unique
+        )
 
-        sessions = self.sessions[self.sessions.get_loc(start_date): self.sessions.get_loc(end_date) + 1]
+    def _load_raw_arrays_pushdown(self, columns, start_idx, end_idx, assets):
+        """
+        Query the requested assets and date range with a single query and
+        scatter the rows into the (dates x assets) output arrays.
 
-        for column in columns:
-            column_vals = []
+        Returns
+        -------
+        results : list of ndarray
+            A 2D float64 array of shape (dates, assets) for each column in
+            `columns`, with the same nan semantics as ``_read_tape_data``.
+        """
+        sessions = self.sessions[start_idx:end_idx + 1]
+        data = pd.read_sql(
+            'SELECT id, (day - DATE \'1970-01-01\') AS day, {} '
+            'FROM {} '
+            'WHERE id = ANY(%(ids)s) AND day BETWEEN %(start)s AND %(end)s'
+            .format(', '.join(columns), TABLE),
+            self.conn,
+            params={
+                'ids': [int(asset) for asset in assets],
+                'start': sessions[0].date(),
+                'end': sessions[-1].date(),
+            },
+        )
 
-            for session in sessions:
-                row_vals = []
-                for asset in assets:
-                    try:
-                        row_vals.append(self.get_value(int(asset), session, column))
-                    except NoDataBeforeDate:
-                        row_vals.append(np.nan)
+        date_ix = sessions.searchsorted(
+            to_datetime(data['day'].values, unit='D', utc=True),
+        )
+        asset_ix = pd.Index(assets).get_indexer(data['id'].values)
 
-                column_vals.append(row_vals)
+        shape = (len(sessions), len(assets))
+        results = []
+        for col in columns:
+            outbuf = np.zeros(shape, dtype=np.float64)
+            outbuf[date_ix, asset_ix] = data[col].values
+            if col in OHLC:
+                outbuf[outbuf == 0] = nan
+            results.append(outbuf)
 
-            result.append(np.array(column_vals))
+        return results
+
+    def load_raw_arrays_slow(self, columns, start_date, end_date, assets):
+        start_idx = self.sessions.get_loc(start_date)
+        end_idx = self.sessions.get_loc(end_date)
+        day_locs = np.arange(start_idx, end_idx + 1)
+
+        first_rows, last_rows, offsets = self._sid_rows(assets)
+        ix = first_rows + (day_locs[:, None] - offsets)
+        valid = (first_rows != -1) & (ix >= first_rows) & (ix <= last_rows)
+        ix[~valid] = 0
+
+        result = []
+        for column in columns:
+            col = self._spot_col(column)
+            if len(col):
+                values = col[ix].astype(np.float64)
+            else:
+                values = np.empty(ix.shape, dtype=np.float64)
+            values[~valid] = nan
+            if column != 'volume':
+                values[values == 0] = nan
+            result.append(values)
 
         return result
 
@@ -361,34 +622,86 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         try:
             col = self._spot_cols[colname]
         except KeyError:
+            if self._maybe_load_snapshot():
+                return self._spot_cols[colname]
             result = pd.read_sql(f'SELECT {colname} FROM ohlcv_daily ORDER BY id, day', self.conn)[colname].values
             col = self._spot_cols[colname] = np.array(result)
         return col
 
+    def _sid_rows(self, sids):
+        """
+        Look up the row bookkeeping of many sids at once.
+
+        Returns
+        -------
+        A 3-tuple of (first_rows, last_rows, offsets), each an np.array[intp]
+        aligned with ``sids``. All three are -1 for sids without data.
+        """
+        first_rows = self._first_rows
+        last_rows = self._last_rows
+        calendar_offsets = self._calendar_offsets
+
+        sids = [int(sid) for sid in sids]
+        return (
+            np.array([first_rows.get(sid, -1) for sid in sids], dtype=np.intp),
+            np.array([last_rows.get(sid, -1) for sid in sids], dtype=np.intp),
+            np.array(
+                [calendar_offsets.get(sid, -1) for sid in sids],
+                dtype=np.intp,
+            ),
+        )
+
+    @property
+    def _traded_rows(self):
+        """
+        Sorted indices of all rows in the tape with a non-zero volume.
+        """
+        if self._traded_rows_c is None:
+            self._traded_rows_c = np.flatnonzero(self._spot_col('volume') != 0)
+        return self._traded_rows_c
+
+    def get_last_traded_dts(self, assets, day):
+        """
+        Get the last session on or before ``day`` in which each of ``assets``
+        traded, i.e. had a non-zero volume.
+
+        Parameters
+        ----------
+        assets : iterable[int or Asset]
+            The assets for which to get the last traded session.
+        day : pd.Timestamp
+            The session at which to start searching.
+
+        Returns
+        -------
+        last_traded : pd.DatetimeIndex
+            The last traded session aligned with ``assets``. NaT for assets
+            that did not trade on or before ``day``.
+        """
+        out = np.full(len(assets), np.datetime64('NaT'), dtype='M8[ns]')
+        try:
+            day_loc = self.sessions.get_loc(day)
+        except KeyError:
+            return pd.DatetimeIndex(out, tz='UTC')
+
+        first_rows, last_rows, offsets = self._sid_rows(assets)
+        # rows after the end of an asset are searched from its last row
+        ix = np.minimum(first_rows + (day_loc - offsets), last_rows)
+        known = (first_rows != -1) & (ix >= first_rows)
+
+        traded_rows = self._traded_rows
+        if len(traded_rows):
+            pos = traded_rows.searchsorted(ix, side='right') - 1
+            rows = traded_rows[np.maximum(pos, 0)]
+            found = known & (pos >= 0) & (rows >= first_rows)
+            out[found] = self.sessions.values[
+                offsets[found] + rows[found] - first_rows[found]
+            ]
+
+        return pd.DatetimeIndex(out, tz='UTC')
+
     def get_last_traded_dt(self, asset, day):
-        volumes = self._spot_col('volume')
-
-        search_day = day
-
-        while True:
-            try:
-                ix = self.sid_day_index(asset, search_day)
-            except NoDataBeforeDate:
-                return NaT
-            except NoDataAfterDate:
-                prev_day_ix = self.sessions.get_loc(search_day) - 1
-                if prev_day_ix > -1:
-                    search_day = self.sessions[prev_day_ix]
-                continue
-            except NoDataOnDate:
-                return NaT
-            if volumes[ix] != 0:
-                return search_day
-            prev_day_ix = self.sessions.get_loc(search_day) - 1
-            if prev_day_ix > -1:
-                search_day = self.sessions[prev_day_ix]
-            else:
-                return NaT
+        return self.get_last_traded_dts([asset], day)[0]
 
     def sid_day_index(self, sid, day):
         """
@@ -457,6 +770,31 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         else:
             return price
 
+    def get_values(self, sids, dt, field):
+        """
+        Vectorized version of ``get_value`` for many sids.
+
+        Returns
+        -------
+        values : np.ndarray[float64]
+            The values aligned with ``sids``. NaN for sids without data on
+            ``dt`` and, except for volume, where the price is 0.
+        """
+        values = np.full(len(sids), nan)
+        try:
+            day_loc = self.sessions.get_loc(dt)
+        except KeyError:
+            return values
+
+        first_rows, last_rows, offsets = self._sid_rows(sids)
+        ix = first_rows + (day_loc - offsets)
+        valid = (first_rows != -1) & (ix >= first_rows) & (ix <= last_rows)
+
+        values[valid] = self._spot_col(field)[ix[valid]]
+        if field != 'volume':
+            values[values == 0] = nan
+        return values
+
     def currency_codes(self, sids):
         # XXX: This is pretty inefficient. This reader doesn't really support
         # country codes, so we always either return USD or None if we don't
@@ -486,6 +824,13 @@ class PSQLDailyBarWriter(object):
         Midnight UTC session label.
     end_session: pd.Timestamp
         Midnight UTC session label.
+    bulk_write : bool, optional
+        If True, stream the bars of all sids through ``COPY FROM STDIN`` in
+        large batches instead of one insert per sid. The existing edge dates
+        of every sid are fetched with a single query up front and the
+        ``id_day`` index is rebuilt after the load instead of during it.
+    copy_batch_size : int, optional
+        The number of pending rows which triggers a COPY in bulk mode.
 
     See Also
     --------
@@ -499,7 +844,13 @@ class PSQLDailyBarWriter(object):
         'volume': float64_dtype,
     }
 
-    def __init__(self, db_path, calendar, start_session, end_session):
+    def __init__(self,
+                 db_path,
+                 calendar,
+                 start_session,
+                 end_session,
+                 bulk_write=False,
+                 copy_batch_size=DEFAULT_COPY_BATCH_SIZE):
         self.conn = check_and_create_engine(db_path, False)
 
         if start_session != end_session:
@@ -515,6 +866,12 @@ class PSQLDailyBarWriter(object):
         self._start_session = start_session
         self._end_session = end_session
         self._calendar = calendar
+        self._bulk_write = bulk_write
+        self._copy_batch_size = copy_batch_size
+
+        # edge days of every sid already stored in the db, indexed by id.
+        # only used in bulk mode, where it's fetched once before writing.
+        self._edge_days = None
 
         try:
             self.conn.connect()
@@ -530,26 +887,7 @@ class PSQLDailyBarWriter(object):
         create the bundle database. it will have the name of the bundle
         :param db_path: expected db path (table). used to get the bundle name.
         """
-        db_config = zipline.config.data_backend.PostgresDB()
-        host = db_config.host
-        port = db_config.port
-        user = db_config.user
-        password = db_config.password
-        conn = psycopg2.connect(
-            database="",
-            user=user,
-            password=password,
-            host=host,
-            port=port
-        )
-        conn.autocommit = True
-        # Creating a cursor object using the cursor() method
-        cursor = conn.cursor()
-        bundle_name = db_path.split("/")[-1]
-        sql = f'CREATE database {bundle_name}'
-        # Creating a database
-        cursor.execute(sql)
-        print(f"Database {bundle_name} created successfully........")
+        create_bundle_database(db_path)
 
     def ensure_table(self):
         metadata = sa.MetaData()
@@ -603,6 +941,9 @@ class PSQLDailyBarWriter(object):
         table : bcolz.ctable
             The newly-written table.
         """
+        if self._bulk_write:
+            self._edge_days = self._get_all_existing_data_dates_from_db()
+
         ctx = maybe_show_progress(
             (
                 (sid, self._write_to_postgres(sid, df, invalid_data_behavior))
@@ -613,8 +954,11 @@ class PSQLDailyBarWriter(object):
             label=self.progress_bar_message,
             length=len(assets) if assets is not None else None,
         )
-        with ctx as it:
-            return self._write_internal(it, assets)
+        try:
+            with ctx as it:
+                return self._write_internal(it, assets)
+        finally:
+            self._edge_days = None
 
     def write_csvs(self,
                    asset_map,
@@ -662,12 +1006,88 @@ class PSQLDailyBarWriter(object):
 
                     yield asset_id, table
 
+        if self._bulk_write:
+            return self._write_internal_bulk(iterator)
+
         for asset_id, table in iterator:
             # when writing to db, drop timezone, will crash otherwise
             if not table.empty:
                 table.index = table.index.tz_localize(None)
                 table.to_sql('ohlcv_daily', self.conn, if_exists='append')
 
+    def _write_internal_bulk(self, iterator):
+        """
+        bulk implementation of write. the data of all sids is buffered and
+        streamed to the db with COPY once `copy_batch_size` rows are pending.
+        maintaining the id_day index while loading is expensive, so it is
+        dropped before the load and rebuilt once everything is written.
+        """
+        self._drop_index()
+        try:
+            pending = []
+            pending_rows = 0
+            for asset_id, table in iterator:
+                if table.empty:
+                    continue
+                pending.append(table)
+                pending_rows += len(table)
+                if pending_rows >= self._copy_batch_size:
+                    self._copy_to_postgres(pending)
+                    pending = []
+                    pending_rows = 0
+            if pending:
+                self._copy_to_postgres(pending)
+        finally:
+            self._create_index()
+
+    def _copy_to_postgres(self, tables):
+        """
+        write the given (already validated) tables to the db in one
+        COPY FROM STDIN statement.
+        """
+        data = pd.concat(tables)
+        # COPY can't cast '100.0' to bigint. a missing volume is written as
+        # an empty field, which COPY reads as NULL like to_sql writes it
+        volume = data['volume'].values
+        known = ~np.isnan(volume)
+        volume_field = np.full(len(volume), None, dtype=object)
+        volume_field[known] = np.round(volume[known]).astype(np.int64)
+        rows = pd.DataFrame({
+            'id': data['id'].values.astype(np.int64),
+            'day': data.index.tz_localize(None).strftime('%Y-%m-%d'),
+            'open': data['open'].values,
+            'high': data['high'].values,
+            'low': data['low'].values,
+            'close': data['close'].values,
+            'volume': volume_field,
+        }, columns=COPY_COLUMNS)
+
+        buf = StringIO()
+        rows.to_csv(buf, header=False, index=False)
+        buf.seek(0)
+
+        sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+            TABLE, ', '.join(COPY_COLUMNS),
+        )
+        connection = self.conn.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.copy_expert(sql, buf)
+            cursor.close()
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _drop_index(self):
+        with self.conn.begin() as connection:
+            connection.execute(f'DROP INDEX IF EXISTS {INDEX}')
+
+    def _create_index(self):
+        with self.conn.begin() as connection:
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {INDEX} ON {TABLE} (id, day)'
+            )
+
     def _ensure_sessions_consistency(self, data_slice, invalid_data_behavior):
         """
         check that we have exactly the amount of days we expect by checking the start and end dates
@@ -782,6 +1202,11 @@ class PSQLDailyBarWriter(object):
         :param sid:
         :return:
         """
+        if self._edge_days is not None:
+            # bulk mode: all edges were fetched before writing. a sid that
+            # is not in the db yet results in a row of NaTs, same as below
+            return self._edge_days.reindex([sid]).reset_index(drop=True)
+
         edge_days = pd.read_sql(
             f'SELECT MAX(day) as last_day, MIN(day) as first_day '
             f'FROM ohlcv_daily WHERE id = {sid}',
@@ -790,6 +1215,21 @@ class PSQLDailyBarWriter(object):
         )
         return edge_days
 
+    def _get_all_existing_data_dates_from_db(self):
+        """
+        query the dates (start and end) of the data stored in db for all sids
+        at once.
+        :return: DataFrame of first_day and last_day indexed by id
+        """
+        edge_days = pd.read_sql(
+            f'SELECT id, MAX(day) as last_day, MIN(day) as first_day '
+            f'FROM {TABLE} GROUP BY id',
+            self.conn,
+            index_col='id',
+            parse_dates=['last_day', 'first_day']
+        )
+        return edge_days
+
     def _format_df_columns_and_index(self, data: pd.DataFrame, sid):
         """
         make sure that the data received is in the structure we expect columns and index wise.
@@ -0,0 +1,684 @@
+"""
+Minute bars stored in a PostgreSQL database.
+
+The bars of every sid are stored in the ``ohlcv_minute`` table, which is
+partitioned by month on ``dt`` and indexed on ``(id, dt)``, so that range
+queries only touch the partitions and rows they need. Prices are stored as
+floats (no ohlc ratio) and ``dt`` as naive UTC timestamps.
+
+Every COPY done by the writer is recorded in the ``ohlcv_minute_batches``
+table. The latest batch identifies the version of the data, which is used to
+invalidate the session blocks the reader keeps on disk.
+"""
+from io import StringIO
+import os
+from shutil import rmtree
+import tempfile
+
+from lru import LRU
+import logbook
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+from trading_calendars import get_calendar
+
+from zipline.data.minute_bars import MinuteBarReader
+from zipline.data.bar_reader import NoDataOnDate
+from zipline.utils.cli import maybe_show_progress
+from zipline.utils.db_utils import check_and_create_engine
+from zipline.utils.input_validation import expect_element
+from zipline.utils.memoize import lazyval
+
+from .psql_daily_bars import create_bundle_database
+
+logger = logbook.Logger('PSqlMinuteBars')
+
+TABLE = 'ohlcv_minute'
+INDEX = 'ohlcv_minute_id_dt'
+BATCHES_TABLE = 'ohlcv_minute_batches'
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# columns (and their order) used when streaming rows with COPY FROM STDIN
+COPY_COLUMNS = ('id', 'dt', 'open', 'high', 'low', 'close', 'volume')
+
+# number of pending rows that triggers a COPY
+DEFAULT_COPY_BATCH_SIZE = 1000000
+
+# number of (sid, session) blocks the reader keeps in memory. a block of a
+# regular session is 390 minutes x 5 fields of float64, i.e. ~15KB
+DEFAULT_CACHE_BLOCKS = 20000
+
+# prefix of the directories of the reader's cache_dir holding the blocks of
+# one version of the table
+CACHE_VERSION_PREFIX = 'blocks-'
+
+
+class PSQLMinuteOverlappingData(ValueError):
+    pass
+
+
+def _partition_name(month):
+    return '{}_p{:%Y%m}'.format(TABLE, month)
+
+
+def _to_naive_utc(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        return index
+    return index.tz_convert('UTC').tz_localize(None)
+
+
+class PSQLMinuteBarWriter(object):
+    """
+    Writes minute bars to the ``ohlcv_minute`` table of a PostgreSQL
+    database, with ``COPY FROM STDIN`` in large batches.
+
+    Parameters
+    ----------
+    db_path : str
+        The url of the bundle database.
+    calendar : trading_calendars.TradingCalendar
+        The calendar of the bars. Bars outside of its market minutes are not
+        written.
+    start_session : pd.Timestamp
+        The first session to write.
+    end_session : pd.Timestamp
+        The last session to write.
+    copy_batch_size : int, optional
+        The number of pending rows which triggers a COPY.
+
+    See Also
+    --------
+    zipline.data.psql_minute_bars.PSQLMinuteBarReader
+    """
+    def __init__(self,
+                 db_path,
+                 calendar,
+                 start_session,
+                 end_session,
+                 copy_batch_size=DEFAULT_COPY_BATCH_SIZE):
+        self.conn = check_and_create_engine(db_path, False)
+
+        self._calendar = calendar
+        self._start = calendar.session_open(start_session)
+        self._end = calendar.session_close(end_session)
+        self._copy_batch_size = copy_batch_size
+
+        # names of the existing partitions, read before the first COPY
+        self._partitions = None
+
+        try:
+            self.conn.connect()
+        except sa.exc.OperationalError:
+            # can't connect to db. might mean that the database is not
+            # created yet (happens in first time usage)
+            create_bundle_database(db_path)
+
+        self.ensure_table()
+
+    def ensure_table(self):
+        with self.conn.begin() as connection:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {TABLE} ('
+                f'id integer NOT NULL, '
+                f'dt timestamp NOT NULL, '
+                f'open double precision, '
+                f'high double precision, '
+                f'low double precision, '
+                f'close double precision, '
+                f'volume bigint'
+                f') PARTITION BY RANGE (dt)'
+            )
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {INDEX} ON {TABLE} (id, dt)'
+            )
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {BATCHES_TABLE} ('
+                f'batch serial PRIMARY KEY, '
+                f'written_at timestamp NOT NULL DEFAULT now(), '
+                f'first_dt timestamp NOT NULL, '
+                f'last_dt timestamp NOT NULL, '
+                f'rows bigint NOT NULL'
+                f')'
+            )
+
+    @property
+    def progress_bar_message(self):
+        return "Merging minute equity files:"
+
+    def progress_bar_item_show_func(self, value):
+        return value if value is None else str(value[0])
+
+    @expect_element(invalid_data_behavior={'warn', 'raise', 'ignore'})
+    def write(self, data, show_progress=False, invalid_data_behavior='warn'):
+        """Write a stream of minute data.
+
+        Parameters
+        ----------
+        data : iterable[(int, pd.DataFrame)]
+            The data to write. Each element should be a tuple of sid, data
+            where data has the columns 'open', 'high', 'low', 'close' and
+            'volume', indexed by market minutes.
+        show_progress : bool, optional
+            Whether or not to show a progress bar while writing.
+        invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+            What to do with bars at or before the last bar already written
+            for their sid. They are never written: 'raise' raises a
+            ``PSQLMinuteOverlappingData``, 'warn' logs a warning.
+        """
+        last_dts = self._last_written_dts()
+
+        pending = []
+        pending_rows = 0
+        ctx = maybe_show_progress(
+            data,
+            show_progress=show_progress,
+            item_show_func=self.progress_bar_item_show_func,
+            label=self.progress_bar_message,
+        )
+        with ctx as it:
+            for sid, df in it:
+                rows = self._format(
+                    sid, df, last_dts.get(sid), invalid_data_behavior,
+                )
+                if rows.empty:
+                    continue
+                last_dts[sid] = rows['dt'].iloc[-1]
+                pending.append(rows)
+                pending_rows += len(rows)
+                if pending_rows >= self._copy_batch_size:
+                    self._copy_to_postgres(pending)
+                    pending = []
+                    pending_rows = 0
+        if pending:
+            self._copy_to_postgres(pending)
+
+    def write_sid(self, sid, df, invalid_data_behavior='warn'):
+        """Write the minute bars of a single sid.
+
+        See Also
+        --------
+        zipline.data.psql_minute_bars.PSQLMinuteBarWriter.write
+        """
+        self.write([(sid, df)], invalid_data_behavior=invalid_data_behavior)
+
+    def _last_written_dts(self):
+        last_dts = pd.read_sql(
+            f'SELECT id, MAX(dt) AS last_dt FROM {TABLE} GROUP BY id',
+            self.conn,
+            index_col='id',
+            parse_dates=['last_dt'],
+        )['last_dt']
+        return last_dts.to_dict()
+
+    def _format(self, sid, df, last_dt, invalid_data_behavior):
+        """
+        The rows to write for ``sid``: its bars in market minutes of the
+        sessions of the writer, after ``last_dt``, with at least one value.
+        """
+        if df.empty:
+            return pd.DataFrame(columns=COPY_COLUMNS)
+
+        dts = _to_naive_utc(df.index)
+        minutes = _to_naive_utc(self._calendar.minutes_in_range(
+            max(self._start, pd.Timestamp(dts[0], tz='UTC')),
+            min(self._end, pd.Timestamp(dts[-1], tz='UTC')),
+        ))
+        keep = dts.isin(minutes)
+
+        if last_dt is not None and not pd.isnull(last_dt):
+            overlapping = keep & (dts <= last_dt)
+            if overlapping.any():
+                msg = (
+                    'Data with last_date={} already includes input '
+                    'start={} for sid={}'.format(last_dt, dts[0], sid)
+                )
+                if invalid_data_behavior == 'raise':
+                    raise PSQLMinuteOverlappingData(msg)
+                elif invalid_data_behavior == 'warn':
+                    logger.warning(msg + '. skipping overlapping bars.')
+                keep &= ~overlapping
+
+        values = df[list(FIELDS)][keep]
+        values = values[values.notnull().any(axis=1).values]
+        rows = pd.DataFrame({
+            'id': np.full(len(values), sid, dtype=np.int64),
+            'dt': _to_naive_utc(values.index),
+        }, columns=['id', 'dt'])
+        for field in FIELDS:
+            rows[field] = values[field].values
+        return rows
+
+    def _ensure_partitions(self, first_dt, last_dt):
+        if self._partitions is None:
+            self._partitions = set(pd.read_sql(
+                f'SELECT c.relname AS name FROM pg_inherits i '
+                f'JOIN pg_class c ON c.oid = i.inhrelid '
+                f'JOIN pg_class p ON p.oid = i.inhparent '
+                f'WHERE p.relname = \'{TABLE}\'',
+                self.conn,
+            )['name'])
+
+        months = pd.date_range(
+            first_dt.replace(day=1).normalize(),
+            last_dt,
+            freq='MS',
+        )
+        with self.conn.begin() as connection:
+            for month in months:
+                name = _partition_name(month)
+                if name in self._partitions:
+                    continue
+                connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} '
+                    f'FOR VALUES FROM (\'{month:%Y-%m-%d}\') '
+                    f'TO (\'{month + pd.offsets.MonthBegin():%Y-%m-%d}\')'
+                )
+                self._partitions.add(name)
+
+    def _copy_to_postgres(self, tables):
+        """
+        write the given rows to the db in one COPY FROM STDIN statement,
+        and record the batch in the same transaction.
+        """
+        rows = pd.concat(tables, ignore_index=True)
+        first_dt = rows['dt'].min()
+        last_dt = rows['dt'].max()
+        self._ensure_partitions(first_dt, last_dt)
+
+        # COPY can't cast '100.0' to bigint. a missing volume is no volume
+        rows['volume'] = rows['volume'].fillna(0).round().astype(np.int64)
+        rows['dt'] = rows['dt'].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+        buf = StringIO()
+        rows[list(COPY_COLUMNS)].to_csv(buf, header=False, index=False)
+        buf.seek(0)
+
+        sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+            TABLE, ', '.join(COPY_COLUMNS),
+        )
+        connection = self.conn.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.copy_expert(sql, buf)
+            cursor.execute(
+                f'INSERT INTO {BATCHES_TABLE} (first_dt, last_dt, rows) '
+                f'VALUES (%s, %s, %s)',
+                (first_dt.to_pydatetime(), last_dt.to_pydatetime(), len(rows)),
+            )
+            cursor.close()
+            connection.commit()
+        finally:
+            connection.close()
+
+
+class PSQLMinuteBarReader(MinuteBarReader):
+    """
+    Reader for minute bars written by PSQLMinuteBarWriter.
+
+    Bars are read in blocks of one session of one sid, which are kept in an
+    in-memory LRU cache, and optionally in a directory where they are
+    memory-mapped from on the next reads, by this or any later process.
+
+    Parameters
+    ----------
+    path : str
+        The url of the bundle database.
+    calendar : trading_calendars.TradingCalendar, optional
+        The calendar of the bars. Defaults to XNYS.
+    cache_blocks : int, optional
+        The number of (sid, session) blocks kept in memory.
+    cache_dir : str, optional
+        Directory in which the blocks of complete sessions are stored as
+        ``.npy`` files. The blocks are dropped when data is written to the
+        table.
+
+    See Also
+    --------
+    zipline.data.psql_minute_bars.PSQLMinuteBarWriter
+    """
+    def __init__(self,
+                 path,
+                 calendar=None,
+                 cache_blocks=DEFAULT_CACHE_BLOCKS,
+                 cache_dir=None):
+        self.conn = check_and_create_engine(path, False)
+        self._calendar = calendar
+        self._blocks = LRU(cache_blocks)
+        self._cache_dir = cache_dir
+        self._cache_version_dir = None
+
+    @lazyval
+    def trading_calendar(self):
+        if self._calendar is None:
+            return get_calendar('XNYS')
+        return self._calendar
+
+    @lazyval
+    def _bounds(self):
+        """
+        The latest batch, first and last bar of the table.
+        """
+        if not self.conn.has_table(BATCHES_TABLE):
+            # the bundle has no minute bars
+            return None, pd.NaT, pd.NaT
+        info = pd.read_sql(
+            f'SELECT MAX(batch) AS batch, MIN(first_dt) AS first_dt, '
+            f'MAX(last_dt) AS last_dt FROM {BATCHES_TABLE}',
+            self.conn,
+            parse_dates=['first_dt', 'last_dt'],
+        )
+        if pd.isnull(info['batch'][0]):
+            return None, pd.NaT, pd.NaT
+        return (
+            int(info['batch'][0]),
+            pd.Timestamp(info['first_dt'][0], tz='UTC'),
+            pd.Timestamp(info['last_dt'][0], tz='UTC'),
+        )
+
+    @lazyval
+    def first_trading_day(self):
+        first_dt = self._bounds[1]
+        if pd.isnull(first_dt):
+            return pd.NaT
+        return self.trading_calendar.minute_to_session_label(first_dt)
+
+    @lazyval
+    def _last_session(self):
+        last_dt = self._bounds[2]
+        if pd.isnull(last_dt):
+            return pd.NaT
+        return self.trading_calendar.minute_to_session_label(last_dt)
+
+    @lazyval
+    def last_available_dt(self):
+        if pd.isnull(self._last_session):
+            return pd.NaT
+        return self.trading_calendar.session_close(self._last_session)
+
+    def _block_path(self, sid, session):
+        """
+        The file of a block in the cache directory, or None if the block
+        must not be stored: there is no cache directory, or the session may
+        still get bars.
+        """
+        if self._cache_dir is None or not session < self._last_session:
+            return None
+
+        if self._cache_version_dir is None:
+            version = CACHE_VERSION_PREFIX + str(self._bounds[0])
+            self._cache_version_dir = os.path.join(self._cache_dir, version)
+            if not os.path.isdir(self._cache_version_dir):
+                os.makedirs(self._cache_version_dir)
+            # blocks of older versions of the table are never read again.
+            # other entries of the directory are not ours to delete.
+            for stale in os.listdir(self._cache_dir):
+                if stale.startswith(CACHE_VERSION_PREFIX) and \
+                        stale != version:
+                    rmtree(
+                        os.path.join(self._cache_dir, stale),
+                        ignore_errors=True,
+                    )
+
+        return os.path.join(
+            self._cache_version_dir,
+            '{}-{:%Y%m%d}.npy'.format(sid, session),
+        )
+
+    def _cached_block(self, sid, session):
+        try:
+            return self._blocks[sid, session]
+        except KeyError:
+            pass
+
+        path = self._block_path(sid, session)
+        if path is None:
+            return None
+        try:
+            block = np.load(path, mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return None
+        self._blocks[sid, session] = block
+        return block
+
+    def _store_block(self, sid, session, block):
+        self._blocks[sid, session] = block
+
+        path = self._block_path(sid, session)
+        if path is None:
+            return
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, block)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def _query_blocks(self, sids, sessions):
+        """
+        Read the blocks of ``sids`` for the range of ``sessions`` with a
+        single query.
+
+        Returns
+        -------
+        blocks : dict[(int, pd.Timestamp) -> np.ndarray]
+            Arrays of shape (minutes in session, 5) with a column per field,
+            nan for missing prices and 0 for missing volumes.
+        """
+        cal = self.trading_calendar
+        minutes = cal.minutes_for_sessions_in_range(sessions[0], sessions[-1])
+        data = pd.read_sql(
+            f'SELECT id, dt, {", ".join(FIELDS)} FROM {TABLE} '
+            f'WHERE id = ANY(%(ids)s) AND dt BETWEEN %(start)s AND %(end)s',
+            self.conn,
+            params={
+                'ids': [int(sid) for sid in sids],
+                'start': minutes[0].tz_localize(None).to_pydatetime(),
+                'end': minutes[-1].tz_localize(None).to_pydatetime(),
+            },
+        )
+
+        minute_ix = minutes.get_indexer(
+            pd.DatetimeIndex(data['dt']).tz_localize('UTC'),
+        )
+        sid_ix = pd.Index(sids).get_indexer(data['id'].values)
+        found = minute_ix != -1
+
+        values = np.full((len(sids), len(minutes), len(FIELDS)), np.nan)
+        values[sid_ix[found], minute_ix[found]] = \
+            data[list(FIELDS)].values.astype(np.float64)[found]
+        prices = values[..., :4]
+        prices[prices == 0] = np.nan
+        volumes = values[..., 4]
+        volumes[np.isnan(volumes)] = 0
+
+        blocks = {}
+        for session in sessions:
+            start, stop = minutes.slice_locs(
+                cal.session_open(session),
+                cal.session_close(session),
+            )
+            for i, sid in enumerate(sids):
+                blocks[sid, session] = values[i, start:stop].copy()
+        return blocks
+
+    def _read_blocks(self, sids, sessions):
+        """
+        The blocks of every sid in ``sids`` and session in ``sessions``, from
+        the cache if possible. The missing ones are read with one query.
+        """
+        blocks = {}
+        missing_sids = set()
+        missing_sessions = set()
+        for session in sessions:
+            for sid in sids:
+                block = self._cached_block(sid, session)
+                if block is None:
+                    missing_sids.add(sid)
+                    missing_sessions.add(session)
+                else:
+                    blocks[sid, session] = block
+
+        if missing_sids:
+            missing_sessions = sorted(missing_sessions)
+            queried = self._query_blocks(
+                sorted(missing_sids),
+                self.trading_calendar.sessions_in_range(
+                    missing_sessions[0],
+                    missing_sessions[-1],
+                ),
+            )
+            for (sid, session), block in queried.items():
+                if (sid, session) not in blocks and session in sessions:
+                    blocks[sid, session] = block
+                    self._store_block(sid, session, block)
+        return blocks
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        """
+        Parameters
+        ----------
+        fields : list of str
+           'open', 'high', 'low', 'close', or 'volume'
+        start_dt: Timestamp
+           Beginning of the window range.
+        end_dt: Timestamp
+           End of the window range.
+        sids : list of int
+           The asset identifiers in the window.
+
+        Returns
+        -------
+        list of np.ndarray
+            A list with an entry per field of ndarrays with shape
+            (minutes in range, sids) with a dtype of float64, containing the
+            values for the respective field over start and end dt range.
+        """
+        cal = self.trading_calendar
+        sids = [int(sid) for sid in sids]
+        sessions = cal.sessions_in_range(
+            cal.minute_to_session_label(start_dt),
+            cal.minute_to_session_label(end_dt, direction='previous'),
+        )
+        minutes = cal.minutes_for_sessions_in_range(sessions[0], sessions[-1])
+        start, stop = minutes.slice_locs(start_dt, end_dt)
+
+        blocks = self._read_blocks(sids, sessions)
+        field_ix = [FIELDS.index(field) for field in fields]
+        out = np.empty((len(fields), len(minutes), len(sids)))
+        row = 0
+        for session in sessions:
+            length = len(blocks[sids[0], session]) if sids else 0
+            for j, sid in enumerate(sids):
+                out[:, row:row + length, j] = \
+                    blocks[sid, session][:, field_ix].T
+            row += length
+
+        return [out[i, start:stop] for i in range(len(fields))]
+
+    def get_value(self, sid, dt, field):
+        """
+        Retrieve the pricing info for the given sid, dt, and field.
+
+        Parameters
+        ----------
+        sid : int
+            Asset identifier.
+        dt : datetime-like
+            The datetime at which the trade occurred.
+        field : string
+            The type of pricing data to retrieve.
+            ('open', 'high', 'low', 'close', 'volume')
+
+        Returns
+        -------
+        out : float|int
+
+        The market data for the given sid, dt, and field coordinates.
+
+        For OHLC:
+            Returns a float if a trade occurred at the given dt.
+            If no trade occurred, a np.nan is returned.
+
+        For volume:
+            Returns the integer value of the volume.
+            (A volume of 0 signifies no trades for the given dt.)
+        """
+        cal = self.trading_calendar
+        try:
+            session = cal.minute_to_session_label(dt, direction='none')
+        except ValueError:
+            raise NoDataOnDate()
+
+        sid = int(sid)
+        block = self._read_blocks([sid], [session])[sid, session]
+        pos = (dt - cal.session_open(session)) // pd.Timedelta(minutes=1)
+        value = block[pos, FIELDS.index(field)]
+        if field == 'volume':
+            return int(value)
+        return value
+
+    def get_values(self, sids, dt, field):
+        """
+        Vectorized version of ``get_value`` for many sids, which reads the
+        missing blocks of all the sids with one query.
+
+        Returns
+        -------
+        values : np.ndarray[float64]
+            The values aligned with ``sids``. NaN for every sid if ``dt`` is
+            not a market minute.
+        """
+        cal = self.trading_calendar
+        try:
+            session = cal.minute_to_session_label(dt, direction='none')
+        except ValueError:
+            return np.full(len(sids), np.nan)
+
+        sids = [int(sid) for sid in sids]
+        blocks = self._read_blocks(sids, [session])
+        pos = (dt - cal.session_open(session)) // pd.Timedelta(minutes=1)
+        col = FIELDS.index(field)
+        return np.array(
+            [blocks[sid, session][pos, col] for sid in sids],
+            dtype=np.float64,
+        )
+
+    def get_last_traded_dt(self, asset, dt):
+        """
+        The last minute at or before ``dt`` in which ``asset`` traded, or
+        NaT. It is read from the cached block of the session of ``dt`` if
+        the asset traded in it, otherwise with an indexed query.
+        """
+        cal = self.trading_calendar
+        sid = int(asset)
+        try:
+            session = cal.minute_to_session_label(dt, direction='none')
+        except ValueError:
+            session = None
+        if session is not None:
+            block = self._cached_block(sid, session)
+            if block is not None:
+                pos = (dt - cal.session_open(session)) // \
+                    pd.Timedelta(minutes=1)
+                traded = np.flatnonzero(block[:pos + 1, 4])
+                if len(traded):
+                    return cal.session_open(session) + \
+                        pd.Timedelta(minutes=int(traded[-1]))
+
+        result = pd.read_sql(
+            f'SELECT MAX(dt) AS last_dt FROM {TABLE} '
+            f'WHERE id = %(id)s AND dt <= %(dt)s AND volume > 0',
+            self.conn,
+            params={
+                'id': sid,
+                'dt': _to_naive_utc([dt])[0].to_pydatetime(),
+            },
+            parse_dates=['last_dt'],
+        )['last_dt'][0]
+        if pd.isnull(result):
+            return pd.NaT
+        return pd.Timestamp(result, tz='UTC')
@@ -16,7 +16,7 @@ from abc import ABCMeta, abstractmethod
 
 import numpy as np
 import pandas as pd
-from six import with_metaclass
+from six import iteritems, with_metaclass
 
 from zipline.data._resample import (
     _minute_to_session_open,
@@ -112,6 +112,10 @@ class DailyHistoryAggregator(object):
     Provides aggregation for `open`, `high`, `low`, `close`, and `volume`.
     The aggregation rules for each price type is documented in their respective
 
+    The rollups of all the fields are kept in arrays with a column per asset
+    seen during the session, and are brought forward together: the minutes
+    since the last visit of the requested assets are read with one
+    ``load_raw_arrays`` call for all of them, usually a single minute.
     """
 
     def __init__(self, market_opens, minute_reader, trading_calendar):
@@ -119,50 +123,146 @@ class DailyHistoryAggregator(object):
         self._minute_reader = minute_reader
         self._trading_calendar = trading_calendar
 
-        # The caches are structured as (date, market_open, entries), where
-        # entries is a dict of asset -> (last_visited_dt, value)
+        # The rollups of the current session. Every asset visited during the
+        # session has a column in the arrays of ``_rollups``, holding the
+        # aggregation of its minutes from the market open through the minute
+        # in ``_visited`` (an int dt.value).
         #
-        # Whenever an aggregation method determines the current value,
-        # the entry for the respective asset should be overwritten with a new
-        # entry for the current dt.value (int) and aggregation value.
-        #
-        # When the requested dt's date is different from date the cache is
-        # flushed, so that the cache entries do not grow unbounded.
-        #
-        # Example cache:
-        # cache = (date(2016, 3, 17),
-        #          pd.Timestamp('2016-03-17 13:31', tz='UTC'),
-        #          {
-        #              1: (1458221460000000000, np.nan),
-        #              2: (1458221460000000000, 42.0),
-        #         })
-        self._caches = {
-            'open': None,
-            'high': None,
-            'low': None,
-            'close': None,
-            'volume': None
+        # When the requested dt's session is different from the session of
+        # the rollups they are flushed, so that they do not grow unbounded.
+        self._session = None
+        self._market_open = None
+        self._columns = {}
+        self._assets = []
+        self._visited = np.empty(0, dtype=np.int64)
+        self._rollups = {
+            field: np.empty(0) for field in _MINUTE_TO_SESSION_OHCLV_HOW
         }
 
         # The int value is used for deltas to avoid extra computation from
         # creating new Timestamps.
         self._one_min = pd.Timedelta('1 min').value
 
-    def _prelude(self, dt, field):
+    def _reset_session(self, session):
+        self._session = session
+        self._market_open = \
+            self._market_opens.loc[session].tz_localize('UTC')
+        self._columns = {}
+        self._assets = []
+        self._visited = np.empty(0, dtype=np.int64)
+        for field in self._rollups:
+            self._rollups[field] = np.empty(0)
+
+    def _add_columns(self, assets):
+        """
+        Add a column, with the rollup of no minutes, for each of ``assets``.
+        """
+        for asset in assets:
+            self._columns[asset] = len(self._assets)
+            self._assets.append(asset)
+
+        count = len(assets)
+        self._visited = np.append(
+            self._visited,
+            np.full(count, self._market_open.value - self._one_min),
+        )
+        for field, rollup in iteritems(self._rollups):
+            self._rollups[field] = np.append(
+                rollup,
+                np.full(count, 0.0 if field == 'volume' else np.nan),
+            )
+
+    def _roll_forward(self, columns, dt):
+        """
+        Bring the rollups of ``columns``, all visited at the same minute,
+        forward to ``dt``.
+        """
+        rollups = self._rollups
+        window = self._minute_reader.load_raw_arrays(
+            list(rollups),
+            pd.Timestamp(self._visited[columns[0]] + self._one_min, tz='UTC'),
+            dt,
+            [self._assets[c] for c in columns],
+        )
+        self._visited[columns] = dt.value
+        opens, highs, lows, closes, volumes = window
+        if not len(opens):
+            return
+
+        # The first open of the session, once seen, stays.
+        traded = ~np.isnan(opens)
+        first = opens[traded.argmax(axis=0), np.arange(len(columns))]
+        first[~traded.any(axis=0)] = np.nan
+        rollup = rollups['open'][columns]
+        rollups['open'][columns] = np.where(np.isnan(rollup), first, rollup)
+
+        rollups['high'][columns] = np.fmax(
+            rollups['high'][columns],
+            np.fmax.reduce(highs, axis=0),
+        )
+        rollups['low'][columns] = np.fmin(
+            rollups['low'][columns],
+            np.fmin.reduce(lows, axis=0),
+        )
+
+        # The latest close is forward filled.
+        traded = ~np.isnan(closes)
+        last = closes[
+            len(closes) - 1 - traded[::-1].argmax(axis=0),
+            np.arange(len(columns)),
+        ]
+        rollups['close'][columns] = np.where(
+            traded.any(axis=0), last, rollups['close'][columns],
+        )
+
+        rollups['volume'][columns] += np.nansum(volumes, axis=0)
+
+    def _aggregate(self, field, assets, dt, missing_value):
+        """
+        The rollup of ``field`` through ``dt`` for each of ``assets``, and
+        ``missing_value`` for the assets not alive in the session of ``dt``.
+        """
         session = self._trading_calendar.minute_to_session_label(dt)
+        if session != self._session:
+            self._reset_session(session)
+
+        alive = np.array(
+            [asset.is_alive_for_session(session) for asset in assets],
+            dtype=bool,
+        )
+        columns = self._columns
+        new_assets = list(OrderedDict.fromkeys(
+            asset for asset, is_alive in zip(assets, alive)
+            if is_alive and asset not in columns
+        ))
+        if new_assets:
+            self._add_columns(new_assets)
+
+        positions = np.array(
+            [columns[asset] if is_alive else -1
+             for asset, is_alive in zip(assets, alive)],
+            dtype=np.intp,
+        )
+
         dt_value = dt.value
-        cache = self._caches[field]
-        if cache is None or cache[0] != session:
-            market_open = self._market_opens.loc[session]
-            cache = self._caches[field] = (session, market_open, {})
-
-        _, market_open, entries = cache
-        market_open = market_open.tz_localize('UTC')
-        if dt != market_open:
-            prev_dt = dt_value - self._one_min
-        else:
-            prev_dt = None
-        return market_open, prev_dt, dt_value, entries
+        stale = np.unique(positions[alive])
+        stale = stale[self._visited[stale] != dt_value]
+        if len(stale):
+            # The rollups already past dt start over from the market open.
+            rewound = stale[self._visited[stale] > dt_value]
+            if len(rewound):
+                self._visited[rewound] = \
+                    self._market_open.value - self._one_min
+                for name, rollup in iteritems(self._rollups):
+                    rollup[rewound] = 0.0 if name == 'volume' else np.nan
+
+            visited = self._visited[stale]
+            for visited_value in np.unique(visited):
+                self._roll_forward(stale[visited == visited_value], dt)
+
+        out = np.full(len(assets), missing_value, dtype=np.float64)
+        out[alive] = self._rollups[field][positions[alive]]
+        return out
 
     def opens(self, assets, dt):
         """
@@ -177,64 +277,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'open')
-
-        opens = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                opens.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'open')
-                entries[asset] = (dt_value, val)
-                opens.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, first_open = entries[asset]
-                    if last_visited_dt == dt_value:
-                        opens.append(first_open)
-                        continue
-                    elif not pd.isnull(first_open):
-                        opens.append(first_open)
-                        entries[asset] = (dt_value, first_open)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['open'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0]
-                        nonnan = window[~pd.isnull(window)]
-                        if len(nonnan):
-                            val = nonnan[0]
-                        else:
-                            val = np.nan
-                        entries[asset] = (dt_value, val)
-                        opens.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['open'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0]
-                    nonnan = window[~pd.isnull(window)]
-                    if len(nonnan):
-                        val = nonnan[0]
-                    else:
-                        val = np.nan
-                    entries[asset] = (dt_value, val)
-                    opens.append(val)
-                    continue
-        return np.array(opens)
+        return self._aggregate('open', assets, dt, np.nan)
 
     def highs(self, assets, dt):
         """
@@ -246,64 +289,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'high')
-
-        highs = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                highs.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'high')
-                entries[asset] = (dt_value, val)
-                highs.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_max = entries[asset]
-                    if last_visited_dt == dt_value:
-                        highs.append(last_max)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        curr_val = self._minute_reader.get_value(
-                            asset, dt, 'high')
-                        if pd.isnull(curr_val):
-                            val = last_max
-                        elif pd.isnull(last_max):
-                            val = curr_val
-                        else:
-                            val = max(last_max, curr_val)
-                        entries[asset] = (dt_value, val)
-                        highs.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['high'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0].T
-                        val = np.nanmax(np.append(window, last_max))
-                        entries[asset] = (dt_value, val)
-                        highs.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['high'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0].T
-                    val = np.nanmax(window)
-                    entries[asset] = (dt_value, val)
-                    highs.append(val)
-                    continue
-        return np.array(highs)
+        return self._aggregate('high', assets, dt, np.nan)
 
     def lows(self, assets, dt):
         """
@@ -315,59 +301,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'low')
-
-        lows = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                lows.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'low')
-                entries[asset] = (dt_value, val)
-                lows.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_min = entries[asset]
-                    if last_visited_dt == dt_value:
-                        lows.append(last_min)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        curr_val = self._minute_reader.get_value(
-                            asset, dt, 'low')
-                        val = np.nanmin([last_min, curr_val])
-                        entries[asset] = (dt_value, val)
-                        lows.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['low'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0].T
-                        val = np.nanmin(np.append(window, last_min))
-                        entries[asset] = (dt_value, val)
-                        lows.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['low'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0].T
-                    val = np.nanmin(window)
-                    entries[asset] = (dt_value, val)
-                    lows.append(val)
-                    continue
-        return np.array(lows)
+        return self._aggregate('low', assets, dt, np.nan)
 
     def closes(self, assets, dt):
         """
@@ -381,69 +315,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'close')
-
-        closes = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        def _get_filled_close(asset):
-            """
-            Returns the most recent non-nan close for the asset in this
-            session. If there has been no data in this session on or before the
-            `dt`, returns `nan`
-            """
-            window = self._minute_reader.load_raw_arrays(
-                ['close'],
-                market_open,
-                dt,
-                [asset],
-            )[0]
-            try:
-                return window[~np.isnan(window)][-1]
-            except IndexError:
-                return np.NaN
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                closes.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'close')
-                entries[asset] = (dt_value, val)
-                closes.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_close = entries[asset]
-                    if last_visited_dt == dt_value:
-                        closes.append(last_close)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'close')
-                        if pd.isnull(val):
-                            val = last_close
-                        entries[asset] = (dt_value, val)
-                        closes.append(val)
-                        continue
-                    else:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'close')
-                        if pd.isnull(val):
-                            val = _get_filled_close(asset)
-                        entries[asset] = (dt_value, val)
-                        closes.append(val)
-                        continue
-                except KeyError:
-                    val = self._minute_reader.get_value(
-                        asset, dt, 'close')
-                    if pd.isnull(val):
-                        val = _get_filled_close(asset)
-                    entries[asset] = (dt_value, val)
-                    closes.append(val)
-                    continue
-        return np.array(closes)
+        return self._aggregate('close', assets, dt, np.nan)
 
     def volumes(self, assets, dt):
         """
@@ -455,59 +327,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=int64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'volume')
-
-        volumes = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                volumes.append(0)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'volume')
-                entries[asset] = (dt_value, val)
-                volumes.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_total = entries[asset]
-                    if last_visited_dt == dt_value:
-                        volumes.append(last_total)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'volume')
-                        val += last_total
-                        entries[asset] = (dt_value, val)
-                        volumes.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['volume'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0]
-                        val = np.nansum(window) + last_total
-                        entries[asset] = (dt_value, val)
-                        volumes.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['volume'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0]
-                    val = np.nansum(window)
-                    entries[asset] = (dt_value, val)
-                    volumes.append(val)
-                    continue
-        return np.array(volumes)
+        return self._aggregate('volume', assets, dt, 0).astype(np.int64)
 
 
 class MinuteResampleSessionBarReader(SessionBarReader):
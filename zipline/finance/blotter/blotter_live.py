@@ -14,7 +14,7 @@ from logbook import Logger
 from collections import defaultdict
 from copy import copy
 
-from six import itervalues, iteritems
+from six import iteritems
 
 from zipline.assets import Equity, Future, Asset
 from zipline.finance.blotter.blotter import Blotter
@@ -39,8 +39,17 @@ warning_logger = Logger('AlgoWarning')
 class BlotterLive(Blotter):
     def __init__(self, data_frequency, broker):
         self.broker = broker
-        self._processed_closed_orders = []
-        self._processed_transactions = []
+        # order id -> Order, today's orders as of the last broker update
+        self._orders = {}
+        self._open_order_ids = set()
+        self._processed_transaction_ids = set()
+        self._order_cursor = None
+        self._synced = False
+        self._day = None
+        # changes applied to the orders and not yet returned by
+        # get_transactions
+        self._new_transactions = []
+        self._new_closed_orders = []
         self.data_frequency = data_frequency
         self.new_orders = []
         self.max_shares = int(1e+11)
@@ -70,25 +79,73 @@ class BlotterLive(Blotter):
                        orders=self.orders,
                        new_orders=self.new_orders)
 
-    @property
-    def orders(self):
+    def _roll_day(self, today):
+        """
+        Forget the orders of the previous days which are no longer open, and
+        the ids of the transactions processed on those days.
+        """
+        self._day = today
+        self._orders = {
+            order_id: order
+            for order_id, order in iteritems(self._orders)
+            if order_id in self._open_order_ids
+        }
+        self._processed_transaction_ids = set()
+
+    def _update_orders(self):
+        """
+        Apply the order changes and fills reported by the broker since the
+        previous update.
+
+        Today's transactions which were not seen before, and the orders which
+        were closed since the previous update, are queued for the next call
+        to get_transactions.
+        """
+        orders, transactions, self._order_cursor = \
+            self.broker.get_order_updates(self._order_cursor)
+        self._synced = True
+
         # IB returns orders from previous days too.
         # Need to filter for today to be in sync with zipline's behavior
         # TODO: This logic needs to be extended once GTC orders are supported
         today = pd.to_datetime('now', utc=True).date()
-        return {order_id: order
-                for order_id, order in iteritems(self.broker.orders)
-                if order.dt.date() == today}
+        if today != self._day:
+            self._roll_day(today)
+
+        for order in orders:
+            known = order.id in self._orders
+            # orders which are already tracked are updated whatever their
+            # date, so that they are closed
+            if not known and order.dt.date() != today:
+                continue
+            self._orders[order.id] = order
+            if order.open:
+                self._open_order_ids.add(order.id)
+            elif order.id in self._open_order_ids or not known:
+                self._open_order_ids.discard(order.id)
+                self._new_closed_orders.append(order)
+
+        for tx_id, tx in iteritems(transactions):
+            if tx_id in self._processed_transaction_ids:
+                continue
+            self._processed_transaction_ids.add(tx_id)
+            if tx.dt.date() == today:
+                self._new_transactions.append(tx)
+
+    @property
+    def orders(self):
+        if not self._synced:
+            self._update_orders()
+        return self._orders
 
     @property
     def open_orders(self):
-        assets = set([order.asset for order in itervalues(self.orders)
-                      if order.open])
-        return {
-            asset: [order for order in itervalues(self.orders)
-                    if order.asset == asset and order.open]
-            for asset in assets
-        }
+        orders = self.orders
+        open_orders = defaultdict(list)
+        for order_id in self._open_order_ids:
+            order = orders[order_id]
+            open_orders[order.asset].append(order)
+        return dict(open_orders)
 
     @expect_types(asset=Asset)
     def order(self, asset, amount, style, order_id=None):
@@ -98,6 +155,9 @@ class BlotterLive(Blotter):
             return ''
         order = self.broker.order(asset, amount, style)
         self.new_orders.append(order)
+        self._orders[order.id] = order
+        if order.open:
+            self._open_order_ids.add(order.id)
 
         return order.id
 
@@ -175,29 +235,19 @@ class BlotterLive(Blotter):
 
     def get_transactions(self, bar_data):
         # All returned values from this function are delta between
-        # the previous and actual call.
-        def _list_delta(lst_a, lst_b):
-            return [elem for elem in lst_a if elem not in set(lst_b)]
-
-        today = pd.to_datetime('now', utc=True).date()
-        all_transactions = [tx
-                            for tx in itervalues(self.broker.transactions)
-                            if tx.dt.date() == today]
-        new_transactions = _list_delta(all_transactions,
-                                       self._processed_transactions)
-        self._processed_transactions = all_transactions
+        # the previous and actual call. The broker is asked once per bar for
+        # the changes since the previous one.
+        self._update_orders()
+        new_transactions = self._new_transactions
+        new_closed_orders = self._new_closed_orders
+        self._new_transactions = []
+        self._new_closed_orders = []
 
         new_commissions = [{'asset': tx.asset,
-                            'cost': self.broker.orders[tx.order_id].commission,
-                            'order': self.orders[tx.order_id]}
-                           for tx in new_transactions]
-
-        all_closed_orders = [order
-                             for order in itervalues(self.orders)
-                             if not order.open]
-        new_closed_orders = _list_delta(all_closed_orders,
-                                        self._processed_closed_orders)
-        self._processed_closed_orders = all_closed_orders
+                            'cost': self._orders[tx.order_id].commission,
+                            'order': self._orders[tx.order_id]}
+                           for tx in new_transactions
+                           if tx.order_id in self._orders]
 
         return new_transactions, new_commissions, new_closed_orders
 
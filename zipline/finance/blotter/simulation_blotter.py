@@ -16,6 +16,7 @@ from logbook import Logger
 from collections import defaultdict
 from copy import copy
 
+import numpy as np
 from six import iteritems
 
 from zipline.assets import Equity, Future, Asset
@@ -26,18 +27,33 @@ from zipline.finance.slippage import (
     DEFAULT_FUTURE_VOLUME_SLIPPAGE_BAR_LIMIT,
     VolatilityVolumeShare,
     FixedBasisPointsSlippage,
+    FixedSlippage,
+    VolumeShareSlippage,
 )
 from zipline.finance.commission import (
     DEFAULT_PER_CONTRACT_COST,
     FUTURE_EXCHANGE_FEES_BY_SYMBOL,
     PerContract,
+    PerDollar,
     PerShare,
+    PerTrade,
 )
+from zipline.finance.transaction import create_transaction
 from zipline.utils.input_validation import expect_types
 
 log = Logger('Blotter')
 warning_logger = Logger('AlgoWarning')
 
+# The models whose fills are computed for all the market orders of a bar at
+# once. Only these exact types qualify, as subclasses may override
+# ``process_order`` or ``calculate``.
+BATCH_SLIPPAGE_MODELS = frozenset([
+    FixedBasisPointsSlippage,
+    FixedSlippage,
+    VolumeShareSlippage,
+])
+BATCH_COMMISSION_MODELS = frozenset([PerDollar, PerShare, PerTrade])
+
 
 @register(Blotter, 'default')
 class SimulationBlotter(Blotter):
@@ -338,14 +354,17 @@ class SimulationBlotter(Blotter):
         commissions = []
 
         if self.open_orders:
-            for asset, asset_orders in iteritems(self.open_orders):
-                slippage = self.slippage_models[type(asset)]
+            batch_fills = self._get_batch_fills(bar_data)
 
-                for order, txn in \
-                        slippage.simulate(bar_data, asset, asset_orders):
-                    commission = self.commission_models[type(asset)]
-                    additional_commission = commission.calculate(order, txn)
+            for asset, asset_orders in iteritems(self.open_orders):
+                if asset in batch_fills:
+                    fills = batch_fills[asset]
+                else:
+                    fills = self._simulate_fills(
+                        bar_data, asset, asset_orders,
+                    )
 
+                for order, txn, additional_commission in fills:
                     if additional_commission > 0:
                         commissions.append({
                             "asset": order.asset,
@@ -365,6 +384,108 @@ class SimulationBlotter(Blotter):
 
         return transactions, commissions, closed_orders
 
+    def _simulate_fills(self, bar_data, asset, asset_orders):
+        """
+        The (order, transaction, commission) fills of the orders of an asset,
+        one order at a time.
+        """
+        slippage = self.slippage_models[type(asset)]
+        commission = self.commission_models[type(asset)]
+        for order, txn in slippage.simulate(bar_data, asset, asset_orders):
+            yield order, txn, commission.calculate(order, txn)
+
+    def _get_batch_fills(self, bar_data):
+        """
+        The fills of the assets with only market orders and built-in slippage
+        and commission models, computed for all these assets at once.
+
+        Returns
+        -------
+        fills : dict[Asset -> list[(Order, Transaction, float)]]
+            The fills of every such asset, in order, like those of
+            ``_simulate_fills``.
+        """
+        assets_by_type = defaultdict(list)
+        for asset, asset_orders in iteritems(self.open_orders):
+            asset_type = type(asset)
+            if (type(self.slippage_models[asset_type])
+                    not in BATCH_SLIPPAGE_MODELS or
+                    type(self.commission_models[asset_type])
+                    not in BATCH_COMMISSION_MODELS):
+                continue
+            if any(order.stop is not None or order.limit is not None
+                   for order in asset_orders):
+                continue
+            assets_by_type[asset_type].append(asset)
+
+        batch_fills = {}
+        for asset_type, assets in iteritems(assets_by_type):
+            bar = bar_data.current(assets, ['volume', 'close'])
+            volumes = bar['volume'].values.astype(np.float64)
+            prices = bar['close'].values.astype(np.float64)
+
+            orders = []
+            asset_ix = []
+            first = []
+            for i, asset in enumerate(assets):
+                batch_fills[asset] = []
+
+                # like SlippageModel.simulate, skip the bars without volume
+                # or price
+                if not volumes[i] > 0 or np.isnan(prices[i]):
+                    continue
+                asset_orders = [
+                    order for order in self.open_orders[asset]
+                    if order.open_amount != 0
+                ]
+                first.extend([len(orders)] * len(asset_orders))
+                asset_ix.extend([i] * len(asset_orders))
+                orders.extend(asset_orders)
+
+            if not orders:
+                continue
+
+            asset_ix = np.array(asset_ix, dtype=np.intp)
+            fill_prices, fill_amounts = \
+                self.slippage_models[asset_type].fill_market_orders(
+                    volumes[asset_ix],
+                    prices[asset_ix],
+                    {
+                        'amount': np.array([o.amount for o in orders]),
+                        'direction': np.array([o.direction for o in orders]),
+                        'open_amount': np.abs(
+                            np.array([o.open_amount for o in orders]),
+                        ),
+                        'first': np.array(first, dtype=np.intp),
+                    },
+                )
+            additional_commissions = \
+                self.commission_models[asset_type].calculate_fills(
+                    fill_amounts,
+                    fill_prices,
+                    np.array([o.filled for o in orders], dtype=np.float64),
+                    np.array(
+                        [o.commission for o in orders], dtype=np.float64,
+                    ),
+                )
+
+            dt = bar_data.current_dt
+            fill_prices = fill_prices.tolist()
+            fill_amounts = fill_amounts.tolist()
+            additional_commissions = additional_commissions.tolist()
+            for k, order in enumerate(orders):
+                if fill_amounts[k] == 0:
+                    continue
+                batch_fills[order.asset].append((
+                    order,
+                    create_transaction(
+                        order, dt, fill_prices[k], fill_amounts[k],
+                    ),
+                    additional_commissions[k],
+                ))
+
+        return batch_fills
+
     def prune_orders(self, closed_orders):
         """
         Removes all given orders from the blotter's open_orders list.
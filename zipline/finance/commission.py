@@ -15,6 +15,7 @@
 from abc import abstractmethod
 from collections import defaultdict
 
+import numpy as np
 from six import with_metaclass
 from toolz import merge
 
@@ -186,6 +187,36 @@ class PerShare(EquityCommissionModel):
             min_trade_cost=self.min_trade_cost,
         )
 
+    def calculate_fills(self, amounts, prices, filled, commissions):
+        """
+        Vectorized :meth:`calculate` for the fills of many orders.
+
+        Parameters
+        ----------
+        amounts, prices : np.ndarray[float]
+            The amount and price of each fill.
+        filled, commissions : np.ndarray[float]
+            The amount filled and commission paid so far by the order of each
+            fill.
+
+        Returns
+        -------
+        amounts_charged : np.ndarray[float]
+            The additional commission of each fill.
+        """
+        additional_commissions = np.abs(amounts * self.cost_per_share)
+        per_unit_totals = \
+            np.abs(filled * self.cost_per_share) + additional_commissions
+        return np.where(
+            commissions == 0,
+            np.maximum(self.min_trade_cost, additional_commissions),
+            np.where(
+                per_unit_totals < self.min_trade_cost,
+                0,
+                per_unit_totals - commissions,
+            ),
+        )
+
 
 class PerContract(FutureCommissionModel):
     """
@@ -318,6 +349,12 @@ class PerTrade(CommissionModel):
             # commission.
             return 0.0
 
+    def calculate_fills(self, amounts, prices, filled, commissions):
+        """
+        Vectorized :meth:`calculate`, see :meth:`PerShare.calculate_fills`.
+        """
+        return np.where(commissions == 0, self.cost, 0.0)
+
 
 class PerFutureTrade(PerContract):
     """
@@ -380,3 +417,9 @@ class PerDollar(EquityCommissionModel):
         """
         cost_per_share = transaction.price * self.cost_per_dollar
         return abs(transaction.amount) * cost_per_share
+
+    def calculate_fills(self, amounts, prices, filled, commissions):
+        """
+        Vectorized :meth:`calculate`, see :meth:`PerShare.calculate_fills`.
+        """
+        return np.abs(amounts) * (prices * self.cost_per_dollar)
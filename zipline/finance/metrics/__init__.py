@@ -36,6 +36,7 @@ from .metric import (
     ReturnsStatistic,
     SimpleLedgerField,
     StartOfPeriodLedgerField,
+    StreamingRiskMetrics,
     Transactions,
     _ConstantCumulativeRiskMetric,
     _ClassicRiskMetrics,
@@ -107,6 +108,19 @@ def default_metrics():
     }
 
 
+@register('streaming')
+def streaming_metrics():
+    """The default metrics, with the cumulative risk metrics computed
+    incrementally by :class:`StreamingRiskMetrics`.
+    """
+    metrics = {
+        metric for metric in default_metrics()
+        if not isinstance(metric, (ReturnsStatistic, AlphaBeta))
+    }
+    metrics.add(StreamingRiskMetrics())
+    return metrics
+
+
 @register('classic')
 @deprecated(
     'The original risk packet has been deprecated and will be removed in a '
@@ -464,6 +464,172 @@ class AlphaBeta(object):
     end_of_session = end_of_bar
 
 
+class _RiskMoments(object):
+    """Running moments of the daily returns and benchmark returns, updated
+    one session at a time.
+
+    Means and second moments are updated with Welford's algorithm. Returns
+    which are nan are skipped, like the nan-aware reductions of empyrical.
+    """
+    __slots__ = (
+        'count',
+        'mean',
+        'm2',
+        'downside_m2',
+        'wealth',
+        'peak',
+        'max_drawdown',
+        'pairs',
+        'pair_mean',
+        'benchmark_mean',
+        'benchmark_m2',
+        'comoment',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_m2 = 0.0
+        self.wealth = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self.pairs = 0
+        self.pair_mean = 0.0
+        self.benchmark_mean = 0.0
+        self.benchmark_m2 = 0.0
+        self.comoment = 0.0
+
+    def updated(self, algo_return, benchmark_return):
+        """A copy of these moments with one more session of returns.
+        """
+        new = _RiskMoments.__new__(_RiskMoments)
+        for name in self.__slots__:
+            setattr(new, name, getattr(self, name))
+
+        if np.isnan(algo_return):
+            return new
+
+        new.count += 1
+        delta = algo_return - new.mean
+        new.mean += delta / new.count
+        new.m2 += delta * (algo_return - new.mean)
+        if algo_return < 0:
+            new.downside_m2 += algo_return * algo_return
+
+        new.wealth *= 1 + algo_return
+        new.peak = max(new.peak, new.wealth)
+        new.max_drawdown = min(
+            new.max_drawdown,
+            (new.wealth - new.peak) / new.peak,
+        )
+
+        if not np.isnan(benchmark_return):
+            new.pairs += 1
+            delta_benchmark = benchmark_return - new.benchmark_mean
+            new.pair_mean += (algo_return - new.pair_mean) / new.pairs
+            new.benchmark_mean += delta_benchmark / new.pairs
+            new.benchmark_m2 += delta_benchmark * (
+                benchmark_return - new.benchmark_mean
+            )
+            new.comoment += delta_benchmark * (algo_return - new.pair_mean)
+
+        return new
+
+    def volatility(self):
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - 1) * 252)
+
+    def sharpe(self):
+        if self.count < 2:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(
+                self.mean,
+                np.sqrt(self.m2 / (self.count - 1)),
+            ) * np.sqrt(252)
+
+    def sortino(self):
+        if self.count < 2:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(
+                self.mean * 252,
+                np.sqrt(self.downside_m2 / self.count * 252),
+            )
+
+    def alpha_beta(self):
+        # empyrical treats a benchmark variance below 1e-30 as undefined
+        if self.pairs < 2 or self.benchmark_m2 / self.pairs < 1.0e-30:
+            return np.nan, np.nan
+        beta = self.comoment / self.benchmark_m2
+        with np.errstate(over='ignore', invalid='ignore'):
+            alpha = np.power(
+                self.pair_mean - beta * self.benchmark_mean + 1,
+                252,
+            ) - 1
+        return alpha, beta
+
+
+class StreamingRiskMetrics(object):
+    """Cumulative sharpe, sortino, volatility, max drawdown, alpha and beta
+    of the algorithm, updated in constant time per bar.
+
+    This reports the same fields as the ``ReturnsStatistic`` and
+    ``AlphaBeta`` metrics of the default metrics set. Those recompute the
+    empyrical functions over all the returns so far at every bar. The
+    results match empyrical up to floating point error.
+    """
+    def start_of_simulation(self,
+                            ledger,
+                            emission_rate,
+                            trading_calendar,
+                            sessions,
+                            benchmark_source):
+        self._benchmark_returns = benchmark_source.daily_returns(
+            sessions[0],
+            sessions[-1],
+        ).values
+        # The moments of the sessions before ``self._sessions_done``, whose
+        # returns are final.
+        self._moments = _RiskMoments()
+        self._sessions_done = 0
+
+    def end_of_bar(self,
+                   packet,
+                   ledger,
+                   dt,
+                   session_ix,
+                   data_portal):
+        returns = ledger.daily_returns_array
+        while self._sessions_done < session_ix:
+            self._moments = self._moments.updated(
+                returns[self._sessions_done],
+                self._benchmark_returns[self._sessions_done],
+            )
+            self._sessions_done += 1
+
+        # The returns of the current session change until it ends, so they
+        # are not folded into ``self._moments`` yet.
+        moments = self._moments.updated(
+            returns[session_ix],
+            self._benchmark_returns[session_ix],
+        )
+        alpha, beta = moments.alpha_beta()
+
+        risk = packet['cumulative_risk_metrics']
+        for field, value in (('algo_volatility', moments.volatility()),
+                             ('sharpe', moments.sharpe()),
+                             ('sortino', moments.sortino()),
+                             ('max_drawdown', moments.max_drawdown),
+                             ('alpha', alpha)):
+            risk[field] = value if np.isfinite(value) else None
+        risk['beta'] = None if np.isnan(beta) else beta
+
+    end_of_session = end_of_bar
+
+
 class MaxLeverage(object):
     """Tracks the maximum account leverage.
     """
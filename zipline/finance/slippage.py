@@ -80,6 +80,36 @@ def fill_price_worse_than_limit_price(fill_price, order):
     return False
 
 
+def filled_up_to(open_amounts, first, caps):
+    """
+    The amounts filled when the orders of each asset are filled in turn, as
+    much as possible, until a cap on the total filled for the asset is
+    reached.
+
+    Parameters
+    ----------
+    open_amounts : np.ndarray[int]
+        The absolute open amount of each order. The orders of an asset are
+        contiguous.
+    first : np.ndarray[intp]
+        The position of the first order of the asset of each order.
+    caps : np.ndarray[float]
+        The cap of the asset of each order.
+
+    Returns
+    -------
+    filled_before, filled_through : np.ndarray[float]
+        The total filled for the asset before and including each order.
+    """
+    filled_through = np.cumsum(open_amounts)
+    filled_before = filled_through - open_amounts
+    base = filled_before[first]
+    return (
+        np.minimum(filled_before - base, caps),
+        np.minimum(filled_through - base, caps),
+    )
+
+
 class SlippageModel(with_metaclass(FinancialModelMeta)):
     """
     Abstract base class for slippage models.
@@ -337,6 +367,44 @@ class VolumeShareSlippage(SlippageModel):
             math.copysign(cur_volume, order.direction)
         )
 
+    def fill_market_orders(self, volumes, prices, orders):
+        """
+        Vectorized :meth:`process_order` for the market orders of many assets
+        in a bar with volume and a close price.
+
+        Parameters
+        ----------
+        volumes, prices : np.ndarray[float]
+            The volume and close price of the asset of each order.
+        orders : dict[str -> np.ndarray]
+            The ``amount``, ``direction``, absolute ``open_amount`` and
+            ``first`` order of the asset of each order, see
+            :func:`filled_up_to`.
+
+        Returns
+        -------
+        fill_prices, fill_amounts : np.ndarray[float]
+            The price and signed amount of each fill, the amount being 0 for
+            orders which don't fill.
+        """
+        directions = orders['direction']
+        filled_before, filled_through = filled_up_to(
+            orders['open_amount'],
+            orders['first'],
+            np.floor(self.volume_limit * volumes),
+        )
+        volume_shares = np.minimum(
+            filled_through / volumes,
+            self.volume_limit,
+        )
+        simulated_impacts = volume_shares ** 2 \
+            * np.copysign(self.price_impact, directions) \
+            * prices
+        return (
+            prices + simulated_impacts,
+            np.copysign(filled_through - filled_before, directions),
+        )
+
 
 class FixedSlippage(SlippageModel):
     """
@@ -373,6 +441,16 @@ class FixedSlippage(SlippageModel):
             order.amount
         )
 
+    def fill_market_orders(self, volumes, prices, orders):
+        """
+        Vectorized :meth:`process_order`, see
+        :meth:`VolumeShareSlippage.fill_market_orders`.
+        """
+        return (
+            prices + (self.spread / 2.0 * orders['direction']),
+            orders['amount'],
+        )
+
 
 class MarketImpactBase(SlippageModel):
     """
@@ -674,3 +752,19 @@ class FixedBasisPointsSlippage(SlippageModel):
             price + price * (self.percentage * order.direction),
             shares_to_fill * order.direction
         )
+
+    def fill_market_orders(self, volumes, prices, orders):
+        """
+        Vectorized :meth:`process_order`, see
+        :meth:`VolumeShareSlippage.fill_market_orders`.
+        """
+        directions = orders['direction']
+        filled_before, filled_through = filled_up_to(
+            orders['open_amount'],
+            orders['first'],
+            np.floor(self.volume_limit * volumes),
+        )
+        return (
+            prices + prices * (self.percentage * directions),
+            (filled_through - filled_before) * directions,
+        )
@@ -13,6 +13,10 @@
 
 import alpaca_trade_api as tradeapi
 from zipline.gens.brokers.broker import Broker
+from zipline.gens.brokers.alpaca_stream import (AlpacaMarketDataStream,
+                                                DEFAULT_BAR_CAPACITY,
+                                                DEFAULT_DATA_STREAM_URL)
+from zipline.config.bundle import AlpacaConfig
 import zipline.protocol as zp
 from zipline.finance.order import (Order as ZPOrder,
                                    ORDER_STATUS as ZP_ORDER_STATUS)
@@ -36,6 +40,11 @@ if sys.version_info > (3,):
 log = Logger('Alpaca Broker')
 NY = 'America/New_York'
 
+_max_symbols_per_request = 200
+_max_orders_per_request = 500
+# orders are polled with an overlap, for clock differences with Alpaca
+_order_cursor_overlap = pd.Timedelta('1 min')
+
 
 class ALPACABroker(Broker):
     '''
@@ -44,33 +53,104 @@ class ALPACABroker(Broker):
     set via environment variables (APCA_API_KEY_ID and APCA_API_SECRET_KEY).
     Orders are identified by the UUID (v4) generated here and
     associated in the broker side using client_order_id attribute.
-    Currently this class makes use of REST API only, but websocket
-    streaming can possibly used too.
+    Orders and account data use the REST API. With stream_market_data (by
+    default the ``stream_market_data`` option of the alpaca config), the
+    market data of subscribed assets is streamed over a websocket and served
+    from memory: the recent minute bars and the last trade of every asset
+    are buffered by AlpacaMarketDataStream. While the stream is disconnected
+    the REST API is used instead.
+    The account and the positions are fetched once per minute bar and reused
+    until an order is placed, cancelled or filled.
     '''
 
-    def __init__(self):
+    def __init__(self, uri=None, stream_market_data=None):
         self._api = tradeapi.REST()
+        self._subscribed_assets = []
+        self._subscribed_symbols = set()
+
+        self._snapshot_bar = None
+        self._account_snapshot = None
+        self._positions_synced = False
+        self._filled_order_ids = set()
+        self._open_order_ids = set()
+
+        self._stream = None
+        conf = AlpacaConfig()
+        if stream_market_data is None:
+            stream_market_data = conf.stream_market_data
+        if stream_market_data:
+            self._stream = AlpacaMarketDataStream(
+                conf.key,
+                conf.secret,
+                url=conf.data_stream_url or DEFAULT_DATA_STREAM_URL,
+            )
+
+    def subscribe_to_market_data(self, assets):
+        if not isinstance(assets, (list, set, tuple, pd.Index)):
+            assets = [assets]
+        new_assets = [asset for asset in assets
+                      if asset.symbol not in self._subscribed_symbols]
+        if not new_assets:
+            return
 
-    def subscribe_to_market_data(self, asset):
-        '''Do nothing to comply the interface'''
-        pass
+        symbols = [asset.symbol for asset in new_assets]
+        self._subscribed_assets.extend(new_assets)
+        self._subscribed_symbols.update(symbols)
+        if self._stream is None:
+            return
+
+        log.info("Subscribing to market data for {}".format(symbols))
+        self._stream.start()
+        # the stream only delivers bars from now on. the buffers are seeded
+        # with the recent history once, when subscribing.
+        for i in range(0, len(symbols), _max_symbols_per_request):
+            chunk = symbols[i:i + _max_symbols_per_request]
+            self._stream.seed_bars(
+                self._api.get_barset(
+                    chunk, '1Min', limit=DEFAULT_BAR_CAPACITY,
+                ).df
+            )
+        self._stream.subscribe(symbols)
 
+    @property
     def subscribed_assets(self):
-        '''Do nothing to comply the interface'''
-        return []
-      
+        return self._subscribed_assets
+
     def set_metrics_tracker(self, metrics_tracker):
         self.metrics_tracker = metrics_tracker
 
+    def invalidate_snapshot(self):
+        """
+        Drop the account and positions snapshot, the next access fetches
+        them from Alpaca.
+        """
+        self._account_snapshot = None
+        self._positions_synced = False
+
+    def _check_snapshot(self):
+        # snapshots are only valid within the minute bar they were taken in
+        bar = pd.Timestamp.utcnow().floor('1 min')
+        if bar != self._snapshot_bar:
+            self._snapshot_bar = bar
+            self.invalidate_snapshot()
+
+    def _get_account(self):
+        self._check_snapshot()
+        if self._account_snapshot is None:
+            self._account_snapshot = self._api.get_account()
+        return self._account_snapshot
+
     @property
     def positions(self):
-        self._get_positions_from_broker()
+        self._check_snapshot()
+        if not self._positions_synced:
+            self._get_positions_from_broker()
+            self._positions_synced = True
         return self.metrics_tracker.positions
 
-
     @property
     def portfolio(self):
-        account = self._api.get_account()
+        account = self._get_account()
         z_portfolio = zp.Portfolio()
         z_portfolio.cash = float(account.cash)
         z_portfolio.positions = self.positions
@@ -81,7 +161,7 @@ class ALPACABroker(Broker):
 
     @property
     def account(self):
-        account = self._api.get_account()
+        account = self._get_account()
         z_account = zp.Account()
         z_account.buying_power = float(account.cash)
         z_account.total_position_value = float(
@@ -95,7 +175,9 @@ class ALPACABroker(Broker):
 
     def is_alive(self):
         try:
-            self._api.get_account()
+            # the heartbeat refreshes the account snapshot
+            self._check_snapshot()
+            self._account_snapshot = self._api.get_account()
             return True
         except BaseException:
             return False
@@ -161,6 +243,7 @@ class ALPACABroker(Broker):
             stop_price=stop_price,
             client_order_id=zp_order.id,
         )
+        self.invalidate_snapshot()
         zp_order = self._order2zp(order)
         return zp_order
 
@@ -174,6 +257,25 @@ class ALPACABroker(Broker):
                 continue
         return orders
 
+    @staticmethod
+    def _order2tx(order):
+        return Transaction(
+            asset=symbol_lookup(order.symbol),
+            amount=int(order.filled_qty),
+            dt=order.filled_at,
+            price=float(order.filled_avg_price),
+            order_id=order.client_order_id)
+
+    @staticmethod
+    def _is_open(order):
+        return not (order.filled_at or order.canceled_at or order.failed_at)
+
+    def _record_fills(self, transactions):
+        # fills change the cash and the positions
+        if not self._filled_order_ids.issuperset(transactions):
+            self._filled_order_ids.update(transactions)
+            self.invalidate_snapshot()
+
     @property
     def transactions(self):
         orders = self._api.list_orders(status='closed')
@@ -181,56 +283,190 @@ class ALPACABroker(Broker):
         for order in orders:
             if order.filled_at is None:
                 continue
-            tx = Transaction(
-                asset=symbol_lookup(order.symbol),
-                amount=int(order.filled_qty),
-                dt=order.filled_at,
-                price=float(order.filled_avg_price),
-                order_id=order.client_order_id)
-            results[order.client_order_id] = tx
+            results[order.client_order_id] = self._order2tx(order)
+
+        self._record_fills(results)
         return results
 
+    def _list_orders(self, status, after=None):
+        """
+        List the orders with ``status`` submitted after ``after``, following
+        the pages of at most ``_max_orders_per_request`` orders.
+        """
+        orders = {}
+        while True:
+            kwargs = {}
+            if after is not None:
+                kwargs['after'] = after.isoformat()
+            page = self._api.list_orders(status=status,
+                                         limit=_max_orders_per_request,
+                                         direction='asc',
+                                         **kwargs)
+            new_orders = [o for o in page if o.id not in orders]
+            orders.update((o.id, o) for o in new_orders)
+            if len(page) < _max_orders_per_request or not new_orders:
+                return list(orders.values())
+            # the next page starts with the orders submitted at the same time
+            # as the last one, which may not all fit in this page
+            after = pd.Timestamp(page[-1].submitted_at) - \
+                pd.Timedelta('1us')
+
+    def get_order_updates(self, cursor=None):
+        """
+        Get the orders submitted since ``cursor`` and the orders which were
+        open at the previous call. A call costs two paged list requests plus
+        one request per order that closed since the previous call.
+        """
+        now = pd.Timestamp.utcnow()
+        if cursor is None:
+            # the live blotter only tracks today's orders
+            cursor = now.normalize()
+
+        changed = {}
+        for order in self._list_orders('all', after=cursor):
+            changed[order.id] = order
+        open_orders = self._list_orders('open')
+        for order in open_orders:
+            changed[order.id] = order
+
+        # orders which closed since the previous call
+        for order_id in self._open_order_ids.difference(changed):
+            changed[order_id] = self._api.get_order(order_id)
+
+        self._open_order_ids = {order.id for order in open_orders}
+        self._open_order_ids.update(
+            order.id for order in changed.values() if self._is_open(order)
+        )
+
+        orders = []
+        transactions = {}
+        for order in changed.values():
+            try:
+                orders.append(self._order2zp(order))
+            except SymbolNotFound:
+                continue
+            if order.filled_at is not None:
+                transactions[order.client_order_id] = self._order2tx(order)
+
+        self._record_fills(transactions)
+        return orders, transactions, now - _order_cursor_overlap
+
     def cancel_order(self, zp_order_id):
         try:
             order = self._api.get_order_by_client_order_id(zp_order_id)
             self._api.cancel_order(order.id)
+            self.invalidate_snapshot()
         except Exception as e:
             log.error(e)
             return
 
+    def _streaming(self, assets):
+        """
+        Whether the market data of ``assets`` is served from the stream,
+        subscribing to it if needed.
+        """
+        if self._stream is None:
+            return False
+        self.subscribe_to_market_data(assets)
+        # the buffers miss what happened while the stream was down
+        return not self._stream.is_stale
+
     def get_last_traded_dt(self, asset):
+        if self._streaming(asset):
+            return self._get_streamed_spot_value(asset.symbol, 'last_traded')
+
         quote = self._api.get_quote(asset.symbol)
         return pd.Timestamp(quote.last_timestamp)
 
+    def _get_streamed_spot_value(self, symbol, field):
+        if field in ('price', 'last_traded'):
+            last_trade = self._stream.last_trade(symbol)
+            if last_trade is None:
+                # no trade seen since subscribing. use the last known bar
+                bar = self._stream.last_bar(symbol)
+                if bar is None:
+                    return pd.NaT if field == 'last_traded' else np.nan
+                last_trade = (bar['close'], bar.name)
+            price, dt = last_trade
+            return price if field == 'price' else dt
+
+        bar = self._stream.last_bar(symbol)
+        if bar is None:
+            return np.nan
+        return float(bar[field])
+
+    def _get_last_bars(self, symbols):
+        """
+        Get the latest minute bar of every symbol with one request per
+        _max_symbols_per_request symbols.
+
+        Returns
+        -------
+        last_bars : dict[str -> pd.Series]
+            The latest bar of every symbol that has one, named by its time.
+        """
+        last_bars = {}
+        for i in range(0, len(symbols), _max_symbols_per_request):
+            df = self._api.get_barset(
+                symbols[i:i + _max_symbols_per_request], '1Min', limit=1,
+            ).df
+            if df.empty:
+                continue
+            for symbol in df.columns.get_level_values(0).unique():
+                bars = df[symbol].dropna(how='all')
+                if not bars.empty:
+                    last_bars[symbol] = bars.iloc[-1]
+        return last_bars
+
+    def _get_last_trade_price(self, symbol):
+        try:
+            return self._api.get_last_trade(symbol).price
+        except Exception:
+            return np.nan
+
     def get_spot_value(self, assets, field, dt, data_frequency):
         assert(field in (
             'open', 'high', 'low', 'close', 'volume', 'price', 'last_traded'))
         assets_is_scalar = not isinstance(assets, (list, set, tuple))
-        if assets_is_scalar:
-            symbols = [assets.symbol]
-        else:
-            symbols = [asset.symbol for asset in assets]
-        if field in ('price', 'last_traded'):
-            try:
-                last_trade = self._api.get_last_trade(symbols[0])
-                return last_trade.price
-            except:
-                return np.nan
+        if not assets_is_scalar:
+            return self.get_spot_values(list(assets), field, dt,
+                                        data_frequency)
 
-        bars = self._api.get_barset(symbols, '1Min', limit=1).df
-        if bars.empty:
-            return np.nan
-        if not np.isnan(bars[assets.symbol][field]).all():
-            return float(bars[assets.symbol][field])
-        # if assets_is_scalar:
-        #     if len(bars_list) == 0:
-        #         return np.nan
-        #     return bars_list[0].bars[-1]._raw[field]
-        # bars_map = {a.symbol: a for a in bars_list}
-        # return [
-        #     bars_map[symbol].bars[-1]._raw[field]
-        #     for symbol in symbols
-        # ]
+        if self._streaming(assets):
+            return self._get_streamed_spot_value(assets.symbol, field)
+
+        if field == 'price':
+            return self._get_last_trade_price(assets.symbol)
+
+        return self.get_spot_values([assets], field, dt, data_frequency)[0]
+
+    def get_spot_values(self, assets, field, dt, data_frequency):
+        """
+        Get the spot values of ``field`` for a list of assets with one
+        buffer lookup when streaming, or else one multi-symbol bars request
+        (per 200 symbols). Without streaming, 'price' is the last trade of
+        each asset, which the API only serves one symbol at a time.
+        """
+        symbols = [asset.symbol for asset in assets]
+
+        if self._streaming(assets):
+            return [self._get_streamed_spot_value(symbol, field)
+                    for symbol in symbols]
+
+        if field == 'price':
+            return [self._get_last_trade_price(symbol) for symbol in symbols]
+
+        last_bars = self._get_last_bars(symbols)
+        values = []
+        for symbol in symbols:
+            bar = last_bars.get(symbol)
+            if bar is None:
+                values.append(pd.NaT if field == 'last_traded' else np.nan)
+            elif field == 'last_traded':
+                values.append(bar.name)
+            else:
+                values.append(float(bar[field]))
+        return values
 
     def _get_positions_from_broker(self):
         """
@@ -239,11 +475,11 @@ class ALPACABroker(Broker):
         """
         cur_pos_in_tracker = self.metrics_tracker.positions
         positions = self._api.list_positions()
+        held = []
         for ap_position in positions:
             # ap_position = positions[symbol]
             try:
-                z_position = zp.Position(zp.InnerPosition(symbol_lookup(ap_position.symbol)))
-                editable_position = zp.MutableView(z_position)
+                asset = symbol_lookup(ap_position.symbol)
             except SymbolNotFound:
                 # The symbol might not have been ingested to the db therefore
                 # it needs to be skipped.
@@ -251,10 +487,21 @@ class ALPACABroker(Broker):
                 continue
             if int(ap_position.qty) == 0:
                 continue
+            held.append((asset, ap_position))
+
+        # one lookup for the last trade times of all positions
+        last_sale_dates = self.get_spot_values(
+            [asset for asset, _ in held], 'last_traded', None, 'minute',
+        ) if held else []
+
+        for (asset, ap_position), last_sale_date in zip(held,
+                                                        last_sale_dates):
+            z_position = zp.Position(zp.InnerPosition(asset))
+            editable_position = zp.MutableView(z_position)
             editable_position._underlying_position.amount = int(ap_position.qty)
             editable_position._underlying_position.cost_basis = float(ap_position.avg_entry_price)
             editable_position._underlying_position.last_sale_price = float(ap_position.current_price)
-            editable_position._underlying_position.last_sale_date = self._api.get_last_trade(ap_position.symbol).timestamp
+            editable_position._underlying_position.last_sale_date = last_sale_date
             
             self.metrics_tracker.update_position(z_position.asset,
                                                  amount=z_position.amount,
@@ -277,15 +524,20 @@ class ALPACABroker(Broker):
         self.metrics_tracker._ledger._portfolio.positions = self.metrics_tracker.positions                                                 
 
     def get_realtime_bars(self, assets, data_frequency):
-        # TODO: cache the result. The caller
-        # (DataPortalLive#get_history_window) makes use of only one
-        # column at a time.
         assets_is_scalar = not isinstance(assets, (list, set, tuple, pd.Index))
         is_daily = 'd' in data_frequency  # 'daily' or '1d'
         if assets_is_scalar:
             symbols = [assets.symbol]
         else:
             symbols = [asset.symbol for asset in assets]
+
+        if not is_daily and self._streaming(assets):
+            # minute bars are served from the stream's buffers
+            df = self._stream.bars(symbols)
+            if df.empty:
+                return df
+            return df.between_time("09:30", "16:00")
+
         timeframe = '1D' if is_daily else '1Min'
         df = self._api.get_barset(symbols, timeframe, limit=500).df
         if not is_daily:
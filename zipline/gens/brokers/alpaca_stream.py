@@ -0,0 +1,363 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import websockets
+from logbook import Logger
+
+log = Logger('Alpaca Market Data')
+
+NY = 'America/New_York'
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+DEFAULT_DATA_STREAM_URL = 'wss://stream.data.alpaca.markets/v2/iex'
+DEFAULT_BAR_CAPACITY = 500
+_reconnect_wait = 3  # Seconds
+_max_reconnect_wait = 60  # Seconds
+
+
+class BarRingBuffer(object):
+    """
+    Fixed capacity buffer holding the most recent minute bars of one symbol.
+
+    Appending is O(1). Once the buffer is full the oldest bar is overwritten.
+    A bar with the same start time as the newest bar replaces it (Alpaca
+    sends corrected bars), bars older than the newest bar are dropped.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of bars to keep.
+    """
+    def __init__(self, capacity=DEFAULT_BAR_CAPACITY):
+        self._capacity = capacity
+        self._dts = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, len(OHLCV)), np.nan)
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self._capacity)
+
+    def append(self, dt, open, high, low, close, volume):
+        dt = pd.Timestamp(dt).value
+        if self._count:
+            last = (self._count - 1) % self._capacity
+            if dt < self._dts[last]:
+                return
+            if dt == self._dts[last]:
+                self._values[last] = open, high, low, close, volume
+                return
+
+        ix = self._count % self._capacity
+        self._dts[ix] = dt
+        self._values[ix] = open, high, low, close, volume
+        self._count += 1
+
+    def last(self):
+        """
+        Returns
+        -------
+        bar : pd.Series or None
+            The newest bar, named by its start time. None if the buffer is
+            empty.
+        """
+        if not self._count:
+            return None
+        last = (self._count - 1) % self._capacity
+        return pd.Series(
+            self._values[last],
+            index=OHLCV,
+            name=pd.Timestamp(self._dts[last], tz='UTC'),
+        )
+
+    def to_frame(self):
+        """
+        Returns
+        -------
+        bars : pd.DataFrame
+            The buffered bars from oldest to newest, indexed by their start
+            time in New York time (the layout of ``REST.get_barset().df``).
+        """
+        if self._count <= self._capacity:
+            order = np.arange(self._count)
+        else:
+            start = self._count % self._capacity
+            order = np.roll(np.arange(self._capacity), -start)
+        return pd.DataFrame(
+            self._values[order],
+            index=pd.DatetimeIndex(self._dts[order], tz='UTC').tz_convert(NY),
+            columns=OHLCV,
+        )
+
+
+class AlpacaMarketDataStream(object):
+    """
+    Consumer of Alpaca's real-time market data websocket.
+
+    The stream runs on a background thread and keeps a ring buffer of the
+    recent minute bars and the last trade of every subscribed symbol, so
+    spot values and recent bars can be served without any network I/O.
+    The connection is re-established (and the symbols re-subscribed) if it
+    drops or fails, with an exponential backoff. While it is down the
+    buffers are stale: they miss the bars and trades of that time.
+
+    Parameters
+    ----------
+    key_id : str
+        The Alpaca API key.
+    secret_key : str
+        The Alpaca API secret.
+    url : str, optional
+        The market data stream endpoint.
+    bar_capacity : int, optional
+        The number of minute bars to keep per symbol.
+    """
+    def __init__(self,
+                 key_id,
+                 secret_key,
+                 url=DEFAULT_DATA_STREAM_URL,
+                 bar_capacity=DEFAULT_BAR_CAPACITY):
+        self._key_id = key_id
+        self._secret_key = secret_key
+        self._url = url
+        self._bar_capacity = bar_capacity
+
+        self._lock = threading.Lock()
+        self._symbols = set()
+        self._bars = {}
+        self._last_trades = {}
+
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._authenticated = False
+        self._stopped = False
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_stale(self):
+        """
+        Whether the buffers may be behind the market, i.e. the stream is not
+        connected and subscribed.
+        """
+        with self._lock:
+            return not self._authenticated
+
+    @property
+    def symbols(self):
+        with self._lock:
+            return set(self._symbols)
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stopped = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_forever,
+            name='alpaca-market-data',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stopped = True
+        if self._ws is not None and self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def subscribe(self, symbols):
+        """
+        Subscribe to the minute bars and trades of ``symbols``.
+        """
+        with self._lock:
+            new_symbols = [s for s in symbols if s not in self._symbols]
+            for symbol in new_symbols:
+                self._symbols.add(symbol)
+                self._bars.setdefault(
+                    symbol, BarRingBuffer(self._bar_capacity),
+                )
+            authenticated = self._authenticated
+
+        # before authentication all symbols are subscribed at once
+        if new_symbols and authenticated:
+            asyncio.run_coroutine_threadsafe(
+                self._send_subscribe(new_symbols), self._loop,
+            )
+
+    def seed_bars(self, bars):
+        """
+        Fill the buffers with already known bars, e.g. fetched via REST when
+        subscribing.
+
+        Parameters
+        ----------
+        bars : pd.DataFrame
+            Bars in the layout of ``REST.get_barset().df``: symbols as level
+            0 of the columns and the OHLCV fields as level 1.
+        """
+        if bars.empty:
+            return
+        for symbol in bars.columns.get_level_values(0).unique():
+            frame = bars[symbol].dropna(how='all')
+            with self._lock:
+                buf = self._bars.setdefault(
+                    symbol, BarRingBuffer(self._bar_capacity),
+                )
+                for dt, row in zip(frame.index,
+                                   frame[list(OHLCV)].values):
+                    buf.append(dt, *row)
+
+    def set_last_trade(self, symbol, price, dt):
+        with self._lock:
+            self._update_last_trade(symbol, price, pd.Timestamp(dt))
+
+    def last_trade(self, symbol):
+        """
+        Returns
+        -------
+        last_trade : tuple (float, pd.Timestamp) or None
+            The price and time of the last trade seen for ``symbol``.
+        """
+        with self._lock:
+            return self._last_trades.get(symbol)
+
+    def last_bar(self, symbol):
+        """
+        Returns
+        -------
+        bar : pd.Series or None
+            The newest minute bar of ``symbol``.
+        """
+        with self._lock:
+            buf = self._bars.get(symbol)
+            return buf.last() if buf is not None else None
+
+    def has_bars(self, symbol):
+        with self._lock:
+            return bool(self._bars.get(symbol))
+
+    def bars(self, symbols):
+        """
+        Returns
+        -------
+        bars : pd.DataFrame
+            The buffered minute bars of ``symbols`` in the layout of
+            ``REST.get_barset().df``.
+        """
+        with self._lock:
+            frames = {
+                symbol: self._bars[symbol].to_frame()
+                for symbol in symbols if symbol in self._bars
+            }
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._run())
+
+    async def _run(self):
+        wait = _reconnect_wait
+        while not self._stopped:
+            try:
+                await self._consume()
+            except (websockets.ConnectionClosed, OSError) as e:
+                log.warning('market data stream disconnected: {}'.format(e))
+            except Exception as e:
+                # e.g. a rejected handshake. the thread must survive anything
+                log.error('market data stream failed: {!r}'.format(e))
+            finally:
+                self._ws = None
+                with self._lock:
+                    connected = self._authenticated
+                    self._authenticated = False
+            if self._stopped:
+                break
+            if connected:
+                wait = _reconnect_wait
+            await asyncio.sleep(wait)
+            wait = min(2 * wait, _max_reconnect_wait)
+
+    async def _consume(self):
+        async with websockets.connect(self._url) as ws:
+            self._ws = ws
+            await ws.send(json.dumps({
+                'action': 'auth',
+                'key': self._key_id,
+                'secret': self._secret_key,
+            }))
+            async for raw in ws:
+                try:
+                    messages = json.loads(raw)
+                except ValueError:
+                    log.error('invalid market data message: {!r}'.format(raw))
+                    continue
+                for msg in messages:
+                    try:
+                        await self._handle_message(msg)
+                    except (AttributeError, KeyError, TypeError,
+                            ValueError) as e:
+                        log.error('invalid market data message {!r}: '
+                                  '{!r}'.format(msg, e))
+
+    async def _handle_message(self, msg):
+        kind = msg.get('T')
+        if kind == 'b':
+            self._on_bar(msg)
+        elif kind == 't':
+            self._on_trade(msg)
+        elif kind == 'success' and msg.get('msg') == 'authenticated':
+            with self._lock:
+                self._authenticated = True
+                symbols = sorted(self._symbols)
+            if symbols:
+                await self._send_subscribe(symbols)
+        elif kind == 'error':
+            log.error('market data stream error {}: {}'.format(
+                msg.get('code'), msg.get('msg')))
+
+    async def _send_subscribe(self, symbols):
+        if self._ws is None:
+            # disconnected. all the symbols are subscribed on reconnection
+            return
+        await self._ws.send(json.dumps({
+            'action': 'subscribe',
+            'bars': list(symbols),
+            'trades': list(symbols),
+        }))
+
+    def _on_bar(self, msg):
+        with self._lock:
+            buf = self._bars.get(msg['S'])
+            if buf is not None:
+                buf.append(msg['t'], msg['o'], msg['h'], msg['l'], msg['c'],
+                           msg['v'])
+
+    def _on_trade(self, msg):
+        with self._lock:
+            self._update_last_trade(msg['S'], msg['p'], pd.Timestamp(msg['t']))
+
+    def _update_last_trade(self, symbol, price, dt):
+        last = self._last_trades.get(symbol)
+        if last is None or dt >= last[1]:
+            self._last_trades[symbol] = (float(price), dt)
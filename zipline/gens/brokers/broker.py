@@ -67,6 +67,31 @@ class Broker(object):
     def cancel_order(self, order_param):
         pass
 
+    def get_order_updates(self, cursor=None):
+        """
+        Get the orders which changed and the transactions which happened
+        since the previous call.
+
+        Brokers which can query the changes incrementally should override
+        this. By default all orders and transactions are returned and the
+        caller skips the ones it already processed.
+
+        Parameters
+        ----------
+        cursor : object, optional
+            The cursor returned by the previous call. None on the first call.
+
+        Returns
+        -------
+        orders : list[zipline.finance.order.Order]
+            The orders which changed.
+        transactions : dict
+            The transactions, keyed by a broker specific unique id.
+        cursor : object
+            The cursor to pass to the next call.
+        """
+        return list(self.orders.values()), self.transactions, cursor
+
     @abstractmethod
     def get_last_traded_dt(self, asset):
         pass
@@ -75,6 +100,21 @@ class Broker(object):
     def get_spot_value(self, assets, field, dt, data_frequency):
         pass
 
+    def get_spot_values(self, assets, field, dt, data_frequency):
+        """
+        Get the spot values of ``field`` for a list of assets.
+
+        Brokers which can answer the whole list with a single request should
+        override this. By default every asset is looked up on its own.
+
+        Returns
+        -------
+        values : list
+            The spot values, aligned with ``assets``.
+        """
+        return [self.get_spot_value(asset, field, dt, data_frequency)
+                for asset in assets]
+
     @abstractmethod
     def get_realtime_bars(self, assets, frequency):
         pass
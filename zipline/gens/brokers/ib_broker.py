@@ -97,6 +97,176 @@ def _method_params_to_dict(args):
             if k != 'self'}
 
 
+_ns_per_minute = 60 * 10 ** 9
+
+
+class TickBuffer(object):
+    """
+    Columnar store of the RTVolume ticks of one symbol.
+
+    The ticks are written into preallocated arrays which double their
+    capacity when full, so appending a tick is amortized O(1). The 1-minute
+    OHLCV bars are aggregated as the ticks arrive, so the bar of the current
+    minute and the realtime bars are read from the aggregated arrays instead
+    of resampling the ticks.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The initial number of ticks (and minute bars) to allocate for.
+    """
+    tick_fields = (('time', 'int64'),
+                   ('last_trade_price', 'float64'),
+                   ('last_trade_size', 'int64'),
+                   ('total_volume', 'int64'),
+                   ('vwap', 'float64'),
+                   ('single_trade_flag', 'bool'))
+
+    def __init__(self, capacity=1024):
+        self._count = 0
+        self._ticks = {name: np.empty(capacity, dtype=dtype)
+                       for name, dtype in self.tick_fields}
+
+        self._minute_count = 0
+        self._minutes = np.empty(capacity, dtype='int64')
+        # open, high, low, close
+        self._ohlc = np.empty((capacity, 4), dtype='float64')
+        self._volumes = np.empty(capacity, dtype='int64')
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def empty(self):
+        return not self._count
+
+    @staticmethod
+    def _grown(array):
+        grown = np.empty((2 * len(array),) + array.shape[1:],
+                         dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def append(self, last_trade_time, last_trade_price, last_trade_size,
+               total_volume, vwap, single_trade_flag):
+        if self._count == len(self._ticks['time']):
+            self._ticks = {name: self._grown(array)
+                           for name, array in iteritems(self._ticks)}
+
+        time = pd.Timestamp(last_trade_time).value
+        i = self._count
+        self._ticks['time'][i] = time
+        self._ticks['last_trade_price'][i] = last_trade_price
+        self._ticks['last_trade_size'][i] = last_trade_size
+        self._ticks['total_volume'][i] = total_volume
+        self._ticks['vwap'][i] = vwap
+        self._ticks['single_trade_flag'][i] = \
+            single_trade_flag in (True, 'true')
+        self._count = i + 1
+
+        self._aggregate(time - time % _ns_per_minute,
+                        last_trade_price,
+                        last_trade_size)
+
+    def _aggregate(self, minute, price, size):
+        n = self._minute_count
+        if n and minute == self._minutes[n - 1]:
+            # the common case: a tick of the current minute
+            ohlc = self._ohlc[n - 1]
+            ohlc[1] = max(ohlc[1], price)
+            ohlc[2] = min(ohlc[2], price)
+            ohlc[3] = price
+            self._volumes[n - 1] += size
+            return
+
+        if n and minute < self._minutes[n - 1]:
+            # a late tick of an earlier minute
+            i = np.searchsorted(self._minutes[:n], minute)
+            if self._minutes[i] == minute:
+                ohlc = self._ohlc[i]
+                ohlc[1] = max(ohlc[1], price)
+                ohlc[2] = min(ohlc[2], price)
+                self._volumes[i] += size
+                return
+        else:
+            i = n
+
+        if n == len(self._minutes):
+            self._minutes = self._grown(self._minutes)
+            self._ohlc = self._grown(self._ohlc)
+            self._volumes = self._grown(self._volumes)
+
+        if i < n:
+            self._minutes[i + 1:n + 1] = self._minutes[i:n]
+            self._ohlc[i + 1:n + 1] = self._ohlc[i:n]
+            self._volumes[i + 1:n + 1] = self._volumes[i:n]
+        self._minutes[i] = minute
+        self._ohlc[i] = price
+        self._volumes[i] = size
+        self._minute_count = n + 1
+
+    @property
+    def last_trade_price(self):
+        if not self._count:
+            return np.nan
+        return self._ticks['last_trade_price'][self._count - 1]
+
+    @property
+    def last_trade_time(self):
+        if not self._count:
+            return pd.NaT
+        return pd.Timestamp(self._ticks['time'][self._count - 1], tz='UTC')
+
+    def last_minute_bar(self):
+        """
+        Returns
+        -------
+        bar : dict or None
+            The OHLCV of the newest minute with trades, None if there were no
+            trades yet.
+        """
+        n = self._minute_count
+        if not n:
+            return None
+        open_, high, low, close = self._ohlc[n - 1]
+        return {'open': open_,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': self._volumes[n - 1]}
+
+    def minute_bars(self):
+        """
+        Returns
+        -------
+        bars : pd.DataFrame
+            The OHLCV of every minute with trades, indexed by the start of the
+            minute in UTC.
+        """
+        n = self._minute_count
+        bars = pd.DataFrame(
+            self._ohlc[:n],
+            index=pd.DatetimeIndex(self._minutes[:n], tz='UTC'),
+            columns=['open', 'high', 'low', 'close'],
+        )
+        bars['volume'] = self._volumes[:n]
+        return bars
+
+    def to_frame(self):
+        """
+        Returns
+        -------
+        ticks : pd.DataFrame
+            The ticks indexed by their time.
+        """
+        n = self._count
+        return pd.DataFrame(
+            {name: self._ticks[name][:n]
+             for name, _ in self.tick_fields[1:]},
+            index=pd.DatetimeIndex(self._ticks['time'][:n], tz='UTC'),
+        )
+
+
 class TWSConnection(EClientSocket, EWrapper):
     def __init__(self, tws_uri):
         """
@@ -121,6 +291,7 @@ class TWSConnection(EClientSocket, EWrapper):
         self.symbol_to_ticker_id = {}
         self.ticker_id_to_symbol = {}
         self.last_tick = defaultdict(dict)
+        # symbol -> TickBuffer
         self.bars = {}
         # accounts structure: accounts[account_id][currency][value]
         self.accounts = defaultdict(
@@ -253,17 +424,12 @@ class TWSConnection(EClientSocket, EWrapper):
 
     def _add_bar(self, symbol, last_trade_price, last_trade_size,
                  last_trade_time, total_volume, vwap, single_trade_flag):
-        bar = pd.DataFrame(index=pd.DatetimeIndex([last_trade_time]),
-                           data={'last_trade_price':  last_trade_price,
-                                 'last_trade_size':   last_trade_size,
-                                 'total_volume':      total_volume,
-                                 'vwap':              vwap,
-                                 'single_trade_flag': single_trade_flag})
-
-        if symbol not in self.bars:
-            self.bars[symbol] = bar
-        else:
-            self.bars[symbol] = self.bars[symbol].append(bar)
+        try:
+            ticks = self.bars[symbol]
+        except KeyError:
+            ticks = self.bars[symbol] = TickBuffer()
+        ticks.append(last_trade_time, last_trade_price, last_trade_size,
+                     total_volume, vwap, single_trade_flag)
 
     def tickPrice(self, ticker_id, field, price, can_auto_execute):
         self._process_tick(ticker_id, tick_type=field, value=price)
@@ -574,11 +740,11 @@ class IBBroker(Broker):
             editable_position._underlying_position.amount = int(ib_position.position)
             editable_position._underlying_position.cost_basis = float(ib_position.average_cost)
             # Check if symbol exists in bars df
-            if symbol in self._tws.bars:
+            if symbol in self._tws.bars and not self._tws.bars[symbol].empty:
                 editable_position._underlying_position.last_sale_price = \
-                    float(self._tws.bars[symbol].last_trade_price.iloc[-1])
+                    float(self._tws.bars[symbol].last_trade_price)
                 editable_position._underlying_position.last_sale_date = \
-                    self._tws.bars[symbol].index.values[-1]
+                    self._tws.bars[symbol].last_trade_time
             else:
                 # editable_position._underlying_position.last_sale_price = None  # this cannot be set to None. only numbers.
                 editable_position._underlying_position.last_sale_date = None
@@ -966,65 +1132,51 @@ class IBBroker(Broker):
 
         self.subscribe_to_market_data(assets)
 
-        bars = self._tws.bars[symbol]
+        ticks = self._tws.bars[symbol]
 
-        last_event_time = bars.index[-1]
-
-        minute_start = (last_event_time - pd.Timedelta('1 min')) \
-            .time()
-        minute_end = last_event_time.time()
-
-        if bars.empty:
+        if ticks.empty:
             return pd.NaT if field == 'last_traded' else np.NaN
-        else:
-            if field == 'price':
-                return bars.last_trade_price.iloc[-1]
-            elif field == 'last_traded':
-                return last_event_time or pd.NaT
-
-            minute_df = bars.between_time(minute_start, minute_end,
-                                          include_start=True, include_end=True)
-            if minute_df.empty:
-                return np.NaN
-            else:
-                if field == 'open':
-                    return minute_df.last_trade_price.iloc[0]
-                elif field == 'close':
-                    return minute_df.last_trade_price.iloc[-1]
-                elif field == 'high':
-                    return minute_df.last_trade_price.max()
-                elif field == 'low':
-                    return minute_df.last_trade_price.min()
-                elif field == 'volume':
-                    return minute_df.last_trade_size.sum()
+        elif field == 'price':
+            return ticks.last_trade_price
+        elif field == 'last_traded':
+            return ticks.last_trade_time
+
+        # OHLCV of the minute of the last trade
+        return ticks.last_minute_bar()[field]
 
     def get_last_traded_dt(self, asset):
         self.subscribe_to_market_data(asset)
 
-        return self._tws.bars[asset.symbol].index[-1]
+        return self._tws.bars[asset.symbol].last_trade_time
 
     def get_realtime_bars(self, assets, frequency):
-        if frequency == '1m':
-            resample_freq = '1 Min'
-        elif frequency == '1d':
-            resample_freq = '24 H'
-        else:
+        if frequency not in ('1m', '1d'):
             raise ValueError("Invalid frequency specified: %s" % frequency)
 
-        df = pd.DataFrame()
+        frames = {}
         for asset in assets:
             symbol = str(asset.symbol)
             self.subscribe_to_market_data(asset)
 
-            trade_prices = self._tws.bars[symbol]['last_trade_price']
-            trade_sizes = self._tws.bars[symbol]['last_trade_size']
-            ohlcv = trade_prices.resample(resample_freq).ohlc()
-            ohlcv['volume'] = trade_sizes.resample(resample_freq).sum()
-
-            # Add asset as level 0 column; ohlcv will be used as level 1 cols
-            ohlcv.columns = pd.MultiIndex.from_product([[symbol, ],
-                                                        ohlcv.columns])
-
-            df = pd.concat([df, ohlcv], axis=1)
-
+            # the minute bars are aggregated as the ticks arrive
+            ohlcv = self._tws.bars[symbol].minute_bars()
+            if frequency == '1d':
+                ohlcv = ohlcv.resample('24 H').agg(OrderedDict([
+                    ('open', 'first'),
+                    ('high', 'max'),
+                    ('low', 'min'),
+                    ('close', 'last'),
+                    ('volume', 'sum'),
+                ]))
+            frames[symbol] = ohlcv
+
+        if not frames:
+            return pd.DataFrame()
+
+        # Asset as level 0 column; ohlcv will be used as level 1 cols
+        df = pd.concat(frames, axis=1)
+        if frequency == '1m' and len(df):
+            # minutes without trades are NaN rows
+            df = df.reindex(pd.date_range(df.index[0], df.index[-1],
+                                          freq='1 Min'))
         return df
@@ -13,6 +13,7 @@
 from time import sleep
 
 from logbook import Logger
+import numpy as np
 import pandas as pd
 
 from zipline.gens.sim_engine import (
@@ -26,6 +27,17 @@ from zipline.gens.sim_engine import (
 log = Logger('Realtime Clock')
 
 
+DEFAULT_HEARTBEAT_INTERVAL = pd.Timedelta('1 min')
+_one_minute = pd.Timedelta('1 min')
+
+
+def _to_utc(dts):
+    dts = pd.DatetimeIndex(dts)
+    if dts.tz is None:
+        return dts.tz_localize('UTC')
+    return dts.tz_convert('UTC')
+
+
 class RealtimeClock(object):
     """
     Realtime clock for live trading.
@@ -37,8 +49,17 @@ class RealtimeClock(object):
     MinuteSimulationClock yields a new event on every iteration (regardless of
     wall clock).
 
+    The minute schedule of a session is computed once when the session starts
+    and the clock sleeps until the next minute boundary instead of polling the
+    wall clock. If the algorithm falls behind, the minutes which already
+    passed are skipped and the current one is emitted.
+
     The :param:`time_skew` parameter represents the time difference between
     the Broker and the live trading machine's clock.
+
+    The :param:`heartbeat_interval` parameter is the (wall clock) interval in
+    which :param:`is_broker_alive` is checked while the clock runs. If the
+    broker is not alive, the clock moves on to the next session.
     """
 
     def __init__(self,
@@ -50,24 +71,117 @@ class RealtimeClock(object):
                  time_skew=pd.Timedelta("0s"),
                  is_broker_alive=None,
                  execution_id=None,
-                 stop_execution_callback=None):
+                 stop_execution_callback=None,
+                 heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL):
         today = pd.to_datetime('now', utc=True).date()
         beginning_of_today = pd.to_datetime(today, utc=True)
 
+        execution_opens = _to_utc(execution_opens)
+        execution_closes = _to_utc(execution_closes)
+        before_trading_start_minutes = _to_utc(before_trading_start_minutes)
+
         self.sessions = sessions[(beginning_of_today <= sessions)]
-        self.execution_opens = execution_opens[(beginning_of_today.tz_localize(None) <= execution_opens)]
-        self.execution_closes = execution_closes[(beginning_of_today.tz_localize(None) <= execution_closes)]
+        self.execution_opens = \
+            execution_opens[beginning_of_today <= execution_opens]
+        self.execution_closes = \
+            execution_closes[beginning_of_today <= execution_closes]
         self.before_trading_start_minutes = before_trading_start_minutes[
             (beginning_of_today <= before_trading_start_minutes)]
 
         self.minute_emission = minute_emission
         self.time_skew = time_skew
         self.is_broker_alive = is_broker_alive or (lambda: True)
+        self.heartbeat_interval = pd.Timedelta(heartbeat_interval)
+        self._last_heartbeat = None
+        self._broker_alive = True
         self._last_emit = None
         self._before_trading_start_bar_yielded = False
         self._execution_id = execution_id
         self._stop_execution_callback = stop_execution_callback
 
+        self.last_emission_lag = None
+        self.max_emission_lag = pd.Timedelta(0)
+        self._emission_lag_total = pd.Timedelta(0)
+        self._emission_count = 0
+
+    @property
+    def emission_lag_stats(self):
+        """
+        The delay between the minute boundaries and the emission of their
+        BAR events.
+
+        Returns
+        -------
+        stats : dict
+            The number of emitted bars ('count') and the 'last', 'mean' and
+            'max' emission lag as pd.Timedelta.
+        """
+        count = self._emission_count
+        return {
+            'count': count,
+            'last': self.last_emission_lag,
+            'mean': (self._emission_lag_total / count
+                     if count else None),
+            'max': self.max_emission_lag if count else None,
+        }
+
+    def _server_time(self):
+        return pd.to_datetime('now', utc=True) + self.time_skew
+
+    def _should_stop(self):
+        if self._stop_execution_callback:
+            return self._stop_execution_callback(self._execution_id)
+        return False
+
+    def _check_heartbeat(self, now):
+        """
+        Query the broker's liveness if the heartbeat interval elapsed since
+        the last query, or if the broker was not alive at the last query.
+        """
+        if (self._last_heartbeat is None or not self._broker_alive or
+                now - self._last_heartbeat >= self.heartbeat_interval):
+            self._last_heartbeat = now
+            self._broker_alive = self.is_broker_alive()
+        return self._broker_alive
+
+    def _sleep_until(self, target):
+        """
+        Sleep until the server time reaches ``target``, waking up for the
+        heartbeats in between.
+
+        Returns
+        -------
+        server_time : pd.Timestamp or None
+            The server time after waking up, None if the broker is not alive
+            or the execution should stop.
+        """
+        while True:
+            now = self._server_time()
+            if not self._check_heartbeat(now) or self._should_stop():
+                return None
+            if now >= target:
+                return now
+            next_heartbeat = self._last_heartbeat + self.heartbeat_interval
+            wake_up = min(target, next_heartbeat)
+            sleep(max((wake_up - now).total_seconds(), 0))
+
+    def _record_emission_lag(self, minute, now):
+        lag = now - minute
+        self.last_emission_lag = lag
+        self.max_emission_lag = max(self.max_emission_lag, lag)
+        self._emission_lag_total += lag
+        self._emission_count += 1
+        if lag >= _one_minute:
+            log.warning('BAR {} emitted {} late'.format(minute, lag))
+
+    def _bars(self, minute, is_close):
+        self._last_emit = minute
+        yield minute, BAR
+        if self.minute_emission:
+            yield minute, MINUTE_END
+        if is_close:
+            yield minute, SESSION_END
+
     def __iter__(self):
         # yield from self.work_when_out_of_trading_hours()
         # return
@@ -80,50 +194,51 @@ class RealtimeClock(object):
 
             yield session, SESSION_START
 
-            if self._stop_execution_callback:
-                if self._stop_execution_callback(self._execution_id):
-                    break
+            if self._should_stop():
+                break
 
-            while self.is_broker_alive():
-                if self._stop_execution_callback:  # put it here too, to break inner loop as well
-                    if self._stop_execution_callback(self._execution_id):
-                        break
-                current_time = pd.to_datetime('now', utc=True)
-                server_time = (current_time + self.time_skew).floor('1 min')
+            execution_open = self.execution_opens[index]
+            execution_close = self.execution_closes[index]
+            # the minutes to emit, as int64 for cheap lookups
+            schedule = pd.date_range(execution_open, execution_close,
+                                     freq='1 min')
+            schedule_values = schedule.asi8
 
-                if (server_time >= self.before_trading_start_minutes[index] and
-                        not self._before_trading_start_bar_yielded):
-                    self._last_emit = server_time
-                    self._before_trading_start_bar_yielded = True
-                    yield server_time, BEFORE_TRADING_START_BAR
-                elif (server_time < self.execution_opens[index].tz_localize('UTC') and index == 0) or \
-                        (self.execution_closes[index - 1].tz_localize('UTC') <= server_time <
-                         self.execution_opens[index].tz_localize('UTC')):
-                    # sleep anywhere between yesterday's close and today's open
-                    sleep(1)
-                elif (self.execution_opens[index].tz_localize('UTC') <= server_time <
-                      self.execution_closes[index].tz_localize('UTC')):
-                    if (self._last_emit is None or
-                            server_time - self._last_emit >=
-                            pd.Timedelta('1 minute')):
-                        self._last_emit = server_time
-                        yield server_time, BAR
-                        if self.minute_emission:
-                            yield server_time, MINUTE_END
-                    else:
-                        sleep(1)
-                elif server_time == self.execution_closes[index].tz_localize('UTC'):
-                    self._last_emit = server_time
-                    yield server_time, BAR
-                    if self.minute_emission:
-                        yield server_time, MINUTE_END
-                    yield server_time, SESSION_END
+            now = self._sleep_until(self.before_trading_start_minutes[index])
+            if now is None:
+                # the broker is not alive or the execution should stop, move
+                # on to the next session
+                continue
+            server_time = now.floor('1 min')
+            self._last_emit = server_time
+            self._before_trading_start_bar_yielded = True
+            yield server_time, BEFORE_TRADING_START_BAR
+
+            now = self._server_time()
+            while True:
+                # the next minute which did not pass yet, or the current
+                # one if the algorithm fell behind
+                current = now.floor('1 min')
+                if self._last_emit is not None and \
+                        self._last_emit >= execution_open:
+                    current = max(current, self._last_emit + _one_minute)
+                loc = np.searchsorted(schedule_values, current.value)
+                if loc == len(schedule_values):
                     break
-                elif server_time > self.execution_closes[index].tz_localize('UTC'):
+
+                minute = schedule[loc]
+                now = self._sleep_until(minute)
+                if now is None:
                     break
-                else:
-                    # We should never end up in this branch
-                    raise RuntimeError("Invalid state in RealtimeClock")
+                if now.floor('1 min') > minute:
+                    # woke up too late, emit the current minute instead
+                    continue
+
+                self._record_emission_lag(minute, now)
+                for event in self._bars(minute, minute == execution_close):
+                    yield event
+
+                now = self._server_time()
 
     def work_when_out_of_trading_hours(self):
         """
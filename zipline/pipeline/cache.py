@@ -0,0 +1,282 @@
+"""
+Persistent cache of computed pipeline terms.
+
+Term outputs are stored as ``.npy`` files named by a content address: a hash
+of the structure of the term (its type, dataset columns, window length,
+params, inputs, mask and domain), the dates and assets it was computed for,
+and a fingerprint of the data it was computed from. A term computed again for
+the same dates and assets on the same data is read back, memory-mapped,
+instead of being loaded and computed.
+"""
+from hashlib import sha1
+import os
+import tempfile
+import types
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from zipline.utils.numpy_utils import object_dtype
+
+from .data.dataset import BoundColumn
+from .domain import Domain
+from .term import ComputableTerm, Term
+
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+
+class UncacheableTerm(Exception):
+    """
+    Raised when a term has no stable structural identity, e.g. because one of
+    its attributes has no meaningful repr.
+    """
+
+
+def _code_token(cls):
+    # Include the code of user defined compute methods, so that editing a
+    # CustomFactor invalidates its entries.
+    tokens = []
+    for name in ('compute', '_compute'):
+        method = getattr(cls, name, None)
+        code = getattr(method, '__code__', None)
+        if code is not None:
+            tokens.append(code.co_code)
+            tokens.append(repr(code.co_consts).encode())
+    return sha1(b''.join(tokens)).hexdigest()
+
+
+def _type_token(cls):
+    return '{}.{}:{}'.format(
+        cls.__module__,
+        cls.__qualname__,
+        _code_token(cls),
+    )
+
+
+def _function_token(f):
+    code = f.__code__
+    return '{}.{}:{}'.format(
+        f.__module__,
+        f.__qualname__,
+        sha1(code.co_code + repr(code.co_consts).encode()).hexdigest(),
+    )
+
+
+class TermCache(object):
+    """
+    On-disk cache of term outputs with least recently used eviction.
+
+    Parameters
+    ----------
+    path : str
+        The directory holding the cached arrays.
+    fingerprint : str
+        Identifies the data the terms are computed from, e.g. the path of the
+        bundle ingestion. Entries written with another fingerprint are never
+        read.
+    max_bytes : int, optional
+        The size of the cache on disk above which the least recently used
+        entries are deleted.
+
+    Attributes
+    ----------
+    hits : int
+        The number of terms read from the cache.
+    misses : int
+        The number of terms looked up and not found.
+    """
+    def __init__(self, path, fingerprint, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.fingerprint = str(fingerprint)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._tokens = WeakKeyDictionary()
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        # name -> (size, last access) of the entries on disk
+        self._entries = {}
+        for name in os.listdir(path):
+            if name.endswith('.npy'):
+                stat = os.stat(os.path.join(path, name))
+                self._entries[name] = stat.st_size, stat.st_mtime
+        self._size = sum(size for size, _ in self._entries.values())
+
+    @staticmethod
+    def is_cacheable(term):
+        """
+        Whether outputs of ``term`` can be stored. Only computed terms are
+        stored: loaded terms carry their adjustments, which can't be written
+        as a plain array.
+        """
+        return isinstance(term, ComputableTerm) and \
+            term.dtype != object_dtype
+
+    def token(self, term):
+        """
+        A hash of the structure of ``term``, stable across processes.
+
+        Raises
+        ------
+        UncacheableTerm
+            If the structure of ``term`` can't be represented.
+        """
+        try:
+            return self._tokens[term]
+        except KeyError:
+            pass
+
+        if isinstance(term, BoundColumn):
+            parts = [
+                _type_token(term.dataset),
+                term.name,
+                self._value_token(term.domain),
+                str(term.dtype),
+                repr(term.currency_conversion),
+            ]
+        else:
+            parts = [_type_token(type(term))]
+            for name, value in sorted(vars(term).items()):
+                if name == '__doc__':
+                    continue
+                parts.append('{}={}'.format(name, self._value_token(value)))
+
+        token = self._tokens[term] = sha1(
+            '\n'.join(parts).encode('utf-8')
+        ).hexdigest()
+        return token
+
+    def _value_token(self, value):
+        if isinstance(value, Term):
+            return self.token(value)
+        if isinstance(value, (tuple, list, frozenset, set)):
+            tokens = [self._value_token(v) for v in value]
+            if isinstance(value, (frozenset, set)):
+                tokens.sort()
+            return '({})'.format(','.join(tokens))
+        if isinstance(value, dict):
+            return '{{{}}}'.format(','.join(sorted(
+                '{}:{}'.format(self._value_token(k), self._value_token(v))
+                for k, v in value.items()
+            )))
+        if isinstance(value, type):
+            return _type_token(value)
+        if isinstance(value, types.FunctionType):
+            return _function_token(value)
+        if isinstance(value, np.dtype):
+            return str(value)
+        if isinstance(value, Domain):
+            return repr(value)
+
+        token = repr(value)
+        if ' at 0x' in token:
+            raise UncacheableTerm(token)
+        return token
+
+    def key(self, term, dates, assets):
+        """
+        The name of the entry holding ``term`` computed for ``dates`` and
+        ``assets``.
+        """
+        digest = sha1()
+        digest.update(self.fingerprint.encode('utf-8'))
+        digest.update(self.token(term).encode('ascii'))
+        digest.update(np.asarray(dates, dtype='datetime64[ns]').tobytes())
+        digest.update(np.asarray(assets, dtype='int64').tobytes())
+        return digest.hexdigest() + '.npy'
+
+    def get(self, term, dates, assets):
+        """
+        Read ``term`` computed for ``dates`` and ``assets``.
+
+        Returns
+        -------
+        value : np.ndarray or None
+            A copy-on-write memory map of the stored output, or None if it is
+            not in the cache.
+        """
+        try:
+            name = self.key(term, dates, assets)
+        except UncacheableTerm:
+            self.misses += 1
+            return None
+
+        path = os.path.join(self.path, name)
+        try:
+            value = np.load(path, mmap_mode='c', allow_pickle=False)
+        except (IOError, OSError, ValueError):
+            size, _ = self._entries.pop(name, (0, None))
+            self._size -= size
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touch(name)
+        return value
+
+    def set(self, term, dates, assets, value):
+        """
+        Store ``value``, the output of ``term`` for ``dates`` and ``assets``.
+        Outputs which can't be written as a plain array are ignored.
+        """
+        if type(value) is not np.ndarray or value.dtype == object_dtype:
+            return
+        try:
+            name = self.key(term, dates, assets)
+        except UncacheableTerm:
+            return
+        if name in self._entries:
+            return
+
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, value, allow_pickle=False)
+            os.replace(tmp, os.path.join(self.path, name))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+        size = os.path.getsize(os.path.join(self.path, name))
+        self._entries[name] = size, os.path.getmtime(
+            os.path.join(self.path, name),
+        )
+        self._size += size
+        self._evict()
+
+    def _touch(self, name):
+        path = os.path.join(self.path, name)
+        try:
+            os.utime(path, None)
+            size = self._entries.get(name, (os.path.getsize(path), None))[0]
+            self._entries[name] = size, os.path.getmtime(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self._size <= self.max_bytes:
+            return
+        by_access = sorted(self._entries.items(), key=lambda item: item[1][1])
+        for name, (size, _) in by_access:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+            del self._entries[name]
+            self._size -= size
+
+    def clear(self):
+        """
+        Delete all the entries.
+        """
+        for name in list(self._entries):
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+        self._entries.clear()
+        self._size = 0
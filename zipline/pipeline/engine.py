@@ -56,7 +56,18 @@ implements the following algorithm for executing pipelines:
    screen. This logic lives in SimplePipelineEngine._to_narrow.
 """
 from abc import ABCMeta, abstractmethod
+from collections import deque, namedtuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from functools import partial
+import multiprocessing
+import sys
+import time
 
 from six import iteritems, with_metaclass, viewkeys
 from numpy import array, arange
@@ -76,13 +87,19 @@ from zipline.utils.string_formatting import bulleted_list
 
 from .domain import Domain, GENERIC
 from .graph import maybe_specialize
-from .hooks import DelegatingHooks
+from .hooks import DelegatingHooks, NoHooks
 from .term import AssetExists, InputDates, LoadableTerm
 
 from zipline.utils.date_utils import compute_date_range_chunks
 from zipline.utils.pandas_utils import categorical_df_concat
 
 
+PreparedChunk = namedtuple(
+    'PreparedChunk',
+    'start_date end_date plan dates sids workspace refcounts execution_order',
+)
+
+
 class PipelineEngine(with_metaclass(ABCMeta)):
 
     @abstractmethod
@@ -123,7 +140,11 @@ class PipelineEngine(with_metaclass(ABCMeta)):
                              start_date,
                              end_date,
                              chunksize,
-                             hooks=None):
+                             hooks=None,
+                             engine_factory=None,
+                             processes=None,
+                             max_inflight_chunks=None,
+                             prefetch_chunks=None):
         """
         Compute values for ``pipeline`` from ``start_date`` to ``end_date``, in
         date chunks of size ``chunksize``.
@@ -131,6 +152,12 @@ class PipelineEngine(with_metaclass(ABCMeta)):
         Chunked execution reduces memory consumption, and may reduce
         computation time depending on the contents of your pipeline.
 
+        Chunks are independent of each other: every chunk loads the extra
+        leading rows its windowed terms need. Passing ``engine_factory`` and
+        ``processes`` therefore computes the chunks in parallel on a pool of
+        worker processes, each of which builds its own engine by calling
+        ``engine_factory()``.
+
         Parameters
         ----------
         pipeline : Pipeline
@@ -187,7 +214,11 @@ class ExplodingPipelineEngine(PipelineEngine):
                              start_date,
                              end_date,
                              chunksize,
-                             hooks=None):
+                             hooks=None,
+                             engine_factory=None,
+                             processes=None,
+                             max_inflight_chunks=None,
+                             prefetch_chunks=None):
         raise NoEngineRegistered(
             "Attempted to run a chunked pipeline but no pipeline "
             "resources were registered."
@@ -247,6 +278,14 @@ class SimplePipelineEngine(PipelineEngine):
     default_hooks : list, optional
         List of hooks that should be used to instrument all pipelines executed
         by this engine.
+    compute_threads : int, optional
+        Number of threads used to compute independent terms concurrently.
+        By default terms are computed serially. Loaders are never called
+        concurrently.
+    term_cache : zipline.pipeline.cache.TermCache, optional
+        Persistent cache of computed terms. Terms found in the cache for the
+        dates and assets of a chunk are read instead of being loaded and
+        computed, and computed terms are written to it.
 
     See Also
     --------
@@ -258,6 +297,8 @@ class SimplePipelineEngine(PipelineEngine):
         '_root_mask_term',
         '_root_mask_dates_term',
         '_populate_initial_workspace',
+        '_compute_threads',
+        '_term_cache',
     )
 
     @expect_types(
@@ -269,7 +310,9 @@ class SimplePipelineEngine(PipelineEngine):
                  asset_finder,
                  default_domain=GENERIC,
                  populate_initial_workspace=None,
-                 default_hooks=None):
+                 default_hooks=None,
+                 compute_threads=None,
+                 term_cache=None):
 
         self._get_loader = get_loader
         self._finder = asset_finder
@@ -287,12 +330,19 @@ class SimplePipelineEngine(PipelineEngine):
         else:
             self._default_hooks = list(default_hooks)
 
+        self._compute_threads = compute_threads
+        self._term_cache = term_cache
+
     def run_chunked_pipeline(self,
                              pipeline,
                              start_date,
                              end_date,
                              chunksize,
-                             hooks=None):
+                             hooks=None,
+                             engine_factory=None,
+                             processes=None,
+                             max_inflight_chunks=None,
+                             prefetch_chunks=None):
         """
         Compute values for ``pipeline`` from ``start_date`` to ``end_date``, in
         date chunks of size ``chunksize``.
@@ -312,6 +362,27 @@ class SimplePipelineEngine(PipelineEngine):
             The number of days to execute at a time.
         hooks : list[implements(PipelineHooks)], optional
             Hooks for instrumenting Pipeline execution.
+        engine_factory : callable, optional
+            A picklable function of no arguments returning the
+            PipelineEngine used by the worker processes, e.g.
+            ``functools.partial(SimplePipelineEngine, get_loader, finder)``.
+            It should open its own connections (asset database, bundle
+            readers) rather than share the parent's. Required when
+            ``processes`` is greater than 1.
+        processes : int, optional
+            The number of worker processes. By default, or if 1, the chunks
+            are computed serially in this process.
+        max_inflight_chunks : int, optional
+            The maximum number of chunks submitted to the pool and not yet
+            collected, which bounds the memory held by pending results.
+            Defaults to twice ``processes``.
+        prefetch_chunks : int, optional
+            The number of chunks whose LoadableTerms are loaded ahead of the
+            chunk being computed. The loaders are still only called from
+            this thread, while the chunks are computed on a background
+            thread. Each prefetched chunk holds its loaded data in memory
+            until it is computed. By default the terms of a chunk are loaded
+            when it is computed. Ignored when running on worker processes.
 
         Returns
         -------
@@ -327,22 +398,55 @@ class SimplePipelineEngine(PipelineEngine):
             A screen of ``None`` indicates that a row should be returned for
             each asset that existed each day.
 
+        Notes
+        -----
+        When running on worker processes, ``hooks`` only see
+        ``running_pipeline``; the per-chunk hooks run inside the workers with
+        the default hooks of the engines built by ``engine_factory``.
+
         See Also
         --------
         :meth:`zipline.pipeline.engine.PipelineEngine.run_pipeline`
         """
         domain = self.resolve_domain(pipeline)
-        ranges = compute_date_range_chunks(
+        ranges = list(compute_date_range_chunks(
             domain.all_sessions(),
             start_date,
             end_date,
             chunksize,
-        )
+        ))
         hooks = self._resolve_hooks(hooks)
 
-        run_pipeline = partial(self._run_pipeline_impl, pipeline, hooks=hooks)
+        parallel = processes is not None and processes > 1 and len(ranges) > 1
+        if parallel and engine_factory is None:
+            raise ValueError(
+                "run_chunked_pipeline requires an engine_factory to run on "
+                "{} processes.".format(processes)
+            )
+
         with hooks.running_pipeline(pipeline, start_date, end_date):
-            chunks = [run_pipeline(s, e) for s, e in ranges]
+            if parallel:
+                chunks = run_chunks_in_processes(
+                    engine_factory,
+                    pipeline,
+                    ranges,
+                    processes,
+                    max_inflight_chunks or 2 * processes,
+                )
+            elif prefetch_chunks:
+                chunks = self._run_prefetched_chunks(
+                    pipeline,
+                    ranges,
+                    hooks,
+                    prefetch_chunks,
+                )
+            else:
+                run_pipeline = partial(
+                    self._run_pipeline_impl,
+                    pipeline,
+                    hooks=hooks,
+                )
+                chunks = [run_pipeline(s, e) for s, e in ranges]
 
         if len(chunks) == 1:
             # OPTIMIZATION: Don't make an extra copy in `categorical_df_concat`
@@ -395,6 +499,18 @@ class SimplePipelineEngine(PipelineEngine):
     def _run_pipeline_impl(self, pipeline, start_date, end_date, hooks):
         """Shared core for ``run_pipeline`` and ``run_chunked_pipeline``.
         """
+        chunk = self._prepare_chunk(pipeline, start_date, end_date, hooks)
+        return self._compute_prepared_chunk(chunk, hooks)
+
+    def _prepare_chunk(self, pipeline, start_date, end_date, hooks):
+        """
+        Build everything needed to compute ``pipeline`` from ``start_date``
+        to ``end_date``, up to the loading of the LoadableTerms.
+
+        Returns
+        -------
+        chunk : PreparedChunk
+        """
         # See notes at the top of this module for a description of the
         # algorithm implemented here.
         if end_date < start_date:
@@ -425,30 +541,190 @@ class SimplePipelineEngine(PipelineEngine):
             sids,
         )
 
+        if self._term_cache is not None:
+            self._read_cached_terms(plan, dates, sids, workspace, hooks)
+
         refcounts = plan.initial_refcounts(workspace)
         execution_order = plan.execution_order(workspace, refcounts)
 
-        with hooks.computing_chunk(execution_order,
-                                   start_date,
-                                   end_date):
+        return PreparedChunk(
+            start_date=start_date,
+            end_date=end_date,
+            plan=plan,
+            dates=dates,
+            sids=sids,
+            workspace=workspace,
+            refcounts=refcounts,
+            execution_order=execution_order,
+        )
+
+    def _compute_prepared_chunk(self, chunk, hooks, prefetched=None):
+        """
+        Compute a chunk built by ``_prepare_chunk``.
+
+        ``prefetched`` is a future of the LoadableTerms of the chunk and the
+        time spent loading them, from ``_run_prefetched_chunks``.
+        """
+        plan = chunk.plan
+        with hooks.computing_chunk(chunk.execution_order,
+                                   chunk.start_date,
+                                   chunk.end_date):
+
+            if prefetched is not None:
+                to_load = [
+                    term for term in chunk.execution_order
+                    if isinstance(term, LoadableTerm)
+                    and term not in chunk.workspace
+                ]
+                wait_start = time.time()
+                with hooks.loading_terms(to_load):
+                    loaded, load_time = prefetched.result()
+                hooks.on_chunk_prefetched(
+                    chunk.start_date,
+                    chunk.end_date,
+                    load_time,
+                    time.time() - wait_start,
+                )
+            else:
+                loaded = None
 
             results = self.compute_chunk(
                 graph=plan,
-                dates=dates,
-                sids=sids,
-                workspace=workspace,
-                refcounts=refcounts,
-                execution_order=execution_order,
+                dates=chunk.dates,
+                sids=chunk.sids,
+                workspace=chunk.workspace,
+                refcounts=chunk.refcounts,
+                execution_order=chunk.execution_order,
                 hooks=hooks,
+                prefetched=loaded,
             )
 
+        extra_rows = plan.extra_rows[self._root_mask_term]
         return self._to_narrow(
             plan.outputs,
             results,
             results.pop(plan.screen_name),
-            dates[extra_rows:],
-            sids,
+            chunk.dates[extra_rows:],
+            chunk.sids,
+        )
+
+    def _load_chunk(self, chunk):
+        """
+        Load all the LoadableTerms of ``chunk`` which will be needed to
+        compute it.
+
+        Returns
+        -------
+        loaded : dict[LoadableTerm, AdjustedArray]
+        """
+        plan = chunk.plan
+        loader_groups, loader_group_key = self._loader_groups(
+            plan, chunk.workspace, chunk.execution_order,
         )
+        loaded = {}
+        for group in loader_groups.values():
+            mask, mask_dates = plan.mask_and_dates_for_term(
+                group[0],
+                self._root_mask_term,
+                chunk.workspace,
+                chunk.dates,
+            )
+            loaded.update(self._load_terms(
+                loader_groups,
+                loader_group_key,
+                group[0],
+                plan.domain,
+                mask_dates,
+                chunk.sids,
+                mask,
+                NoHooks(),
+            ))
+        return loaded
+
+    def _run_prefetched_chunks(self, pipeline, ranges, hooks, prefetch):
+        """
+        Compute ``pipeline`` over each of ``ranges``, loading the
+        LoadableTerms of up to ``prefetch`` chunks ahead of the one being
+        computed.
+
+        The chunks are prepared and loaded on this thread, since loaders may
+        hold resources bound to it (e.g. sqlite connections), and computed in
+        order on a single background thread.
+
+        Returns
+        -------
+        chunks : list[pd.DataFrame]
+            The result of each chunk, in the order of ``ranges``.
+        """
+        chunks = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            for start_date, end_date in ranges:
+                chunk = self._prepare_chunk(
+                    pipeline, start_date, end_date, hooks,
+                )
+                loaded = Future()
+                pending.append(pool.submit(
+                    self._compute_prepared_chunk, chunk, hooks, loaded,
+                ))
+
+                start = time.time()
+                try:
+                    terms = self._load_chunk(chunk)
+                except BaseException as e:
+                    loaded.set_exception(e)
+                    raise
+                loaded.set_result((terms, time.time() - start))
+                del chunk, loaded, terms
+
+                # Load at most ``prefetch`` chunks ahead of the one being
+                # computed.
+                while len(pending) > prefetch:
+                    chunks.append(pending.popleft().result())
+
+            while pending:
+                chunks.append(pending.popleft().result())
+        return chunks
+
+    def _read_cached_terms(self, plan, dates, sids, workspace, hooks):
+        """
+        Populate ``workspace`` with the terms of ``plan`` found in the term
+        cache.
+
+        The graph is walked from the outputs towards the loaded terms, so the
+        inputs of a term found in the cache are not looked up: they won't be
+        needed, and ``initial_refcounts`` prunes them from the plan.
+        """
+        cache = self._term_cache
+        root_extra_rows = plan.extra_rows[self._root_mask_term]
+        hits = []
+        misses = []
+        seen = set()
+        stack = list(plan.outputs.values())
+        while stack:
+            term = stack.pop()
+            if term in seen or term in workspace:
+                continue
+            seen.add(term)
+            if not cache.is_cacheable(term):
+                stack.extend(plan.graph.predecessors(term))
+                continue
+
+            term_dates = dates[root_extra_rows - plan.extra_rows[term]:]
+            value = cache.get(term, term_dates, sids)
+            if value is None:
+                misses.append(term)
+                stack.extend(plan.graph.predecessors(term))
+            else:
+                hits.append(term)
+                workspace[term] = value
+
+        hooks.on_term_cache_lookup(hits, misses)
+
+    def _store_computed_term(self, term, dates, sids, value):
+        cache = self._term_cache
+        if cache is not None and cache.is_cacheable(term):
+            cache.set(term, dates, sids, value)
 
     def _compute_root_mask(self, domain, start_date, end_date, extra_rows):
         """
@@ -590,7 +866,8 @@ class SimplePipelineEngine(PipelineEngine):
                       workspace,
                       refcounts,
                       execution_order,
-                      hooks):
+                      hooks,
+                      prefetched=None):
         """
         Compute the Pipeline terms in the graph for the requested start and end
         dates.
@@ -618,6 +895,10 @@ class SimplePipelineEngine(PipelineEngine):
             Order in which to execute terms.
         hooks : implements(PipelineHooks)
             Hooks to instrument pipeline execution.
+        prefetched : dict[LoadableTerm, AdjustedArray], optional
+            Already loaded terms, used instead of calling the loaders. Entries
+            are removed as they are used, so that they can be freed once
+            their refcounts hit 0.
 
         Returns
         -------
@@ -626,11 +907,55 @@ class SimplePipelineEngine(PipelineEngine):
         """
         self._validate_compute_chunk_params(graph, dates, sids, workspace)
 
-        get_loader = self._get_loader
-
         # Copy the supplied initial workspace so we don't mutate it in place.
         workspace = workspace.copy()
-        domain = graph.domain
+
+        loader_groups, loader_group_key = self._loader_groups(
+            graph, workspace, execution_order,
+        )
+
+        if prefetched is None:
+            load_terms = self._load_terms
+        else:
+            load_terms = partial(self._take_prefetched, prefetched)
+
+        if self._compute_threads and self._compute_threads > 1:
+            execute = self._execute_concurrently
+        else:
+            execute = self._execute_serially
+        execute(
+            graph,
+            dates,
+            sids,
+            workspace,
+            refcounts,
+            execution_order,
+            hooks,
+            partial(load_terms, loader_groups, loader_group_key),
+        )
+
+        # At this point, all the output terms are in the workspace.
+        out = {}
+        graph_extra_rows = graph.extra_rows
+        for name, term in iteritems(graph.outputs):
+            # Truncate off extra rows from outputs.
+            out[name] = workspace[term][graph_extra_rows[term]:]
+
+        return out
+
+    def _loader_groups(self, graph, workspace, execution_order):
+        """
+        Group the LoadableTerms of ``execution_order`` which still have to be
+        loaded into batches for their loaders.
+
+        Returns
+        -------
+        loader_groups : dict[object, list[LoadableTerm]]
+            Map from group key to the terms of the group.
+        loader_group_key : callable
+            Function returning the group key of a term.
+        """
+        get_loader = self._get_loader
 
         # Many loaders can fetch data more efficiently if we ask them to
         # retrieve all their inputs at once. For example, a loader backed by a
@@ -661,7 +986,79 @@ class SimplePipelineEngine(PipelineEngine):
             loader_group_key,
             (t for t in execution_order if t in will_be_loaded),
         )
+        return loader_groups, loader_group_key
+
+    def _load_terms(self,
+                    loader_groups,
+                    loader_group_key,
+                    term,
+                    domain,
+                    mask_dates,
+                    sids,
+                    mask,
+                    hooks):
+        """
+        Load ``term`` together with the other terms of its loader group.
+        """
+        loader = self._get_loader(term)
+        to_load = sorted(
+            loader_groups[loader_group_key(term)],
+            key=lambda t: t.dataset
+        )
+        self._ensure_can_load(loader, to_load)
+        with hooks.loading_terms(to_load):
+            loaded = loader.load_adjusted_array(
+                domain, to_load, mask_dates, sids, mask,
+            )
+        assert set(loaded) == set(to_load), (
+            'loader did not return an AdjustedArray for each column\n'
+            'expected: %r\n'
+            'got:      %r' % (
+                sorted(to_load, key=repr),
+                sorted(loaded, key=repr),
+            )
+        )
+        return loaded
+
+    @staticmethod
+    def _take_prefetched(prefetched,
+                         loader_groups,
+                         loader_group_key,
+                         term,
+                         domain,
+                         mask_dates,
+                         sids,
+                         mask,
+                         hooks):
+        """
+        ``_load_terms`` for terms already loaded by ``_load_chunk``.
+        """
+        return {
+            t: prefetched.pop(t)
+            for t in loader_groups[loader_group_key(term)]
+        }
 
+    @staticmethod
+    def _check_computed_shape(term, result, mask):
+        if term.ndim == 2:
+            assert result.shape == mask.shape
+        else:
+            assert result.shape == (mask.shape[0], 1)
+
+    def _execute_serially(self,
+                          graph,
+                          dates,
+                          sids,
+                          workspace,
+                          refcounts,
+                          execution_order,
+                          hooks,
+                          load_terms):
+        """
+        Compute the terms of ``execution_order`` one after the other,
+        filling ``workspace`` in place.
+        """
+        domain = graph.domain
         for term in execution_order:
             # `term` may have been supplied in `initial_workspace`, or we may
             # have loaded `term` as part of a batch with another term coming
@@ -681,25 +1078,12 @@ class SimplePipelineEngine(PipelineEngine):
             )
 
             if isinstance(term, LoadableTerm):
-                loader = get_loader(term)
-                to_load = sorted(
-                    loader_groups[loader_group_key(term)],
-                    key=lambda t: t.dataset
-                )
-                self._ensure_can_load(loader, to_load)
-                with hooks.loading_terms(to_load):
-                    loaded = loader.load_adjusted_array(
-                        domain, to_load, mask_dates, sids, mask,
-                    )
-                assert set(loaded) == set(to_load), (
-                    'loader did not return an AdjustedArray for each column\n'
-                    'expected: %r\n'
-                    'got:      %r' % (
-                        sorted(to_load, key=repr),
-                        sorted(loaded, key=repr),
-                    )
+                loaded = load_terms(
+                    term, domain, mask_dates, sids, mask, hooks,
                 )
                 workspace.update(loaded)
+                for loaded_term, value in iteritems(loaded):
+                    hooks.on_term_output(loaded_term, value)
             else:
                 with hooks.computing_term(term):
                     workspace[term] = term._compute(
@@ -714,24 +1098,123 @@ class SimplePipelineEngine(PipelineEngine):
                         sids,
                         mask,
                     )
-                if term.ndim == 2:
-                    assert workspace[term].shape == mask.shape
-                else:
-                    assert workspace[term].shape == (mask.shape[0], 1)
+                self._check_computed_shape(term, workspace[term], mask)
+                hooks.on_term_output(term, workspace[term])
+                self._store_computed_term(
+                    term, mask_dates, sids, workspace[term],
+                )
 
                 # Decref dependencies of ``term``, and clear any terms
                 # whose refcounts hit 0.
                 for garbage in graph.decref_dependencies(term, refcounts):
                     del workspace[garbage]
 
-        # At this point, all the output terms are in the workspace.
-        out = {}
-        graph_extra_rows = graph.extra_rows
-        for name, term in iteritems(graph.outputs):
-            # Truncate off extra rows from outputs.
-            out[name] = workspace[term][graph_extra_rows[term]:]
-
-        return out
+    def _execute_concurrently(self,
+                              graph,
+                              dates,
+                              sids,
+                              workspace,
+                              refcounts,
+                              execution_order,
+                              hooks,
+                              load_terms):
+        """
+        Compute the terms of ``execution_order`` on a thread pool, filling
+        ``workspace`` in place.
+
+        A term is started as soon as all of its inputs are in the workspace.
+        Only ``term._compute`` runs on the pool: loading, gathering inputs,
+        hooks and refcounting all happen on this thread. Since a term's
+        dependencies are decref'ed when it finishes, an input is only handed
+        out without a copy (refcount of 1) once every other consumer of it
+        has finished, so the results are the same as in the serial order.
+        """
+        domain = graph.domain
+        dag = graph.graph
+        position = {term: i for i, term in enumerate(execution_order)}
+
+        # Number of inputs of each term which still have to be computed.
+        waiting = {
+            term: sum(1 for parent in dag.predecessors(term)
+                      if parent in position)
+            for term in execution_order
+        }
+        ready = deque(t for t in execution_order if not waiting[t])
+        running = {}
+
+        def finished(term):
+            for child in dag.successors(term):
+                if child in waiting:
+                    waiting[child] -= 1
+                    if not waiting[child]:
+                        ready.append(child)
+
+        with ThreadPoolExecutor(max_workers=self._compute_threads) as pool:
+            while ready or running:
+                while ready:
+                    term = ready.popleft()
+                    if term in workspace:
+                        finished(term)
+                        continue
+
+                    mask, mask_dates = graph.mask_and_dates_for_term(
+                        term,
+                        self._root_mask_term,
+                        workspace,
+                        dates,
+                    )
+                    if isinstance(term, LoadableTerm):
+                        loaded = load_terms(
+                            term, domain, mask_dates, sids, mask, hooks,
+                        )
+                        workspace.update(loaded)
+                        for loaded_term, value in iteritems(loaded):
+                            hooks.on_term_output(loaded_term, value)
+                        finished(term)
+                        continue
+
+                    computing = hooks.computing_term(term)
+                    computing.__enter__()
+                    future = pool.submit(
+                        term._compute,
+                        self._inputs_for_term(
+                            term,
+                            workspace,
+                            graph,
+                            domain,
+                            refcounts,
+                        ),
+                        mask_dates,
+                        sids,
+                        mask,
+                    )
+                    running[future] = term, mask, mask_dates, computing
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                # Handle completions in execution order so that refcounts
+                # and hooks see a deterministic sequence of events.
+                done = sorted(done, key=lambda f: position[running[f][0]])
+                for future in done:
+                    term, mask, mask_dates, computing = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BaseException:
+                        computing.__exit__(*sys.exc_info())
+                        for _, _, _, other in running.values():
+                            other.__exit__(None, None, None)
+                        raise
+                    computing.__exit__(None, None, None)
+
+                    workspace[term] = result
+                    self._check_computed_shape(term, result, mask)
+                    hooks.on_term_output(term, result)
+                    self._store_computed_term(term, mask_dates, sids, result)
+                    for garbage in graph.decref_dependencies(term, refcounts):
+                        del workspace[garbage]
+                    finished(term)
 
     def _to_narrow(self, terms, data, mask, dates, assets):
         """
@@ -939,3 +1422,94 @@ def _pipeline_output_index(dates, assets, mask):
         names=[None, None],
         verify_integrity=False,
     )
+
+
+# Per process state of the workers used by ``run_chunks_in_processes``.
+# ``run_chunks_in_processes`` stores the engine factory and the pipeline under
+# 'task' before forking the workers, and each worker builds its engine on the
+# first chunk it computes.
+_worker_state = {}
+
+
+def _run_chunk_in_worker(task, start_date, end_date):
+    engine = _worker_state.get('engine')
+    if engine is None:
+        if task is None:
+            task = _worker_state['task']
+        engine_factory, pipeline = task
+        engine = _worker_state['engine'] = engine_factory()
+        _worker_state['pipeline'] = pipeline
+    return engine.run_pipeline(
+        _worker_state['pipeline'],
+        start_date,
+        end_date,
+    )
+
+
+def run_chunks_in_processes(engine_factory,
+                            pipeline,
+                            ranges,
+                            processes,
+                            max_inflight_chunks):
+    """
+    Compute ``pipeline`` over each of ``ranges`` on a pool of processes.
+
+    Every worker builds one engine with ``engine_factory`` for the first chunk
+    it computes and reuses it for all the following ones. Where available the
+    workers are forked, so that ``engine_factory`` and ``pipeline`` are
+    inherited rather than pickled; only the date ranges and the results cross
+    process boundaries. Otherwise they are pickled with every chunk.
+
+    Parameters
+    ----------
+    engine_factory : callable
+        Function of no arguments returning a PipelineEngine.
+    pipeline : zipline.pipeline.Pipeline
+        The pipeline to run.
+    ranges : list[(pd.Timestamp, pd.Timestamp)]
+        The first and last date of each chunk.
+    processes : int
+        The number of worker processes.
+    max_inflight_chunks : int
+        The maximum number of chunks submitted and not yet collected.
+
+    Returns
+    -------
+    chunks : list[pd.DataFrame]
+        The result of each chunk, in the order of ``ranges``.
+    """
+    pool_kwargs = {}
+    if sys.version_info >= (3, 7) and \
+            'fork' in multiprocessing.get_all_start_methods():
+        # ProcessPoolExecutor only takes a context on 3.7+; before that it
+        # uses the default one.
+        pool_kwargs['mp_context'] = multiprocessing.get_context('fork')
+    context = pool_kwargs.get('mp_context', multiprocessing.get_context())
+
+    if context.get_start_method() == 'fork':
+        # Inherited by the workers, which are forked on the first submit.
+        _worker_state['task'] = (engine_factory, pipeline)
+        task = None
+    else:
+        task = (engine_factory, pipeline)
+
+    chunks = []
+    pending = deque()
+    try:
+        with ProcessPoolExecutor(max_workers=processes, **pool_kwargs) as pool:
+            for start_date, end_date in ranges:
+                if len(pending) >= max_inflight_chunks:
+                    chunks.append(pending.popleft().result())
+                pending.append(
+                    pool.submit(
+                        _run_chunk_in_worker,
+                        task,
+                        start_date,
+                        end_date,
+                    )
+                )
+            while pending:
+                chunks.append(pending.popleft().result())
+    finally:
+        _worker_state.pop('task', None)
+    return chunks
@@ -33,6 +33,9 @@ class PipelineHooks(Interface):
     computing_chunk(self, terms, start_date, end_date)
     loading_terms(self, terms)
     computing_term(self, term):
+    on_term_output(self, term, value)
+    on_term_cache_lookup(self, hits, misses)
+    on_chunk_prefetched(self, start_date, end_date, load_time, wait_time)
     """
 
     @contextmanager
@@ -87,3 +90,44 @@ class PipelineHooks(Interface):
         terms : zipline.pipeline.ComputableTerm
             Terms being computed.
         """
+
+    def on_term_output(self, term, value):
+        """Called after a term is loaded or computed, once the corresponding
+        ``loading_terms`` or ``computing_term`` context has exited.
+
+        Parameters
+        ----------
+        term : zipline.pipeline.Term
+            The term which was loaded or computed.
+        value : np.ndarray or zipline.lib.adjusted_array.AdjustedArray
+            Its output.
+        """
+
+    def on_term_cache_lookup(self, hits, misses):
+        """Called after looking up the terms of a chunk in the engine's
+        term cache, before any term is loaded or computed.
+
+        Parameters
+        ----------
+        hits : list[zipline.pipeline.ComputableTerm]
+            Terms read from the cache.
+        misses : list[zipline.pipeline.ComputableTerm]
+            Terms not found in the cache, which will be computed.
+        """
+
+    def on_chunk_prefetched(self, start_date, end_date, load_time, wait_time):
+        """Called when the pipeline thread receives the terms of a chunk
+        loaded in the background by run_chunked_pipeline, before the chunk
+        is computed.
+
+        Parameters
+        ----------
+        start_date : pd.Timestamp
+            First date of the chunk.
+        end_date : pd.Timestamp
+            Last date of the chunk.
+        load_time : float
+            Seconds spent loading the terms of the chunk.
+        wait_time : float
+            Seconds the pipeline thread was blocked waiting for them.
+        """
@@ -23,3 +23,12 @@ class NoHooks(implements(PipelineHooks)):
     @contextmanager
     def computing_term(self, term):
         yield
+
+    def on_term_output(self, term, value):
+        pass
+
+    def on_term_cache_lookup(self, hits, misses):
+        pass
+
+    def on_chunk_prefetched(self, start_date, end_date, load_time, wait_time):
+        pass
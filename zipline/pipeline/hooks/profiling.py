@@ -0,0 +1,214 @@
+"""Pipeline hooks for profiling the loading and computation of terms.
+"""
+import time
+import tracemalloc
+
+from interface import implements
+import pandas as pd
+
+from zipline.utils.compat import contextmanager
+
+from .iface import PipelineHooks
+
+PROFILE_COLUMNS = [
+    'start_date',
+    'end_date',
+    'kind',
+    'terms',
+    'wall_time',
+    'cpu_time',
+    'peak_bytes',
+    'shape',
+    'dtype',
+]
+
+
+class ProfilingHooks(implements(PipelineHooks)):
+    """
+    Hooks implementation recording the cost of each load and computation.
+
+    For every ``loading_terms`` and ``computing_term`` call, records the
+    chunk it belongs to, the wall and CPU time spent, the peak memory
+    allocated in the meantime (above what was allocated when it started) and
+    the shape and dtype of the output.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Measure allocations with :mod:`tracemalloc`, which slows down
+        allocation heavy code. Enabled by default.
+
+    Notes
+    -----
+    CPU time is measured for the whole process, and memory is traced for all
+    threads, so with ``SimplePipelineEngine(compute_threads=...)`` the
+    figures of terms computed at the same time overlap.
+
+    Before Python 3.9, :mod:`tracemalloc` can only reset its peak by
+    restarting, so ``peak_bytes`` is None when tracing was already started
+    by someone else.
+    """
+    def __init__(self, trace_memory=True):
+        self._trace_memory = trace_memory
+        self._records = []
+        self._chunk = None, None
+        # the records of the current load or computation, by term
+        self._open = {}
+        self._started_tracing = False
+        # the number of loads and computations being measured
+        self._measuring = 0
+
+    def clear(self):
+        """Forget all the records.
+        """
+        self._records = []
+
+    @contextmanager
+    def running_pipeline(self, pipeline, start_date, end_date):
+        started_tracing = self._trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+            self._started_tracing = True
+        try:
+            yield
+        finally:
+            if started_tracing:
+                self._started_tracing = False
+                tracemalloc.stop()
+
+    @contextmanager
+    def computing_chunk(self, terms, start_date, end_date):
+        self._chunk = start_date, end_date
+        try:
+            yield
+        finally:
+            self._chunk = None, None
+
+    @contextmanager
+    def loading_terms(self, terms):
+        with self._measure('load', terms):
+            yield
+
+    @contextmanager
+    def computing_term(self, term):
+        with self._measure('compute', [term]):
+            yield
+
+    def on_term_output(self, term, value):
+        record = self._open.pop(term, None)
+        if record is None:
+            return
+        if hasattr(value, 'shape'):
+            record['shape'] = value.shape
+        if hasattr(value, 'dtype'):
+            dtypes = record['dtype']
+            record['dtype'] = str(value.dtype) if dtypes is None else \
+                ', '.join(sorted({dtypes, str(value.dtype)}))
+
+    def on_term_cache_lookup(self, hits, misses):
+        pass
+
+    def on_chunk_prefetched(self, start_date, end_date, load_time, wait_time):
+        pass
+
+    @contextmanager
+    def _measure(self, kind, terms):
+        start_date, end_date = self._chunk
+        record = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'kind': kind,
+            'terms': ', '.join(t.recursive_repr() for t in terms),
+            'shape': None,
+            'dtype': None,
+        }
+
+        tracing = tracemalloc.is_tracing() and (
+            self._started_tracing or hasattr(tracemalloc, 'reset_peak')
+        )
+        if tracing:
+            # the peak of measurements running at the same time can't be
+            # reset without losing theirs
+            if not self._measuring:
+                self._reset_peak()
+            allocated = tracemalloc.get_traced_memory()[0]
+        self._measuring += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record['wall_time'] = time.perf_counter() - wall_start
+            record['cpu_time'] = time.process_time() - cpu_start
+            self._measuring -= 1
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                record['peak_bytes'] = max(peak - allocated, 0)
+            else:
+                record['peak_bytes'] = None
+            self._records.append(record)
+            for term in terms:
+                self._open[term] = record
+
+    def _reset_peak(self):
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            # before Python 3.9 the peak is only reset by a restart, which is
+            # only done when tracing was started by these hooks.
+            tracemalloc.stop()
+            tracemalloc.start()
+
+    def to_frame(self):
+        """
+        All the records, one row per load or computation.
+
+        Returns
+        -------
+        profile : pd.DataFrame
+            Frame with the columns ``start_date``, ``end_date`` (the chunk),
+            ``kind`` ('load' or 'compute'), ``terms``, ``wall_time`` and
+            ``cpu_time`` (in seconds), ``peak_bytes``, ``shape`` and
+            ``dtype``.
+        """
+        return pd.DataFrame(self._records, columns=PROFILE_COLUMNS)
+
+    def report(self, top=20):
+        """
+        The most expensive terms, summed over all chunks.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of terms to report.
+
+        Returns
+        -------
+        report : pd.DataFrame
+            Frame indexed by ``kind`` and ``terms`` with the ``count`` of
+            calls, the total ``wall_time`` and ``cpu_time`` and the maximum
+            ``peak_bytes``, sorted by decreasing wall time.
+        """
+        profile = self.to_frame()
+        report = profile.groupby(['kind', 'terms']).agg({
+            'start_date': 'count',
+            'wall_time': 'sum',
+            'cpu_time': 'sum',
+            'peak_bytes': 'max',
+        }).rename(columns={'start_date': 'count'})
+        return report.sort_values('wall_time', ascending=False).head(top)
+
+    def split(self):
+        """
+        The time spent loading versus computing.
+
+        Returns
+        -------
+        split : pd.DataFrame
+            Frame indexed by ``kind`` with the total ``wall_time`` and
+            ``cpu_time``, and the ``share`` of the wall time.
+        """
+        totals = self.to_frame().groupby('kind')[['wall_time', 'cpu_time']] \
+            .sum()
+        totals['share'] = totals['wall_time'] / totals['wall_time'].sum()
+        return totals
@@ -109,6 +109,15 @@ class ProgressHooks(implements(PipelineHooks)):
             self._model.finish_compute_term(term)
             self._publish()
 
+    def on_term_output(self, term, value):
+        pass
+
+    def on_term_cache_lookup(self, hits, misses):
+        pass
+
+    def on_chunk_prefetched(self, start_date, end_date, load_time, wait_time):
+        pass
+
 
 class ProgressModel(object):
     """
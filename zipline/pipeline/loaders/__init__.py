@@ -1,9 +1,11 @@
 from .equity_pricing_loader import (
     EquityPricingLoader,
+    IncrementalEquityPricingLoader,
     USEquityPricingLoader,
 )
 
 __all__ = [
     'EquityPricingLoader',
+    'IncrementalEquityPricingLoader',
     'USEquityPricingLoader',
 ]
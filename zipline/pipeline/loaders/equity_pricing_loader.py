@@ -14,7 +14,8 @@
 from collections import defaultdict
 
 from interface import implements
-from numpy import iinfo, uint32, multiply
+from numpy import empty, iinfo, uint32, multiply
+import pandas as pd
 
 from zipline.data.fx import ExplodingFXRateReader
 from zipline.lib.adjusted_array import AdjustedArray
@@ -87,10 +88,9 @@ class EquityPricingLoader(implements(PipelineLoader)):
         del columns  # From here on we should use ohlcv_cols or currency_cols.
         ohlcv_colnames = [c.name for c in ohlcv_cols]
 
-        raw_ohlcv_arrays = self.raw_price_reader.load_raw_arrays(
+        raw_ohlcv_arrays = self._load_raw_arrays(
             ohlcv_colnames,
-            shifted_dates[0],
-            shifted_dates[-1],
+            shifted_dates,
             sids,
         )
 
@@ -129,6 +129,20 @@ class EquityPricingLoader(implements(PipelineLoader)):
 
         return out
 
+    def _load_raw_arrays(self, colnames, dates, sids):
+        """
+        Read unadjusted data from ``self.raw_price_reader``.
+
+        Returns a list of fresh arrays, parallel to ``colnames``, which the
+        caller may modify in place.
+        """
+        return self.raw_price_reader.load_raw_arrays(
+            colnames,
+            dates[0],
+            dates[-1],
+            sids,
+        )
+
     @property
     def currency_aware(self):
         # Tell the pipeline engine that this loader supports currency
@@ -212,5 +226,96 @@ class EquityPricingLoader(implements(PipelineLoader)):
         return ohlcv, currency
 
 
+class IncrementalEquityPricingLoader(EquityPricingLoader):
+    """An EquityPricingLoader which keeps the raw window of each column it
+    loaded, for pipelines run again over a window shifted by a few sessions.
+
+    Live algorithms run their pipelines every morning over a trailing window
+    which moved by one session since the day before. Only the sessions and
+    assets missing from the kept window are read from ``raw_price_reader``.
+    Adjustments are still read for the whole window, because their row
+    indices are relative to the start of the window; they are small compared
+    to the prices.
+
+    Parameters
+    ----------
+    raw_price_reader : zipline.data.session_bars.SessionBarReader
+        Reader providing raw prices.
+    adjustments_reader : zipline.data.adjustments.SQLiteAdjustmentReader
+        Reader providing price/volume adjustments.
+    fx_reader : zipline.data.fx.FXRateReader
+       Reader providing currency conversions.
+    """
+    def __init__(self, raw_price_reader, adjustments_reader, fx_reader):
+        super(IncrementalEquityPricingLoader, self).__init__(
+            raw_price_reader,
+            adjustments_reader,
+            fx_reader,
+        )
+        # column name -> (dates, sids, raw array) of the last load
+        self._windows = {}
+
+    @classmethod
+    def from_loader(cls, loader):
+        """
+        Construct an IncrementalEquityPricingLoader reading from the same
+        readers as ``loader``.
+        """
+        return cls(
+            raw_price_reader=loader.raw_price_reader,
+            adjustments_reader=loader.adjustments_reader,
+            fx_reader=loader.fx_reader,
+        )
+
+    def _load_raw_arrays(self, colnames, dates, sids):
+        sids = pd.Index(sids)
+        out = []
+        for name in colnames:
+            window = self._windows.get(name)
+            if window is None:
+                data = self._read(name, dates, sids)
+            else:
+                data = self._extend(name, window, dates, sids)
+            self._windows[name] = dates, sids, data
+            # currency conversion and AdjustedArray modify their input
+            out.append(data.copy())
+        return out
+
+    def _read(self, name, dates, sids):
+        return self.raw_price_reader.load_raw_arrays(
+            [name], dates[0], dates[-1], sids,
+        )[0]
+
+    def _extend(self, name, window, dates, sids):
+        """
+        Build the raw array of ``name`` for ``dates`` and ``sids`` from the
+        kept ``window``, reading only what it is missing.
+        """
+        kept_dates, kept_sids, kept = window
+        overlap = kept_dates.intersection(dates)
+        if overlap.empty or overlap[0] != dates[0]:
+            return self._read(name, dates, sids)
+
+        # rows of the kept window serving the beginning of ``dates``
+        start = kept_dates.get_loc(overlap[0])
+        stop = kept_dates.get_loc(overlap[-1]) + 1
+        if not kept_dates[start:stop].equals(dates[:stop - start]):
+            return self._read(name, dates, sids)
+
+        columns = kept_sids.get_indexer(sids)
+        new_sids = columns == -1
+
+        data = empty((len(dates), len(sids)), dtype=kept.dtype)
+        head = stop - start
+        data[:head, ~new_sids] = kept[start:stop, columns[~new_sids]]
+        if new_sids.any():
+            data[:head, new_sids] = self._read(
+                name, dates[:head], sids[new_sids],
+            )
+        if head < len(dates):
+            data[head:] = self._read(name, dates[head:], sids)
+        return data
+
+
 # Backwards compat alias.
 USEquityPricingLoader = EquityPricingLoader
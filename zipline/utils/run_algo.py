@@ -28,6 +28,7 @@ from zipline.data.data_portal_live import DataPortalLive
 from zipline.finance import metrics
 from zipline.finance.trading import SimulationParameters
 from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.hooks import ProfilingHooks
 from zipline.pipeline.loaders import USEquityPricingLoader
 
 import zipline.utils.paths as pth
@@ -92,7 +93,9 @@ def _run(handle_data,
          performance_callback,
          stop_execution_callback,
          teardown,
-         execution_id):
+         execution_id,
+         profile_pipeline=None,
+         incremental_pipeline=False):
     """Run a backtest for the given algorithm.
 
     This is shared between the cli and :func:`zipline.run_algo`.
@@ -107,6 +110,10 @@ def _run(handle_data,
         execution will be aborted.
     teardown - algo method like handle_data() or before_trading_start() that is called when the algo execution stops
     execution_id - unique id to identify this execution (backtest or live instance)
+    profile_pipeline - file to write the pipeline profile to as csv, or '-' to
+        print a report of the most expensive pipeline terms
+    incremental_pipeline - with a broker, keep the pricing windows loaded by
+        the pipelines between their daily runs
 
     """
 
@@ -233,10 +240,16 @@ def _run(handle_data,
         except ValueError as e:
             raise _RunAlgoError(str(e))
 
+    pipeline_hooks = []
+    if profile_pipeline:
+        profiling_hooks = ProfilingHooks()
+        pipeline_hooks.append(profiling_hooks)
+
     TradingAlgorithmClass = (partial(LiveTradingAlgorithm,
                                      broker=broker,
                                      state_filename=state_filename,
-                                     realtime_bar_target=realtime_bar_target)
+                                     realtime_bar_target=realtime_bar_target,
+                                     incremental_pipeline=incremental_pipeline)
                              if broker else TradingAlgorithm)
 
     try:
@@ -260,6 +273,7 @@ def _run(handle_data,
             benchmark_sid=benchmark_sid,
             performance_callback=performance_callback,
             stop_execution_callback=stop_execution_callback,
+            pipeline_hooks=pipeline_hooks,
             **{
                 'initialize': initialize,
                 'handle_data': handle_data,
@@ -289,6 +303,12 @@ def _run(handle_data,
     elif output != os.devnull:  # make the zipline magic not write any data
         perf.to_pickle(output)
 
+    if profile_pipeline == '-':
+        click.echo(str(profiling_hooks.split()))
+        click.echo(str(profiling_hooks.report()))
+    elif profile_pipeline:
+        profiling_hooks.to_frame().to_csv(profile_pipeline, index=False)
+
     return perf
 
 
@@ -371,7 +391,9 @@ def run_algorithm(start,
                   stop_execution_callback=None,
                   execution_id=None,
                   state_filename=None,
-                  realtime_bar_target=None
+                  realtime_bar_target=None,
+                  profile_pipeline=None,
+                  incremental_pipeline=False
                   ):
     """
     Run a trading algorithm.
@@ -444,6 +466,16 @@ def run_algorithm(start,
     execution_id : unique id to identify this execution instance (backtest or live) will be used to mark and get logs
                    for this specific execution instance.
     state_filename : path to pickle file storing the algorithm "context" (similar to self)
+    profile_pipeline : str, optional
+        Profile the pipelines of the algorithm with
+        :class:`zipline.pipeline.hooks.ProfilingHooks`, and write the profile
+        of every load and computation to this file as csv. If this is '-',
+        print the time spent loading versus computing and the most expensive
+        terms instead.
+    incremental_pipeline : bool, optional
+        With a broker, keep the pricing windows loaded by the pipelines in
+        memory between their daily runs, so that only the new sessions are
+        read. Defaults to False.
 
     Returns
     -------
@@ -486,7 +518,9 @@ def run_algorithm(start,
         realtime_bar_target=realtime_bar_target,
         performance_callback=performance_callback,
         stop_execution_callback=stop_execution_callback,
-        execution_id=execution_id
+        execution_id=execution_id,
+        profile_pipeline=profile_pipeline,
+        incremental_pipeline=incremental_pipeline,
     )
 
 